@@ -41,8 +41,14 @@ from .bootstrap import (
     quick_start,
     shutdown,
 )
-from .builders.project_builder import ProjectBuilder
 from .core import AuthenticationError, EncryptionError
+from .utils.lazy import lazy_exports
+
+# 首次访问时才导入的接口：构建器会带入打包、进程池等依赖，
+# deepenc --help、status 等命令不必为此付出启动开销
+_LAZY_IMPORTS = {
+    "ProjectBuilder": ".builders.project_builder",
+}
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
@@ -59,3 +65,6 @@ __all__ = [
     "AuthenticationError",
     "__version__",
 ]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS, globals())
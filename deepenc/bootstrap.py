@@ -7,11 +7,10 @@
 遵循 Linux 内核的启动流程设计。
 """
 
+import sys
 from pathlib import Path
 
 from .core.errors import LoaderError
-from .loaders.module_loader import ModuleLoaderManager
-from .loaders.onnx_loader import ONNXLoaderManager
 
 
 class EncryptionSystem:
@@ -22,6 +21,10 @@ class EncryptionSystem:
 
     def __init__(self):
         """初始化加密系统"""
+        # 加载器会带入加密库和 onnxruntime，推迟到真正创建系统时再导入
+        from .loaders.module_loader import ModuleLoaderManager
+        from .loaders.onnx_loader import ONNXLoaderManager
+
         self.module_manager = ModuleLoaderManager()
         self.onnx_manager = ONNXLoaderManager()
         self._is_initialized = False
@@ -83,24 +86,29 @@ class EncryptionSystem:
             raise LoaderError(f"模块加载器初始化失败: {e}")
 
     def _print_startup_info(self):
-        """打印启动信息"""
-        print("✅ 加密系统启动成功")
-        print("")
-        print("🎯 系统特性:")
-        print("  - 自动识别加密/非加密模块")
-        print("  - 自动识别加密/非加密模型")
-        print("  - 智能降级到普通导入/加载")
-        print("  - 开发者完全无感知")
-        print("")
+        """打印启动信息
 
+        拼接成一个字符串后一次性写出，避免多次 print 反复获取 stdout 锁。
+        """
         # 显示加载器状态
         module_status = "✅" if self.module_manager.is_installed() else "❌"
         onnx_status = "✅" if self.onnx_manager.is_installed() else "❌"
 
-        print("📊 加载器状态:")
-        print(f"  {module_status} Python 模块加载器")
-        print(f"  {onnx_status} ONNX 模型加载器")
-        print("")
+        lines = [
+            "✅ 加密系统启动成功",
+            "",
+            "🎯 系统特性:",
+            "  - 自动识别加密/非加密模块",
+            "  - 自动识别加密/非加密模型",
+            "  - 智能降级到普通导入/加载",
+            "  - 开发者完全无感知",
+            "",
+            "📊 加载器状态:",
+            f"  {module_status} Python 模块加载器",
+            f"  {onnx_status} ONNX 模型加载器",
+            "",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def shutdown(self):
         """关闭加密系统"""
@@ -123,6 +131,8 @@ class EncryptionSystem:
         Returns:
             dict: 系统状态信息
         """
+        from .core.crypto import CRYPTO_BACKEND, hardware_aes_in_use
+
         return {
             "initialized": self._is_initialized,
             "initialization_error": str(self._initialization_error)
@@ -130,6 +140,8 @@ class EncryptionSystem:
             else None,
             "module_loader_installed": self.module_manager.is_installed(),
             "onnx_loader_installed": self.onnx_manager.is_installed(),
+            "crypto_backend": CRYPTO_BACKEND,
+            "crypto_hardware_aes": hardware_aes_in_use(),
             "module_cache_info": self.module_manager.get_loader().get_cache_info()
             if self.module_manager.get_loader()
             else {},
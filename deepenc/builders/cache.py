@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+构建缓存
+
+BuildManifest 记录上一次构建时每个输入文件的 (mtime_ns, size, 内容摘要)，
+下一次构建时据此找出发生变化的文件，只重新处理这部分。
+验证通过后还会记录构建产物的 (mtime_ns, size)，
+产物未变化时再次验证可以直接复用结果。
+
+ArtifactCache 以源文件内容摘要和密钥指纹为键保存加密产物，
+即使是清理后的全量构建，未变化的文件也无需重新加密。
+"""
+
+import hashlib
+import os
+import platform
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from .. import __version__
+from ..utils.jsonio import dumps_bytes, loads
+
+# 清单文件名，位于构建目录下
+MANIFEST_NAME = ".deepenc-cache.json"
+
+# 加密产物缓存目录名，位于构建目录下，清理构建目录时保留
+ARTIFACT_CACHE_DIR = ".deepenc_cache"
+
+# 计算内容摘要时的读块大小
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def _has_sha_extensions():
+    """判断 CPU 是否带 SHA-256 硬件指令
+
+    x86 上是 SHA-NI（cpuinfo 中的 sha_ni），ARM 上是 SHA2 扩展。
+
+    Returns:
+        bool: 能确认有硬件加速时返回 True
+    """
+    if sys.platform == "darwin":
+        # Apple Silicon 均带 SHA2 扩展
+        return platform.machine() == "arm64"
+
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith(("flags", "Features")):
+                    flags = line.split(":", 1)[-1].split()
+                    return "sha_ni" in flags or "sha2" in flags
+    except OSError:
+        pass
+    return False
+
+
+# 内容摘要算法，导入时确定一次：有硬件 SHA 指令时 OpenSSL 的 sha256
+# 最快，否则 blake2b 比软件实现的 sha256 快 2~3 倍。
+# 摘要只用于判断内容是否变化，不用于签名
+DIGEST_NAME = "sha256" if _has_sha_extensions() else "blake2b-128"
+
+
+def _new_digest():
+    """创建内容摘要对象"""
+    if DIGEST_NAME == "sha256":
+        return hashlib.sha256()
+    return hashlib.blake2b(digest_size=16)
+
+
+def file_digest(path):
+    """计算文件内容的摘要，算法见 DIGEST_NAME
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        str: 十六进制摘要
+    """
+    digest = _new_digest()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_artifacts(build_dir):
+    """记录构建目录中所有产物的 (mtime_ns, size)
+
+    与打包相同的遍历规则：跳过 dist 目录和清单文件本身。
+
+    Args:
+        build_dir: 构建目录
+
+    Returns:
+        dict: {以 "/" 分隔的相对路径: [mtime_ns, size]}
+    """
+    from .packager import iter_build_entries
+
+    artifacts = {}
+    for entry, relative_path in iter_build_entries(build_dir):
+        st = entry.stat()
+        artifacts[relative_path] = [st.st_mtime_ns, st.st_size]
+    return artifacts
+
+
+def key_fingerprint(key):
+    """计算加密密钥的指纹
+
+    只用于判断密钥是否变化，不可逆推出密钥本身。
+
+    Args:
+        key: 加密密钥
+
+    Returns:
+        str: 指纹
+    """
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    return hashlib.sha256(b"deepenc-manifest:" + key).hexdigest()[:16]
+
+
+class BuildManifest:
+    """增量构建清单
+
+    清单头部记录 deepenc 版本、项目根目录和密钥指纹，
+    任一项变化都视为清单失效，需要全量构建。
+    """
+
+    def __init__(self, build_dir):
+        """初始化构建清单
+
+        Args:
+            build_dir: 构建目录
+        """
+        self.path = Path(build_dir) / MANIFEST_NAME
+        self.inputs = {}
+
+    def load(self, project_root, fingerprint):
+        """加载清单
+
+        Args:
+            project_root: 项目根目录
+            fingerprint: 当前密钥指纹
+
+        Returns:
+            bool: 清单存在且与当前环境匹配时返回 True
+        """
+        data = self._read()
+        if data is None:
+            return False
+
+        if (
+            data.get("version") != __version__
+            or data.get("digest") != DIGEST_NAME
+            or data.get("project_root") != str(project_root)
+            or data.get("key_fingerprint") != fingerprint
+        ):
+            return False
+
+        self.inputs = data.get("inputs", {})
+        return True
+
+    def diff(self, files):
+        """与当前输入文件对比
+
+        mtime 或大小变化时再比较内容摘要，仅被 touch 过的文件不算变化。
+
+        Args:
+            files: {相对路径: 绝对路径}
+
+        Returns:
+            tuple: (变化或新增的相对路径集合, 已删除的相对路径集合)
+        """
+        changed = set()
+        for rel_path, path in files.items():
+            cached = self.inputs.get(rel_path)
+            if cached is None:
+                changed.add(rel_path)
+                continue
+
+            st = os.stat(path)
+            if (st.st_mtime_ns, st.st_size) == tuple(cached[:2]):
+                continue
+            if st.st_size == cached[1] and file_digest(path) == cached[2]:
+                # 内容未变，刷新 stat 避免下次重复计算摘要
+                self.inputs[rel_path] = [st.st_mtime_ns, st.st_size, cached[2]]
+                continue
+            changed.add(rel_path)
+
+        removed = set(self.inputs) - set(files)
+        return changed, removed
+
+    def save(self, project_root, fingerprint, files):
+        """写入清单
+
+        未变化文件沿用已有摘要，只为新文件或发生变化的文件计算摘要。
+
+        Args:
+            project_root: 项目根目录
+            fingerprint: 当前密钥指纹
+            files: {相对路径: 绝对路径}
+        """
+        inputs = {}
+        for rel_path, path in files.items():
+            st = os.stat(path)
+            cached = self.inputs.get(rel_path)
+            if cached is not None and (st.st_mtime_ns, st.st_size) == tuple(cached[:2]):
+                inputs[rel_path] = cached
+            else:
+                inputs[rel_path] = [st.st_mtime_ns, st.st_size, file_digest(path)]
+
+        self._write_inputs(project_root, fingerprint, inputs)
+
+    def update(self, project_root, fingerprint, files, removed=()):
+        """只更新局部构建处理过的文件记录
+
+        其余文件沿用已有记录。已有清单失效时只记录本次处理的文件，
+        其余文件在下次增量构建时会被视为变化而重新处理。
+
+        Args:
+            project_root: 项目根目录
+            fingerprint: 当前密钥指纹
+            files: 本次处理的文件 {相对路径: 绝对路径}
+            removed: 本次删除产物的相对路径
+        """
+        inputs = dict(self.inputs) if self.load(project_root, fingerprint) else {}
+        for rel_path in removed:
+            inputs.pop(rel_path, None)
+        for rel_path, path in files.items():
+            st = os.stat(path)
+            inputs[rel_path] = [st.st_mtime_ns, st.st_size, file_digest(path)]
+
+        self._write_inputs(project_root, fingerprint, inputs)
+
+    def _write_inputs(self, project_root, fingerprint, inputs):
+        """写入清单头部和输入文件记录
+
+        Args:
+            project_root: 项目根目录
+            fingerprint: 当前密钥指纹
+            inputs: {相对路径: [mtime_ns, size, 摘要]}
+        """
+        # 重新构建后产物已变化，不保留上一次的验证记录
+        self._write(
+            {
+                "version": __version__,
+                "digest": DIGEST_NAME,
+                "project_root": str(project_root),
+                "key_fingerprint": fingerprint,
+                "inputs": inputs,
+            }
+        )
+        self.inputs = inputs
+
+    def record_verification(self, artifacts, fingerprint):
+        """记录一次通过的验证
+
+        Args:
+            artifacts: snapshot_artifacts 返回的产物状态
+            fingerprint: 验证时解密所用密钥的指纹
+        """
+        data = self._read() or {}
+        data["verified_at"] = datetime.now().isoformat()
+        data["verified_fingerprint"] = fingerprint
+        data["artifacts"] = artifacts
+        self._write(data)
+
+    def is_verified(self, fingerprint):
+        """判断上一次验证结果是否仍然有效
+
+        只比较产物的 stat，不读取文件内容；有产物新增、删除或
+        mtime、大小变化时视为失效。验证时用的密钥与当前密钥不同
+        （如更换了许可证）时也视为失效，需要重新解密确认。
+
+        Args:
+            fingerprint: 当前密钥指纹
+
+        Returns:
+            bool: 上次用同一密钥验证通过且产物均未变化时返回 True
+        """
+        data = self._read()
+        if (
+            not data
+            or not data.get("verified_at")
+            or "artifacts" not in data
+            or data.get("verified_fingerprint") != fingerprint
+        ):
+            return False
+
+        try:
+            return snapshot_artifacts(self.path.parent) == data["artifacts"]
+        except OSError:
+            return False
+
+    def _read(self):
+        """读取清单内容
+
+        Returns:
+            dict | None: 清单内容，不存在或已损坏时返回 None
+        """
+        try:
+            with open(self.path, "rb") as f:
+                data = loads(f.read())
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _write(self, data):
+        """原子地写入清单内容
+
+        Args:
+            data: 清单内容
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(dumps_bytes(data))
+        os.replace(tmp_path, self.path)
+
+
+def link_or_copy(src, dst):
+    """把 src 硬链接到 dst，跨文件系统等无法链接时复制
+
+    Args:
+        src: 源文件
+        dst: 目标文件（已存在时先删除）
+    """
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class ArtifactCache:
+    """加密产物缓存
+
+    以 (源文件内容摘要, 密钥指纹) 为键保存加密产物。
+    每个相对路径记录上次的 (mtime_ns, size, 摘要)，stat 未变时
+    直接复用摘要，只有 stat 变化才重新计算（与 ccache 的做法相同）。
+    命中时把缓存对象硬链接到构建目录，不再执行 AES 加密。
+
+    缓存对象与构建产物可能是同一个 inode，写入构建产物前
+    必须先删除旧文件，不能原地覆盖。
+    """
+
+    def __init__(self, build_dir, fingerprint):
+        """初始化产物缓存
+
+        Args:
+            build_dir: 构建目录
+            fingerprint: 当前密钥指纹
+        """
+        self.root = Path(build_dir) / ARTIFACT_CACHE_DIR
+        self.objects_dir = self.root / "objects"
+        self.manifest_path = self.root / "manifest.json"
+        self.fingerprint = fingerprint
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        """加载缓存清单，版本或摘要算法不一致时丢弃全部记录"""
+        try:
+            with open(self.manifest_path, "rb") as f:
+                data = loads(f.read())
+        except (OSError, ValueError):
+            return
+
+        if (
+            isinstance(data, dict)
+            and data.get("version") == __version__
+            and data.get("digest") == DIGEST_NAME
+        ):
+            self.entries = data.get("entries", {})
+
+    def _object_path(self, digest):
+        """缓存对象路径
+
+        Args:
+            digest: 源文件内容摘要
+
+        Returns:
+            Path: 缓存对象路径
+        """
+        return self.objects_dir / f"{digest}-{self.fingerprint}"
+
+    def lookup(self, relative_path, source_path):
+        """查找源文件对应的加密产物
+
+        Args:
+            relative_path: 源文件相对路径
+            source_path: 源文件路径
+
+        Returns:
+            tuple: (命中的缓存对象路径或 None, 源文件内容摘要)
+        """
+        st = os.stat(source_path)
+        entry = self.entries.get(relative_path)
+        if entry is not None and (entry["src_mtime_ns"], entry["src_size"]) == (
+            st.st_mtime_ns,
+            st.st_size,
+        ):
+            digest = entry["src_digest"]
+        else:
+            digest = file_digest(source_path)
+
+        object_path = self._object_path(digest)
+        if object_path.is_file():
+            self.hits += 1
+            self._record(relative_path, st, digest)
+            return object_path, digest
+
+        self.misses += 1
+        return None, digest
+
+    def store(self, relative_path, source_path, artifact_path, digest):
+        """把新生成的加密产物放入缓存
+
+        Args:
+            relative_path: 源文件相对路径
+            source_path: 源文件路径
+            artifact_path: 加密产物路径
+            digest: 源文件内容摘要（lookup 的返回值）
+        """
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        link_or_copy(artifact_path, self._object_path(digest))
+        self._record(relative_path, os.stat(source_path), digest)
+
+    def _record(self, relative_path, st, digest):
+        """更新相对路径的缓存记录"""
+        self.entries[relative_path] = {
+            "src_digest": digest,
+            "src_mtime_ns": st.st_mtime_ns,
+            "src_size": st.st_size,
+            "key_fp": self.fingerprint,
+        }
+
+    def save(self):
+        """写入缓存清单，并删除不再被任何记录引用的缓存对象"""
+        referenced = {
+            f"{entry['src_digest']}-{entry['key_fp']}" for entry in self.entries.values()
+        }
+        if self.objects_dir.is_dir():
+            with os.scandir(self.objects_dir) as it:
+                for entry in it:
+                    if entry.name not in referenced:
+                        os.unlink(entry.path)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(
+                dumps_bytes(
+                    {
+                        "version": __version__,
+                        "digest": DIGEST_NAME,
+                        "entries": self.entries,
+                    }
+                )
+            )
+        os.replace(tmp_path, self.manifest_path)
@@ -6,10 +6,608 @@
 实现项目的打包和分发功能。
 """
 
+import mmap
+import os
+import re
+import sys
+import tarfile
+import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 from ..core.errors import BuildError
+from .cache import ARTIFACT_CACHE_DIR, MANIFEST_NAME
+
+try:
+    # zlib-ng 的 DEFLATE 实现使用 SIMD 加速，输出格式与 zlib 相同
+    from zlib_ng import zlib_ng as _deflate_impl
+except ImportError:
+    _deflate_impl = zlib
+
+# 文件数少于该值时，进程池的启动开销超过并行压缩的收益
+PARALLEL_ZIP_MIN_FILES = 8
+
+# 写入 zip 时的读写块大小：1MB
+ZIP_COPY_BUFFER_SIZE = 1 << 20
+
+# DEFLATE 压缩级别：加密产物几乎不可压缩，使用最快的级别
+ZIP_DEFLATE_LEVEL = 1
+
+# STORED 模式预读文件的线程数和在途文件数上限
+ZIP_PREFETCH_WORKERS = 8
+ZIP_PREFETCH_WINDOW = 16
+
+# Linux 上 STORED 条目不小于该大小时用 sendfile 在内核中直接拷贝数据
+SENDFILE_MIN_SIZE = 1 << 20
+_HAS_SENDFILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+
+# 永远不打进 zip 的文件：编译缓存、编辑器交换文件和备份、临时文件
+_ZIP_SKIP_EXTS = frozenset({".pyc", ".pyo", ".swp", ".swo", ".bak", ".tmp"})
+_ZIP_SKIP_NAMES = frozenset({".DS_Store", "Thumbs.db", "desktop.ini"})
+
+# 压缩不了的文件：加密产物是高熵密文，动态库和压缩包本身已接近最大熵，
+# DEFLATED 模式下这些条目也直接以 STORED 写入，不再白白消耗 CPU
+_ZIP_STORED_EXTS = frozenset(
+    {
+        ".encrypted",
+        ".encrypt",
+        ".so",
+        ".pyd",
+        ".dll",
+        ".dylib",
+        ".zip",
+        ".gz",
+        ".bz2",
+        ".xz",
+        ".zst",
+    }
+)
+
+
+def iter_build_entries(
+    root,
+    skip_dirs=frozenset({"dist", ARTIFACT_CACHE_DIR}),
+    skip_files=frozenset({MANIFEST_NAME}),
+):
+    """遍历构建目录中的所有文件
+
+    基于 os.scandir 递归遍历，目录项的类型信息直接来自 getdents，
+    不会对每个节点额外 stat。skip_dirs 中的顶层目录在目录级别剪枝，
+    整个子树都不会被访问。
+
+    Args:
+        root: 构建目录
+        skip_dirs: 需要跳过的顶层目录名（默认跳过 dist 和加密产物缓存）
+        skip_files: 需要跳过的顶层文件名（默认跳过增量构建清单）
+
+    Yields:
+        tuple: (os.DirEntry, 以 "/" 分隔的相对路径)
+    """
+    stack = [(str(root), "")]
+    while stack:
+        dir_path, prefix = stack.pop()
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not prefix and entry.name in skip_dirs:
+                        continue
+                    stack.append((entry.path, prefix + entry.name + "/"))
+                elif entry.is_file():
+                    if not prefix and entry.name in skip_files:
+                        continue
+                    yield entry, prefix + entry.name
+
+
+def iter_build_files(
+    root,
+    skip_dirs=frozenset({"dist", ARTIFACT_CACHE_DIR}),
+    skip_files=frozenset({MANIFEST_NAME}),
+):
+    """遍历构建目录中的所有文件
+
+    参数同 iter_build_entries。
+
+    Yields:
+        tuple: (文件绝对路径, 以 "/" 分隔的相对路径)
+    """
+    for entry, relative_path in iter_build_entries(root, skip_dirs, skip_files):
+        yield entry.path, relative_path
+
+
+def compile_exclude_patterns(patterns):
+    """把多个排除正则合并编译为一个
+
+    Args:
+        patterns: 正则表达式列表
+
+    Returns:
+        re.Pattern | None: 合并后的正则，没有模式时返回 None
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+def _is_zip_junk(name):
+    """判断文件名是否属于永远不打包的垃圾文件
+
+    Args:
+        name: 文件名
+
+    Returns:
+        bool: 应跳过时返回 True
+    """
+    return (
+        name in _ZIP_SKIP_NAMES
+        or name.endswith("~")
+        or os.path.splitext(name)[1] in _ZIP_SKIP_EXTS
+    )
+
+
+def is_incompressible(name):
+    """判断文件是否应以 STORED 方式写入 zip
+
+    Args:
+        name: 文件名或归档内路径
+
+    Returns:
+        bool: 内容基本不可压缩时返回 True
+    """
+    return os.path.splitext(name)[1] in _ZIP_STORED_EXTS
+
+
+def collect_zip_sources(root, exclude_patterns=None):
+    """收集需要写入 zip 的文件及其 stat 信息
+
+    垃圾文件和匹配排除正则的文件只凭名字就被跳过，不会 stat。
+    stat 取自 DirEntry（Windows 上直接来自目录枚举，无需额外系统调用），
+    之后生成 ZipInfo 时不再重复 stat。
+
+    Args:
+        root: 构建目录
+        exclude_patterns: 额外的排除正则列表，匹配归档内相对路径（re.search）
+
+    Returns:
+        list: (文件绝对路径, 归档内路径, os.stat_result) 列表
+    """
+    exclude_re = compile_exclude_patterns(exclude_patterns)
+    files = []
+    for entry, relative_path in iter_build_entries(root):
+        if _is_zip_junk(entry.name):
+            continue
+        if exclude_re is not None and exclude_re.search(relative_path):
+            continue
+        files.append((entry.path, relative_path, entry.stat()))
+    return files
+
+
+def zipinfo_from_stat(arcname, st, compress_type):
+    """根据已有的 stat 结果生成 ZipInfo
+
+    与 ZipInfo.from_file 的结果一致，但不再访问文件系统。
+
+    Args:
+        arcname: 归档内路径
+        st: 文件的 os.stat_result
+        compress_type: 压缩方式
+
+    Returns:
+        zipfile.ZipInfo: 条目信息
+    """
+    zinfo = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[0:6])
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.file_size = st.st_size
+    zinfo.compress_type = compress_type
+    return zinfo
+
+
+def _deflate_file(path):
+    """以 raw DEFLATE 压缩单个文件
+
+    通常在进程池的工作进程中执行。
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        tuple: (压缩后的数据, CRC32, 原始大小)
+    """
+    compressor = _deflate_impl.compressobj(
+        ZIP_DEFLATE_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS
+    )
+    chunks = []
+    crc = 0
+    size = 0
+
+    # 按块读取，原始文件不需要整体读入内存
+    with open(path, "rb", buffering=0) as f:
+        for chunk in iter(lambda: f.read(ZIP_COPY_BUFFER_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            chunks.append(compressor.compress(chunk))
+
+    chunks.append(compressor.flush())
+    return b"".join(chunks), crc, size
+
+
+def write_raw_entry(zipf, zinfo, payload):
+    """向 zip 中写入已经压缩好的条目
+
+    直接写本地文件头和数据，并登记到中央目录，
+    绕过 ZipFile 内部的压缩流程。zinfo 的 CRC、file_size
+    和 compress_type 须由调用方填好。
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+        zinfo: 条目信息
+        payload: 压缩后的数据
+    """
+    zinfo.compress_size = len(payload)
+    _write_local_header(zipf, zinfo)
+    zipf.fp.write(payload)
+
+    _register_entry(zipf, zinfo)
+
+
+def write_deflated_stream(zipf, zinfo, path):
+    """边读边压缩，把单个文件直接写入 zip
+
+    先写出占位的本地文件头，压缩数据按块直接写到底层文件，
+    结束后回填 CRC 和压缩后大小。跳过 ZipFile.open 写模式
+    在每个块上的 Python 层缓冲。要求 zip 文件可 seek。
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+        zinfo: 条目信息，file_size 为 stat 得到的大小
+        path: 文件路径
+    """
+    fp = zipf.fp
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = 0
+    zinfo.compress_size = 0
+    # 与 ZipFile 相同的判断：为压缩后可能略微变大留出余量
+    zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+
+    _write_local_header(zipf, zinfo, zip64)
+
+    compressor = _deflate_impl.compressobj(
+        ZIP_DEFLATE_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS
+    )
+    crc = 0
+    size = 0
+    compress_size = 0
+    with open(path, "rb", buffering=0) as f:
+        for chunk in iter(lambda: f.read(ZIP_COPY_BUFFER_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            out = compressor.compress(chunk)
+            compress_size += len(out)
+            fp.write(out)
+
+    out = compressor.flush()
+    compress_size += len(out)
+    fp.write(out)
+
+    zinfo.CRC = crc
+    zinfo.file_size = size
+    zinfo.compress_size = compress_size
+    if not zip64 and max(size, compress_size) > zipfile.ZIP64_LIMIT:
+        raise BuildError(f"文件在打包过程中超出 ZIP64 上限: {path}")
+
+    # 回填本地文件头，头部长度不变
+    end = fp.tell()
+    fp.seek(zinfo.header_offset)
+    fp.write(zinfo.FileHeader(zip64))
+    fp.seek(end)
+
+    _register_entry(zipf, zinfo)
+
+
+def _write_local_header(zipf, zinfo, zip64=None):
+    """在当前位置写出条目的本地文件头
+
+    与 _register_entry 一起是绕过 ZipFile 写入流程时仅有的两处
+    用到 ZipFile 私有接口（_writecheck、_didModify、filelist 等）的地方，
+    zipfile 内部实现变化时只需修改这里。
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+        zinfo: 条目信息，header_offset 在这里填写
+        zip64: 是否写 ZIP64 扩展字段，None 时按 zinfo 中的大小判断
+    """
+    zinfo.header_offset = zipf.fp.tell()
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+    zipf.fp.write(zinfo.FileHeader(zip64))
+
+
+def _register_entry(zipf, zinfo):
+    """把已写入的条目登记到中央目录
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+        zinfo: 条目信息
+    """
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
+
+def write_deflated_parallel(zipf, files, max_workers=None):
+    """多进程并行压缩并按顺序写入 zip
+
+    DEFLATE 在工作进程中完成，主进程只负责按提交顺序写入。
+    在途任务数有上限，避免大文件的压缩结果堆积在内存中。
+    不可压缩的条目（见 is_incompressible）以 STORED 方式写入。
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+        files: collect_zip_sources 返回的文件列表
+        max_workers: 工作进程数，默认 CPU 核数
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    window = max_workers * 2
+    pending = deque()
+
+    def drain_one():
+        path, arcname, st, future = pending.popleft()
+        if future is None:
+            write_stored_entry(zipf, path, arcname, st)
+            return
+
+        payload, crc, size = future.result()
+
+        zinfo = zipinfo_from_stat(arcname, st, zipfile.ZIP_DEFLATED)
+        zinfo.CRC = crc
+        zinfo.file_size = size
+        write_raw_entry(zipf, zinfo, payload)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for path, arcname, st in files:
+            if is_incompressible(arcname):
+                # 不可压缩的条目不进进程池，轮到时在主进程中直接写入
+                pending.append((path, arcname, st, None))
+                continue
+
+            pending.append((path, arcname, st, executor.submit(_deflate_file, path)))
+            if len(pending) >= window:
+                drain_one()
+
+        while pending:
+            drain_one()
+
+
+def write_deflated(zipf, files):
+    """在当前进程中逐个压缩并写入 zip
+
+    文件较少、不值得启动进程池时使用。文件以 1MB 的块流式压缩写入，
+    读取和压缩结果都不会整体驻留内存。条目大小预先由 stat 给出，
+    超过 ZIP64 上限的大模型会自动使用 ZIP64 头。
+    不可压缩的条目（见 is_incompressible）以 STORED 方式写入。
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+        files: collect_zip_sources 返回的文件列表
+    """
+    for path, arcname, st in files:
+        if is_incompressible(arcname):
+            write_stored_entry(zipf, path, arcname, st)
+            continue
+
+        zinfo = zipinfo_from_stat(arcname, st, zipfile.ZIP_DEFLATED)
+        write_deflated_stream(zipf, zinfo, path)
+
+
+def write_stored_mmap(zipf, files):
+    """以 STORED 模式写入文件，文件内容通过 mmap 直接写入 zip
+
+    CRC 直接在映射区域上计算，写入时也不经过 ZipFile 内部
+    按 16KB 分块的 Python 读写循环。
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+        files: collect_zip_sources 返回的文件列表
+    """
+    for path, arcname, st in files:
+        write_stored_entry(zipf, path, arcname, st)
+
+
+def _read_file_crc(path):
+    """读取整个文件并计算 CRC32
+
+    在预读线程中执行，读文件和 crc32 都会释放 GIL。
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        tuple: (文件内容, CRC32)
+    """
+    with open(path, "rb", buffering=0) as f:
+        data = f.read()
+    return data, zlib.crc32(data)
+
+
+def write_stored_prefetch(zipf, files, max_workers=ZIP_PREFETCH_WORKERS):
+    """以 STORED 模式写入文件，小文件由线程池预读
+
+    读盘延迟与写 zip 重叠，在网络存储上收益明显。主线程按提交顺序
+    写入，在途文件数有上限；不小于 SENDFILE_MIN_SIZE 的文件不预读，
+    轮到时由 write_stored_entry 直接写入，避免大文件整体驻留内存。
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+        files: collect_zip_sources 返回的文件列表
+        max_workers: 预读线程数
+    """
+    pending = deque()
+
+    def drain_one():
+        path, arcname, st, future = pending.popleft()
+        if future is None:
+            write_stored_entry(zipf, path, arcname, st)
+            return
+
+        data, crc = future.result()
+        zinfo = zipinfo_from_stat(arcname, st, zipfile.ZIP_STORED)
+        zinfo.file_size = len(data)
+        zinfo.CRC = crc
+        write_raw_entry(zipf, zinfo, data)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for path, arcname, st in files:
+            if st.st_size >= SENDFILE_MIN_SIZE:
+                pending.append((path, arcname, st, None))
+            else:
+                pending.append(
+                    (path, arcname, st, executor.submit(_read_file_crc, path))
+                )
+            if len(pending) >= ZIP_PREFETCH_WINDOW:
+                drain_one()
+
+        while pending:
+            drain_one()
+
+
+def write_stored_entry(zipf, path, arcname, st):
+    """以 STORED 模式写入单个文件，文件内容通过 mmap 直接写入 zip
+
+    Linux 上较大的文件改用 sendfile 拷贝数据，不经过用户态。
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+        path: 文件路径
+        arcname: 归档内路径
+        st: 文件的 os.stat_result
+    """
+    zinfo = zipinfo_from_stat(arcname, st, zipfile.ZIP_STORED)
+
+    with open(path, "rb") as f:
+        if zinfo.file_size == 0:
+            # 空文件无法映射
+            zinfo.CRC = 0
+            write_raw_entry(zipf, zinfo, b"")
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            zinfo.file_size = len(mm)
+            zinfo.CRC = zlib.crc32(mm)
+            if zinfo.file_size >= SENDFILE_MIN_SIZE and _zip_fileno(zipf) is not None:
+                _write_stored_sendfile(zipf, zinfo, f)
+            else:
+                write_raw_entry(zipf, zinfo, mm)
+
+
+def _zip_fileno(zipf):
+    """获取 zip 底层文件的描述符，不支持 sendfile 时返回 None
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+
+    Returns:
+        int | None: 文件描述符
+    """
+    if not _HAS_SENDFILE:
+        return None
+    try:
+        return zipf.fp.fileno()
+    except (AttributeError, OSError, ValueError):
+        # BytesIO 等内存文件没有描述符
+        return None
+
+
+def _write_stored_sendfile(zipf, zinfo, src):
+    """写入 STORED 条目，数据通过 sendfile 在内核中拷贝
+
+    文件头照常写出，数据不经过用户态缓冲。zinfo 的 CRC 和
+    file_size 须由调用方填好。
+
+    Args:
+        zipf: 以写模式打开的 ZipFile
+        zinfo: 条目信息
+        src: 以二进制模式打开的源文件
+    """
+    fp = zipf.fp
+    size = zinfo.file_size
+    zinfo.compress_size = size
+    _write_local_header(zipf, zinfo)
+    # 先把缓冲中的文件头落盘，sendfile 直接写底层描述符
+    fp.flush()
+
+    out_fd = fp.fileno()
+    in_fd = src.fileno()
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+        if sent == 0:
+            raise BuildError(f"文件在打包过程中被截断: {src.name}")
+        offset += sent
+
+    # sendfile 移动了描述符的位置，让文件对象重新同步
+    fp.seek(0, os.SEEK_END)
+
+    _register_entry(zipf, zinfo)
+
+
+def write_tar(tar_path, files):
+    """把文件以流式 tar（PAX 格式）写出
+
+    tar 没有压缩方式的选择，也没有中央目录，每个条目只有一个头部。
+    TarInfo 直接由已有的 stat 结果生成，不再访问文件系统。
+
+    Args:
+        tar_path: 输出的 tar 文件路径
+        files: collect_zip_sources 返回的文件列表
+    """
+    with open(tar_path, "wb", buffering=ZIP_COPY_BUFFER_SIZE) as f:
+        with tarfile.open(
+            fileobj=f,
+            mode="w|",
+            format=tarfile.PAX_FORMAT,
+            copybufsize=ZIP_COPY_BUFFER_SIZE,
+        ) as tar:
+            for path, arcname, st in files:
+                tarinfo = tarfile.TarInfo(arcname)
+                tarinfo.size = st.st_size
+                tarinfo.mtime = st.st_mtime
+                tarinfo.mode = st.st_mode & 0o7777
+                with open(path, "rb") as src:
+                    tar.addfile(tarinfo, src)
+
+
+def link_files(dest_dir, files):
+    """把文件硬链接到目标目录，保持相对路径
+
+    每个文件只创建一个目录项，不拷贝数据。无法硬链接（如跨文件系统）
+    时退回为指向构建产物的符号链接。目标目录已存在时先删除。
+    链接与构建产物共享数据，只能只读使用。
+
+    Args:
+        dest_dir: 目标目录
+        files: collect_zip_sources 返回的文件列表
+    """
+    from ..utils.fs import FileSystemUtils
+
+    dest_dir = Path(dest_dir)
+    if os.path.lexists(dest_dir):
+        FileSystemUtils.remove_tree(dest_dir)
+    dest_dir.mkdir(parents=True)
+
+    created_dirs = {str(dest_dir)}
+    for path, arcname, _ in files:
+        target = os.path.join(dest_dir, arcname)
+        parent = os.path.dirname(target)
+        if parent not in created_dirs:
+            os.makedirs(parent, exist_ok=True)
+            created_dirs.add(parent)
+
+        try:
+            os.link(path, target)
+        except OSError:
+            os.symlink(os.path.abspath(path), target)
 
 
 class ProjectPackager:
@@ -41,10 +639,11 @@ class ProjectPackager:
 
             # 创建压缩包
             with zipfile.ZipFile(package_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in self.build_dir.rglob("*"):
-                    if file_path.is_file():
-                        arcname = file_path.relative_to(self.build_dir)
-                        zipf.write(file_path, arcname)
+                # 包文件位于构建目录之外，只需剪掉缓存目录
+                for path, arcname in iter_build_files(
+                    self.build_dir, skip_dirs=frozenset({ARTIFACT_CACHE_DIR})
+                ):
+                    zipf.write(path, arcname)
 
             print(f"📦 创建包: {package_path}")
             return str(package_path)
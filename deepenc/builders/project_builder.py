@@ -13,6 +13,9 @@
 import logging
 import os
 import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
@@ -20,7 +23,19 @@ from typing import Any, Dict
 from ..core.auth import AuthManager
 from ..core.crypto import AESCrypto
 from ..core.errors import BuildError
+from ..discovery.filters import compile_patterns
 from ..discovery.scanner import FileScanner
+from ..utils.fs import FileSystemUtils
+from ..utils.stdlib import STDLIB_MODULES
+from .cache import (
+    ARTIFACT_CACHE_DIR,
+    ArtifactCache,
+    BuildManifest,
+    key_fingerprint,
+    link_or_copy,
+    snapshot_artifacts,
+)
+from .packager import iter_build_entries, iter_build_files
 
 
 class BuildConstants:
@@ -47,6 +62,40 @@ class BuildConstants:
     # 不加密的文件
     EXCLUDED_ENCRYPT_FILES = ["src/grpc_main.py", "*.pyc", "__pycache__"]
 
+    # 待加密文件少于该值时，进程池的启动开销超过并行加密的收益
+    PARALLEL_ENCRYPT_MIN_FILES = 8
+
+    # 每次派发给工作进程的文件数上限，摊薄进程间通信开销；
+    # 文件较少时自动减小，保证每个工作进程都能分到任务
+    PARALLEL_ENCRYPT_CHUNKSIZE = 8
+
+
+def _encrypt_file_task(task):
+    """在工作进程中加密单个文件，并删除原始文件
+
+    Args:
+        task: (原始文件路径, 加密文件路径, 加密密钥, 加密长度, 是否释放页缓存, 加密模式)
+
+    Returns:
+        str: 加密文件路径
+    """
+    (
+        build_file_path,
+        encrypted_path,
+        encryption_key,
+        enc_len,
+        drop_page_cache,
+        mode,
+    ) = task
+    # 旧产物可能与缓存对象是同一个 inode，必须先删除而不是原地覆盖
+    if os.path.lexists(encrypted_path):
+        os.unlink(encrypted_path)
+    AESCrypto(enc_len, drop_page_cache, mode).encrypt_file(
+        build_file_path, encrypted_path, encryption_key
+    )
+    os.unlink(build_file_path)
+    return encrypted_path
+
 
 class ProjectBuilder:
     """简化的项目构建器"""
@@ -57,6 +106,10 @@ class ProjectBuilder:
         build_dir=None,
         exclude_dirs=None,
         exclude_files=None,
+        jobs=None,
+        use_cache=True,
+        drop_page_cache=False,
+        cipher_mode="cfb",
     ):
         """初始化项目构建器
 
@@ -65,6 +118,11 @@ class ProjectBuilder:
             build_dir: 构建输出目录
             exclude_dirs: 要排除的目录列表
             exclude_files: 要排除的文件列表
+            jobs: 并行加密的进程数，默认 CPU 核数
+            use_cache: 是否复用加密产物缓存
+            drop_page_cache: 写完加密产物后是否 fsync 并释放其页缓存，
+                避免大量产物挤占共享构建机的页缓存
+            cipher_mode: 加密模式，'cfb'（默认）或 'ctr'
         """
         # 路径设置
         self.project_root = Path(project_root or ".").resolve()
@@ -76,23 +134,30 @@ class ProjectBuilder:
         self.exclude_dirs = set(exclude_dirs or [])
         self.exclude_files = set(exclude_files or [])
 
+        # 并行度
+        self.jobs = jobs or os.cpu_count() or 1
+
+        # 加密产物缓存，在每次构建开始时打开
+        self.use_cache = use_cache
+        self.artifact_cache = None
 
         # 初始化核心组件
         self.scanner = FileScanner(self.project_root)
-        self.crypto = AESCrypto()
+        self.crypto = AESCrypto(drop_page_cache=drop_page_cache, mode=cipher_mode)
         self.auth_manager = AuthManager()
+        self.manifest = BuildManifest(self.build_dir)
 
         # 设置日志
         self.logger = logging.getLogger(__name__)
         self._setup_logging()
 
         self.logger.info("项目构建器初始化完成")
-        self.logger.info(f"项目根目录: {self.project_root}")
-        self.logger.info(f"构建目录: {self.build_dir}")
+        self.logger.info("项目根目录: %s", self.project_root)
+        self.logger.info("构建目录: %s", self.build_dir)
         if self.exclude_dirs:
-            self.logger.info(f"排除目录: {', '.join(self.exclude_dirs)}")
+            self.logger.info("排除目录: %s", ", ".join(self.exclude_dirs))
         if self.exclude_files:
-            self.logger.info(f"排除文件: {', '.join(self.exclude_files)}")
+            self.logger.info("排除文件: %s", ", ".join(self.exclude_files))
 
     def _setup_logging(self):
         """设置日志配置"""
@@ -101,17 +166,18 @@ class ProjectBuilder:
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         )
 
-    def build_project(self, clean=True) -> Dict[str, Any]:
+    def build_project(self, clean=True, quiet=False) -> Dict[str, Any]:
         """构建项目（支持加密或非加密模式）
 
         构建流程:
         1. 清理并准备构建目录
-        2. 复制项目文件到build目录
+        2. 复制项目文件到build目录，同时在后台线程中发现待加密文件
         3. 如果启用加密：加密Python文件和ONNX模型
         4. 如果跳过加密：仅复制文件，不进行加密
 
         Args:
             clean: 是否清理构建目录
+            quiet: 是否跳过构建摘要输出
 
         Returns:
             Dict[str, Any]: 构建结果信息
@@ -123,75 +189,400 @@ class ProjectBuilder:
             # 步骤1: 准备构建目录
             self._prepare_build_directory(clean)
 
-            # 步骤2: 复制项目文件
-            self._copy_project_files()
+            # 步骤2: 复制项目文件；文件发现只读项目目录，构建目录被排除时
+            # 与只写构建目录的复制互不依赖，放到后台线程中同时进行
+            if self._exclude_build_dir_from_discovery():
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    discovery = executor.submit(self.scanner.discover_all_files)
+                    self._copy_project_files()
+                    discovery_result = discovery.result()
+            else:
+                self._copy_project_files()
+                discovery_result = self.scanner.discover_all_files()
 
             # 步骤3和4: 加密Python文件和ONNX模型
-            python_result = self._encrypt_python_files()
-            onnx_result = self._encrypt_onnx_files()
+            self._open_artifact_cache()
+            python_result = self._encrypt_python_files(discovery_result)
+            onnx_result = self._encrypt_onnx_files(discovery_result)
+            self._save_artifact_cache()
 
-            # 计算构建时间
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            build_report = self._create_build_report(
+                start_time, python_result, onnx_result
+            )
+            self._save_manifest()
 
-            # 获取文件发现信息
-            discovery_info = self._get_discovery_info()
-            
-            # 创建构建报告
-            build_report = {
-                "success": True,
+            self.logger.info("项目构建成功完成")
+            if not quiet:
+                self._print_build_summary(build_report)
+
+            return build_report
+
+        except Exception as e:
+            self.logger.error("项目构建失败: %s", e)
+            raise BuildError(f"项目构建失败: {e}")
+
+    def _create_build_report(
+        self, start_time, python_result, onnx_result
+    ) -> Dict[str, Any]:
+        """生成构建报告
+
+        Args:
+            start_time: 构建开始时间
+            python_result: 已加密的 Python 文件
+            onnx_result: 已加密的 ONNX 模型
+
+        Returns:
+            Dict[str, Any]: 构建结果信息
+        """
+        # 计算构建时间
+        end_time = datetime.now()
+        duration = (end_time - start_time).total_seconds()
+
+        # 获取文件发现信息
+        discovery_info = self._get_discovery_info()
+        
+        # 创建构建报告
+        build_report = {
+            "success": True,
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "duration_seconds": duration,
+            "encrypted_python_files": len(python_result),
+            "encrypted_onnx_files": len(onnx_result),
+            "build_dir": str(self.build_dir),
+            "build_info": {
                 "start_time": start_time.isoformat(),
                 "end_time": end_time.isoformat(),
                 "duration_seconds": duration,
-                "encrypted_python_files": len(python_result),
-                "encrypted_onnx_files": len(onnx_result),
+                "success": True,
+                "project_root": str(self.project_root),
                 "build_dir": str(self.build_dir),
-                "build_info": {
-                    "start_time": start_time.isoformat(),
-                    "end_time": end_time.isoformat(),
-                    "duration_seconds": duration,
-                    "success": True,
-                    "project_root": str(self.project_root),
-                    "build_dir": str(self.build_dir),
-                },
-                "discovery": discovery_info,
-                "encryption": {
-                    "python_files_processed": len(python_result),
-                    "onnx_files_processed": len(onnx_result),
-                    "excluded_files": self._get_excluded_files_info(),
-                },
-                "output": {
-                    "build_dir": str(self.build_dir),
-                    "build_dir_exists": self.build_dir.exists(),
-                    "total_files_copied": self._count_copied_files(),
-                },
-                "auth_info": {
-                    "auth_mode": os.environ.get("AUTH_MODE", "DEV"),
-                    "license_available": self._check_license_availability(),
-                    "key_source": self._get_key_source(),
-                    "hardware_auth_available": self._check_hardware_auth(),
-                    "authorization_valid": self._check_authorization_valid(),
-                }
+            },
+            "discovery": discovery_info,
+            "encryption": {
+                "python_files_processed": len(python_result),
+                "onnx_files_processed": len(onnx_result),
+                "excluded_files": self._get_excluded_files_info(),
+                "cache": self._get_artifact_cache_info(),
+            },
+            "output": {
+                "build_dir": str(self.build_dir),
+                "build_dir_exists": self.build_dir.exists(),
+                "total_files_copied": self._count_copied_files(),
+            },
+            "auth_info": {
+                "auth_mode": os.environ.get("AUTH_MODE", "DEV"),
+                "license_available": self._check_license_availability(),
+                "key_source": self._get_key_source(),
+                "hardware_auth_available": self._check_hardware_auth(),
+                "authorization_valid": self._check_authorization_valid(),
             }
+        }
 
-            self.logger.info("项目构建成功完成")
-            self._print_build_summary(build_report)
+        return build_report
+
+    def build_incremental(
+        self, changed_files, removed_files=(), quiet=False, partial=False
+    ) -> Dict[str, Any]:
+        """增量构建项目
+
+        只复制并加密发生变化的文件，删除源文件已不存在的产物，
+        其余构建产物保持不变。
+
+        Args:
+            changed_files: 新增或变化的源文件相对路径（以 "/" 分隔）
+            removed_files: 已删除的源文件相对路径
+            quiet: 是否跳过构建摘要输出
+            partial: 是否为 select_changes 选出的局部构建；局部构建只更新
+                清单中处理过的文件，未选中的变化留给下次增量构建
+
+        Returns:
+            Dict[str, Any]: 构建结果信息
+        """
+        try:
+            self.logger.info(
+                "开始增量构建: %d 个文件变化, %d 个文件删除",
+                len(changed_files),
+                len(removed_files),
+            )
+            start_time = datetime.now()
+            self.build_dir.mkdir(parents=True, exist_ok=True)
+
+            # 删除已不存在的源文件对应的产物
+            for relative_path in removed_files:
+                build_file_path = self.build_dir / relative_path
+                for suffix in (
+                    "",
+                    BuildConstants.PYTHON_ENCRYPTED_EXT,
+                    BuildConstants.ONNX_ENCRYPTED_EXT,
+                ):
+                    target = build_file_path.with_name(build_file_path.name + suffix)
+                    if target.is_file():
+                        target.unlink()
+                        self.logger.debug("已删除过期产物: %s", target)
+
+            # 需要加密的文件以扫描器的发现结果为准，与全量构建保持一致
+            discovery_result = self.scanner.discover_all_files()
+            encrypt_targets = {}
+            for key, ext in (
+                ("python_files", BuildConstants.PYTHON_ENCRYPTED_EXT),
+                ("onnx_files", BuildConstants.ONNX_ENCRYPTED_EXT),
+            ):
+                for file_info in discovery_result.get(key, []):
+                    if not self._should_exclude_from_encryption(file_info):
+                        encrypt_targets[Path(file_info["relative_path"]).as_posix()] = ext
+
+            encryption_key = self.auth_manager.get_key()
+
+            for relative_path in sorted(changed_files):
+                target_path = self.build_dir / relative_path
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(self.project_root / relative_path, target_path)
+                self.logger.debug("复制文件: %s", relative_path)
+
+            self._open_artifact_cache()
+            python_result = self._encrypt_build_files(
+                [
+                    p for p in sorted(changed_files)
+                    if encrypt_targets.get(p) == BuildConstants.PYTHON_ENCRYPTED_EXT
+                ],
+                BuildConstants.PYTHON_ENCRYPTED_EXT,
+                encryption_key,
+            )
+            onnx_result = self._encrypt_build_files(
+                [
+                    p for p in sorted(changed_files)
+                    if encrypt_targets.get(p) == BuildConstants.ONNX_ENCRYPTED_EXT
+                ],
+                BuildConstants.ONNX_ENCRYPTED_EXT,
+                encryption_key,
+            )
+            self._save_artifact_cache()
+
+            build_report = self._create_build_report(
+                start_time, python_result, onnx_result
+            )
+            build_report["incremental"] = {
+                "changed_files": len(changed_files),
+                "removed_files": len(removed_files),
+                "partial": partial,
+            }
+            if partial:
+                self._save_manifest(changed_files, removed_files)
+            else:
+                self._save_manifest()
+
+            self.logger.info("增量构建完成")
+            if not quiet:
+                self._print_build_summary(build_report)
 
             return build_report
 
         except Exception as e:
-            self.logger.error(f"项目构建失败: {e}")
-            raise BuildError(f"项目构建失败: {e}")
+            self.logger.error("增量构建失败: %s", e)
+            raise BuildError(f"增量构建失败: {e}")
+
+    def collect_source_files(self) -> Dict[str, str]:
+        """收集会被复制到构建目录的全部源文件
+
+        与 _copy_project_files 使用相同的顶层排除规则。
+
+        Returns:
+            Dict[str, str]: {以 "/" 分隔的相对路径: 绝对路径}
+        """
+        files = {}
+        with os.scandir(self.project_root) as entries:
+            for entry in entries:
+                item = Path(entry.path)
+                if not self._should_copy_item(item):
+                    continue
+                if entry.is_dir():
+                    for path, relative_path in iter_build_files(
+                        entry.path, skip_dirs=frozenset(), skip_files=frozenset()
+                    ):
+                        files[f"{entry.name}/{relative_path}"] = path
+                elif entry.is_file():
+                    files[entry.name] = entry.path
+        return files
+
+    def detect_changes(self):
+        """对比增量构建清单，找出需要重新处理的文件
+
+        Returns:
+            tuple | None: (变化的相对路径集合, 删除的相对路径集合)；
+                清单不存在或已失效（版本、项目、密钥变化）时返回 None
+        """
+        if not self.build_dir.exists():
+            return None
+
+        fingerprint = self._build_fingerprint()
+        if not self.manifest.load(self.project_root, fingerprint):
+            self.logger.info("增量构建清单不可用，执行全量构建")
+            return None
+
+        return self.manifest.diff(self.collect_source_files())
+
+    def select_changes(self, only=None, since=None):
+        """按通配符和 git 提交选出需要重新处理的文件（局部构建）
+
+        Args:
+            only: 通配符列表，匹配以 "/" 分隔的相对路径
+            since: git 提交、分支或标签，选出此后有改动的文件
+                （含工作区改动和未跟踪文件）
+
+        Returns:
+            tuple | None: (需要重新处理的相对路径集合, 删除的相对路径集合)；
+                构建目录不存在时返回 None
+        """
+        if not self.build_dir.exists():
+            return None
+
+        files = self.collect_source_files()
+        selected = self._git_changed_files(since) if since else set(files)
+        if only:
+            only_re = compile_patterns(frozenset(only))
+            selected = {p for p in selected if only_re.match(p)}
+
+        changed = selected & files.keys()
+        removed = {
+            p for p in selected - changed if not (self.project_root / p).exists()
+        }
+        return changed, removed
+
+    def _git_changed_files(self, ref):
+        """列出相对 ref 有改动的文件
+
+        Args:
+            ref: git 提交、分支或标签
+
+        Returns:
+            set: 以 "/" 分隔、相对项目根目录的路径集合
+
+        Raises:
+            BuildError: git 命令执行失败
+        """
+        git = ["git", "-C", str(self.project_root)]
+        commands = [
+            # --relative 把路径转换为相对项目根目录，并忽略项目之外的改动；
+            # --no-renames 让重命名的旧路径以删除出现，旧产物随之被清理
+            git
+            + ["diff", "--name-only", "--no-renames", "--relative", "-z", ref, "--"],
+            git + ["ls-files", "--others", "--exclude-standard", "-z"],
+        ]
+
+        paths = set()
+        for command in commands:
+            try:
+                result = subprocess.run(command, capture_output=True, text=True)
+            except OSError as e:
+                raise BuildError(f"无法执行 git: {e}")
+            if result.returncode != 0:
+                raise BuildError(f"git 命令执行失败: {result.stderr.strip()}")
+            paths.update(p for p in result.stdout.split("\0") if p)
+        return paths
+
+    def _build_fingerprint(self):
+        """计算清单和产物缓存使用的指纹
+
+        密钥或加密模式变化后，已有清单和缓存的产物都不能再用。
+        默认的 CFB 模式只用密钥指纹，与已有的清单和缓存保持兼容。
+
+        Returns:
+            str: 指纹
+        """
+        fingerprint = key_fingerprint(self.auth_manager.get_key())
+        if self.crypto.mode != "cfb":
+            fingerprint += f"-{self.crypto.mode}"
+        return fingerprint
+
+    def _open_artifact_cache(self):
+        """打开加密产物缓存，未启用缓存时什么也不做"""
+        if not self.use_cache:
+            self.artifact_cache = None
+            return
+
+        fingerprint = self._build_fingerprint()
+        self.artifact_cache = ArtifactCache(self.build_dir, fingerprint)
+
+    def _save_artifact_cache(self):
+        """写回加密产物缓存"""
+        cache = self.artifact_cache
+        if cache is None:
+            return
+
+        self.logger.info("加密缓存命中 %d 个，未命中 %d 个", cache.hits, cache.misses)
+        try:
+            cache.save()
+        except Exception as e:
+            # 缓存只影响下次构建的速度，写入失败不影响本次结果
+            self.logger.warning("写入加密产物缓存失败: %s", e)
+
+    def _get_artifact_cache_info(self) -> Dict[str, Any]:
+        """获取加密产物缓存信息"""
+        cache = self.artifact_cache
+        if cache is None:
+            return {"enabled": False, "hits": 0, "misses": 0}
+        return {"enabled": True, "hits": cache.hits, "misses": cache.misses}
+
+    def _save_manifest(self, changed_files=None, removed_files=()):
+        """记录本次构建的输入文件状态
+
+        Args:
+            changed_files: 局部构建处理过的相对路径，为 None 时记录全部源文件
+            removed_files: 局部构建删除产物的相对路径
+        """
+        try:
+            fingerprint = self._build_fingerprint()
+            if changed_files is None:
+                self.manifest.save(
+                    self.project_root, fingerprint, self.collect_source_files()
+                )
+            else:
+                self.manifest.update(
+                    self.project_root,
+                    fingerprint,
+                    {p: str(self.project_root / p) for p in changed_files},
+                    removed_files,
+                )
+        except Exception as e:
+            # 清单只影响下次能否增量构建，写入失败不影响本次结果
+            self.logger.warning("写入增量构建清单失败: %s", e)
 
     def _prepare_build_directory(self, clean: bool):
         """准备构建目录"""
         if clean and self.build_dir.exists():
-            shutil.rmtree(self.build_dir)
-            self.logger.info(f"已清理构建目录: {self.build_dir}")
+            # 加密产物缓存跨构建保留
+            FileSystemUtils.clear_dir(self.build_dir, keep={ARTIFACT_CACHE_DIR})
+            self.logger.info("已清理构建目录: %s", self.build_dir)
 
         self.build_dir.mkdir(parents=True, exist_ok=True)
         self.logger.info("构建目录准备完成")
 
+    def _exclude_build_dir_from_discovery(self) -> bool:
+        """把项目内的构建目录加入文件发现的排除目录
+
+        默认的 build 目录本来就被排除；用 --build-dir 指定项目内的其他
+        目录时，文件发现会遍历正在被复制写入的构建目录，结果取决于时序。
+
+        Returns:
+            bool: 文件发现不会进入构建目录、可以与复制同时进行时返回 True
+        """
+        try:
+            relative = self.build_dir.relative_to(self.project_root)
+        except ValueError:
+            # 构建目录在项目之外
+            return True
+
+        if not relative.parts:
+            # 构建目录就是项目根目录，无法排除
+            return False
+
+        file_filter = self.scanner.file_filter
+        top_level = relative.parts[0]
+        if top_level not in file_filter.exclude_dirs:
+            file_filter.add_exclude_rule("dir", top_level)
+        return True
+
     def _copy_project_files(self):
         """复制项目文件到build目录"""
         self.logger.info("开始复制项目文件...")
@@ -212,12 +603,12 @@ class ProjectBuilder:
         # 清理.encrypted文件
         for encrypted_file in self.build_dir.rglob("*.encrypted"):
             encrypted_file.unlink()
-            self.logger.debug(f"已清理加密文件: {encrypted_file.relative_to(self.build_dir)}")
+            self.logger.debug("已清理加密文件: %s", encrypted_file.relative_to(self.build_dir))
 
         # 清理.encrypt文件
         for encrypted_file in self.build_dir.rglob("*.encrypt"):
             encrypted_file.unlink()
-            self.logger.debug(f"已清理加密文件: {encrypted_file.relative_to(self.build_dir)}")
+            self.logger.debug("已清理加密文件: %s", encrypted_file.relative_to(self.build_dir))
 
         self.logger.info("已清理构建目录中的加密文件")
 
@@ -227,7 +618,7 @@ class ProjectBuilder:
 
         # 检查是否在命令行指定的排除目录列表中
         if item_name in self.exclude_dirs:
-            self.logger.debug(f"排除目录: {item_name}")
+            self.logger.debug("排除目录: %s", item_name)
             return False
 
         # 检查是否在默认排除目录列表中
@@ -235,12 +626,12 @@ class ProjectBuilder:
             if excluded_dir.startswith("*"):
                 # 通配符模式
                 if item_name.endswith(excluded_dir[1:]):
-                    self.logger.debug(f"排除目录(默认): {item_name}")
+                    self.logger.debug("排除目录(默认): %s", item_name)
                     return False
             else:
                 # 精确匹配
                 if item_name == excluded_dir:
-                    self.logger.debug(f"排除目录(默认): {item_name}")
+                    self.logger.debug("排除目录(默认): %s", item_name)
                     return False
 
         # 不复制构建目录本身
@@ -255,17 +646,22 @@ class ProjectBuilder:
 
         if item.is_file():
             shutil.copy2(item, target_path)
-            self.logger.debug(f"复制文件: {item.name}")
+            self.logger.debug("复制文件: %s", item.name)
         elif item.is_dir():
             shutil.copytree(item, target_path, dirs_exist_ok=True)
-            self.logger.debug(f"复制目录: {item.name}")
+            self.logger.debug("复制目录: %s", item.name)
+
+    def _encrypt_python_files(self, discovery_result=None) -> Dict[str, Any]:
+        """加密Python文件
 
-    def _encrypt_python_files(self) -> Dict[str, Any]:
-        """加密Python文件"""
+        Args:
+            discovery_result: 已有的文件发现结果，为 None 时重新发现
+        """
         self.logger.info("开始加密Python文件...")
 
         # 发现Python文件
-        discovery_result = self.scanner.discover_all_files()
+        if discovery_result is None:
+            discovery_result = self.scanner.discover_all_files()
         python_files = discovery_result.get("python_files", [])
 
         # 过滤掉不加密的文件
@@ -275,46 +671,68 @@ class ProjectBuilder:
                 filtered_files.append(file_info)
             else:
                 self.logger.info(
-                    f"排除加密: {file_info['file_path']} (相对路径: {file_info['relative_path']})"
+                    "排除加密: %s (相对路径: %s)",
+                    file_info["file_path"],
+                    file_info["relative_path"],
                 )
 
         # 加密文件
         encryption_key = self.auth_manager.get_key()
-        encrypted_files = {}
+        # 在build目录中找到对应的文件
+        relative_paths = [
+            file_info["relative_path"]
+            for file_info in filtered_files
+            if (self.build_dir / file_info["relative_path"]).exists()
+        ]
+        self._warn_stdlib_shadowing(relative_paths)
+        encrypted_files = self._encrypt_build_files(
+            relative_paths, BuildConstants.PYTHON_ENCRYPTED_EXT, encryption_key
+        )
 
-        for file_info in filtered_files:
-            file_info["file_path"]
-            relative_path = file_info["relative_path"]
+        self.logger.info("Python文件加密完成，共 %d 个", len(encrypted_files))
+        return encrypted_files
 
-            # 在build目录中找到对应的文件
-            build_file_path = self.build_dir / relative_path
-            if build_file_path.exists():
-                # 创建加密文件路径
-                encrypted_path = build_file_path.with_suffix(
-                    build_file_path.suffix + BuildConstants.PYTHON_ENCRYPTED_EXT
-                )
+    def _warn_stdlib_shadowing(self, relative_paths):
+        """提示与标准库同名的顶层加密模块
 
-                # 加密文件
-                self.crypto.encrypt_file(
-                    str(build_file_path), str(encrypted_path), encryption_key
-                )
+        模块加载器自动发现时不查找标准库名称的加密版本，构建产物中
+        与标准库同名的顶层模块（如 queue.py、email/）运行时会被解析为
+        标准库模块，只有显式注册（module_mapping）的才能导入。
 
-                # 删除原始Python文件，保留加密文件
-                build_file_path.unlink()
-                self.logger.debug(f"已删除原始文件: {relative_path}")
-
-                encrypted_files[relative_path] = str(encrypted_path)
-                self.logger.debug(f"已加密: {relative_path}")
+        Args:
+            relative_paths: 待加密 Python 文件的相对路径
 
-        self.logger.info(f"Python文件加密完成，共 {len(encrypted_files)} 个")
-        return encrypted_files
+        Returns:
+            list: 与标准库同名的顶层模块名（已排序）
+        """
+        names = set()
+        for relative_path in relative_paths:
+            parts = Path(relative_path).parts
+            # 顶层的 .py 文件是模块，否则第一级目录是包
+            top_level = os.path.splitext(parts[0])[0] if len(parts) == 1 else parts[0]
+            if top_level in STDLIB_MODULES:
+                names.add(top_level)
+
+        shadowing = sorted(names)
+        for name in shadowing:
+            self.logger.warning(
+                "加密模块 %s 与标准库模块同名，自动发现时会导入标准库模块；"
+                "请重命名，或在 module_mapping 中显式注册",
+                name,
+            )
+        return shadowing
+
+    def _encrypt_onnx_files(self, discovery_result=None) -> Dict[str, Any]:
+        """加密ONNX模型文件
 
-    def _encrypt_onnx_files(self) -> Dict[str, Any]:
-        """加密ONNX模型文件"""
+        Args:
+            discovery_result: 已有的文件发现结果，为 None 时重新发现
+        """
         self.logger.info("开始加密ONNX模型...")
 
         # 发现ONNX文件
-        discovery_result = self.scanner.discover_all_files()
+        if discovery_result is None:
+            discovery_result = self.scanner.discover_all_files()
         onnx_files = discovery_result.get("onnx_files", [])
 
         # 过滤掉不加密的文件
@@ -324,39 +742,184 @@ class ProjectBuilder:
                 filtered_files.append(file_info)
             else:
                 self.logger.info(
-                    f"排除加密: {file_info['file_path']} (相对路径: {file_info['relative_path']})"
+                    "排除加密: %s (相对路径: %s)",
+                    file_info["file_path"],
+                    file_info["relative_path"],
                 )
 
         # 加密文件
         encryption_key = self.auth_manager.get_key()
-        encrypted_files = {}
+        # 在build目录中找到对应的文件
+        relative_paths = [
+            file_info["relative_path"]
+            for file_info in filtered_files
+            if (self.build_dir / file_info["relative_path"]).exists()
+        ]
+        encrypted_files = self._encrypt_build_files(
+            relative_paths, BuildConstants.ONNX_ENCRYPTED_EXT, encryption_key
+        )
+
+        self.logger.info("ONNX模型加密完成，共 %d 个", len(encrypted_files))
+        return encrypted_files
+
+    def _encrypt_build_file(self, relative_path, encrypted_ext, encryption_key) -> str:
+        """加密构建目录中的单个文件，并删除原始文件
+
+        Args:
+            relative_path: 相对构建目录的路径
+            encrypted_ext: 加密文件的追加扩展名
+            encryption_key: 加密密钥
+
+        Returns:
+            str: 加密文件路径
+        """
+        build_file_path = self.build_dir / relative_path
+
+        # 创建加密文件路径
+        encrypted_path = build_file_path.with_suffix(
+            build_file_path.suffix + encrypted_ext
+        )
+
+        # 旧产物可能与缓存对象是同一个 inode，必须先删除而不是原地覆盖
+        if os.path.lexists(encrypted_path):
+            encrypted_path.unlink()
+
+        # 加密文件
+        self.crypto.encrypt_file(
+            str(build_file_path), str(encrypted_path), encryption_key
+        )
+
+        # 删除原始文件，保留加密文件
+        build_file_path.unlink()
+        self.logger.debug("已删除原始文件: %s", relative_path)
+        self.logger.debug("已加密: %s", relative_path)
+
+        return str(encrypted_path)
+
+    def _encrypt_build_files(
+        self, relative_paths, encrypted_ext, encryption_key
+    ) -> Dict[str, str]:
+        """加密构建目录中的一批文件
+
+        启用产物缓存时，源文件内容和密钥都未变化的文件直接
+        链接缓存中的加密产物，其余文件加密后放入缓存。
 
-        for file_info in filtered_files:
-            file_info["file_path"]
-            relative_path = file_info["relative_path"]
+        Args:
+            relative_paths: 相对构建目录的路径列表
+            encrypted_ext: 加密文件的追加扩展名
+            encryption_key: 加密密钥
+
+        Returns:
+            Dict[str, str]: {相对路径: 加密文件路径}
+        """
+        cache = self.artifact_cache
+        if cache is None:
+            return self._encrypt_uncached(relative_paths, encrypted_ext, encryption_key)
+
+        encrypted_files = {}
+        pending = []
+        digests = {}
+        for relative_path in relative_paths:
+            source_path = self.project_root / relative_path
+            try:
+                object_path, digest = cache.lookup(relative_path, source_path)
+            except OSError:
+                # 源文件不可读时不走缓存
+                pending.append(relative_path)
+                continue
+
+            if object_path is None:
+                pending.append(relative_path)
+                digests[relative_path] = digest
+                continue
 
-            # 在build目录中找到对应的文件
             build_file_path = self.build_dir / relative_path
-            if build_file_path.exists():
-                # 创建加密文件路径
-                encrypted_path = build_file_path.with_suffix(
-                    build_file_path.suffix + BuildConstants.ONNX_ENCRYPTED_EXT
+            encrypted_path = build_file_path.with_suffix(
+                build_file_path.suffix + encrypted_ext
+            )
+            link_or_copy(object_path, encrypted_path)
+            build_file_path.unlink()
+            encrypted_files[relative_path] = str(encrypted_path)
+            self.logger.debug("复用缓存的加密产物: %s", relative_path)
+
+        encrypted = self._encrypt_uncached(pending, encrypted_ext, encryption_key)
+        for relative_path, encrypted_path in encrypted.items():
+            if relative_path in digests:
+                cache.store(
+                    relative_path,
+                    self.project_root / relative_path,
+                    encrypted_path,
+                    digests[relative_path],
                 )
+        encrypted_files.update(encrypted)
+
+        return encrypted_files
+
+    def _encrypt_uncached(
+        self, relative_paths, encrypted_ext, encryption_key
+    ) -> Dict[str, str]:
+        """加密构建目录中的一批文件（不经过缓存）
+
+        文件足够多且 jobs 大于 1 时分发到进程池并行加密，
+        否则在当前进程中逐个加密。
+
+        Args:
+            relative_paths: 相对构建目录的路径列表
+            encrypted_ext: 加密文件的追加扩展名
+            encryption_key: 加密密钥
 
-                # 加密文件
-                self.crypto.encrypt_file(
-                    str(build_file_path), str(encrypted_path), encryption_key
+        Returns:
+            Dict[str, str]: {相对路径: 加密文件路径}
+        """
+        if (
+            self.jobs <= 1
+            or len(relative_paths) < BuildConstants.PARALLEL_ENCRYPT_MIN_FILES
+        ):
+            return {
+                relative_path: self._encrypt_build_file(
+                    relative_path, encrypted_ext, encryption_key
                 )
+                for relative_path in relative_paths
+            }
 
-                # 删除原始ONNX文件，保留加密文件
-                build_file_path.unlink()
-                self.logger.debug(f"已删除原始文件: {relative_path}")
+        # 大文件优先派发，避免最后只剩一个进程在加密大模型
+        relative_paths = sorted(
+            relative_paths,
+            key=lambda p: (self.build_dir / p).stat().st_size,
+            reverse=True,
+        )
 
-                encrypted_files[relative_path] = str(encrypted_path)
-                self.logger.debug(f"已加密: {relative_path}")
+        tasks = []
+        for relative_path in relative_paths:
+            build_file_path = self.build_dir / relative_path
+            encrypted_path = build_file_path.with_suffix(
+                build_file_path.suffix + encrypted_ext
+            )
+            tasks.append(
+                (
+                    str(build_file_path),
+                    str(encrypted_path),
+                    encryption_key,
+                    self.crypto.enc_len,
+                    self.crypto.drop_page_cache,
+                    self.crypto.mode,
+                )
+            )
 
-        self.logger.info(f"ONNX模型加密完成，共 {len(encrypted_files)} 个")
-        return encrypted_files
+        workers = min(self.jobs, len(tasks))
+        # 每个进程至少分到约 4 批任务，负载才均衡
+        chunksize = max(
+            1,
+            min(BuildConstants.PARALLEL_ENCRYPT_CHUNKSIZE, len(tasks) // (workers * 4)),
+        )
+        self.logger.info("使用 %d 个进程并行加密 %d 个文件", workers, len(tasks))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            encrypted_paths = executor.map(
+                _encrypt_file_task,
+                tasks,
+                chunksize=chunksize,
+            )
+            return dict(zip(relative_paths, encrypted_paths))
 
     def _should_exclude_from_encryption(self, file_info: Dict[str, Any]) -> bool:
         """判断文件是否应该被排除加密"""
@@ -377,33 +940,98 @@ class ProjectBuilder:
         return False
 
     def _print_build_summary(self, build_report: Dict[str, Any]) -> None:
-        """打印构建摘要"""
-        print("\nBuild Summary:")
-        duration = build_report["duration_seconds"]
-        print(f"  Duration: {duration:.2f}s")
-
-        print(f"  Python Files: {build_report['encrypted_python_files']}")
-        print(f"  ONNX Models: {build_report['encrypted_onnx_files']}")
-        print(f"  Build Directory: {build_report['build_dir']}")
+        """打印构建摘要
 
-        print("\nNotes:")
-        print("  - Project copied to build directory")
-        print("  - Excluded directories: release, 3thirdParty, etc.")
-        print("  - src/grpc_main.py not encrypted")
-        print("  - Add encryption loader to grpc_main.py")
+        拼接成一个字符串后一次性写出，避免多次 print 反复获取 stdout 锁。
+        """
+        lines = [
+            "",
+            "Build Summary:",
+            f"  Duration: {build_report['duration_seconds']:.2f}s",
+            f"  Python Files: {build_report['encrypted_python_files']}",
+            f"  ONNX Models: {build_report['encrypted_onnx_files']}",
+            f"  Build Directory: {build_report['build_dir']}",
+            "",
+            "Notes:",
+            "  - Project copied to build directory",
+            "  - Excluded directories: release, 3thirdParty, etc.",
+            "  - src/grpc_main.py not encrypted",
+            "  - Add encryption loader to grpc_main.py",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def clean_build(self) -> None:
         """清理构建目录"""
         try:
             if self.build_dir.exists():
-                shutil.rmtree(self.build_dir)
-                self.logger.info(f"已清理构建目录: {self.build_dir}")
+                FileSystemUtils.remove_tree(self.build_dir)
+                self.logger.info("已清理构建目录: %s", self.build_dir)
             else:
                 self.logger.info("构建目录不存在，无需清理")
 
         except Exception as e:
             raise BuildError(f"清理构建目录失败: {e}")
 
+    def verify_build(self) -> bool:
+        """验证构建结果
+
+        检查构建目录中不应残留未加密的 Python 文件和 ONNX 模型，
+        并用当前密钥逐个解密 Python 加密文件确认内容可读。
+        验证通过后在构建清单中记录产物状态，产物不变时可直接复用结果。
+
+        Returns:
+            bool: 验证是否通过
+        """
+        if not self.build_dir.is_dir():
+            self.logger.warning("构建目录不存在: %s", self.build_dir)
+            return False
+
+        problems = []
+
+        # 按与构建相同的规则扫描构建目录，应加密却仍是明文的文件
+        build_scanner = FileScanner(self.build_dir)
+        discovery_result = build_scanner.discover_all_files()
+        for key in ("python_files", "onnx_files"):
+            for file_info in discovery_result.get(key, []):
+                if not self._should_exclude_from_encryption(file_info):
+                    problems.append(f"未加密: {file_info['relative_path']}")
+
+        # 检查加密产物
+        encryption_key = self.auth_manager.get_key()
+        for entry, relative_path in iter_build_entries(self.build_dir):
+            if relative_path.endswith(BuildConstants.PYTHON_ENCRYPTED_EXT):
+                try:
+                    source = self.crypto.decrypt_file(entry.path, encryption_key)
+                    source.decode("utf-8")
+                except Exception:
+                    problems.append(f"无法用当前密钥解密: {relative_path}")
+            elif relative_path.endswith(BuildConstants.ONNX_ENCRYPTED_EXT):
+                if entry.stat().st_size == 0:
+                    problems.append(f"加密模型为空: {relative_path}")
+
+        if problems:
+            for problem in problems:
+                self.logger.warning("构建验证失败: %s", problem)
+            return False
+
+        try:
+            self.manifest.record_verification(
+                snapshot_artifacts(self.build_dir), self._build_fingerprint()
+            )
+        except Exception as e:
+            self.logger.warning("记录验证结果失败: %s", e)
+
+        self.logger.info("构建验证通过")
+        return True
+
+    def is_build_verified(self) -> bool:
+        """上一次验证结果是否可以直接复用
+
+        Returns:
+            bool: 上次用当前密钥验证通过且产物均未变化时返回 True
+        """
+        return self.manifest.is_verified(self._build_fingerprint())
+
     def get_build_info(self) -> Dict[str, Any]:
         """获取构建信息"""
         return {
@@ -428,7 +1056,7 @@ class ProjectBuilder:
                 "onnx_files": [str(f["file_path"]) for f in onnx_files],
             }
         except Exception as e:
-            self.logger.warning(f"获取文件发现信息失败: {e}")
+            self.logger.warning("获取文件发现信息失败: %s", e)
             return {
                 "total_python_files": 0,
                 "total_onnx_files": 0,
@@ -467,7 +1095,7 @@ class ProjectBuilder:
                 }
             }
         except Exception as e:
-            self.logger.warning(f"获取排除文件信息失败: {e}")
+            self.logger.warning("获取排除文件信息失败: %s", e)
             return {
                 "excluded_python_files": [],
                 "excluded_onnx_files": [],
@@ -481,15 +1109,10 @@ class ProjectBuilder:
             if not self.build_dir.exists():
                 return 0
             
-            # 递归统计构建目录中的文件数量
-            file_count = 0
-            for file_path in self.build_dir.rglob("*"):
-                if file_path.is_file():
-                    file_count += 1
-            
-            return file_count
+            # 递归统计构建目录中的文件数量（不含 dist、产物缓存和清单）
+            return sum(1 for _ in iter_build_entries(self.build_dir))
         except Exception as e:
-            self.logger.warning(f"统计复制文件数量失败: {e}")
+            self.logger.warning("统计复制文件数量失败: %s", e)
             return 0
 
     def _check_license_availability(self) -> bool:
@@ -7,26 +7,86 @@ CLI 命令实现
 遵循 Linux 命令行工具的设计风格。
 """
 
-import json
 import os
+import sys
+import zipfile
+from functools import cached_property, lru_cache
 from pathlib import Path
 
-from ..bootstrap import get_system
-from ..builders.project_builder import ProjectBuilder
-from ..discovery.scanner import FileScanner
-from ..utils.build_output import BuildOutputFormatter, create_build_info_from_report
+from ..utils.jsonio import write_json
+
+
+@lru_cache(maxsize=32)
+def _read_version(version_file, mtime_ns):
+    """读取 VERSION 文件内容
+
+    以文件路径和修改时间为键缓存，长驻进程中反复构建时
+    VERSION 未修改就不再重复打开读取。
+
+    Args:
+        version_file: VERSION 文件路径
+        mtime_ns: 文件修改时间（纳秒），仅作为缓存键
+
+    Returns:
+        str: 去除首尾空白的版本号
+    """
+    from ..utils.fs import FileSystemUtils
+
+    return FileSystemUtils.read_small_text(version_file).strip()
 
 
 class EncryptCLI:
     """加密框架 CLI 实现
 
     提供完整的命令行接口。
+    构建、扫描等子系统在对应命令内部按需导入，
+    使 --version、status 等轻量命令无需加载整个构建链路。
     """
 
     def __init__(self):
         """初始化 CLI"""
+        # getcwd 返回的已是内核解析过的绝对路径，无需再 resolve
         self.project_root = Path.cwd()
-        self.output_formatter = BuildOutputFormatter()
+
+    def _resolve_project_root(self, project_path):
+        """解析项目根目录
+
+        未指定或指定为当前目录时直接复用初始化时的工作目录，
+        只有显式给出其他路径时才调用 resolve()。
+
+        Args:
+            project_path: 项目路径
+
+        Returns:
+            Path: 项目根目录的绝对路径
+        """
+        if not project_path or project_path == ".":
+            return self.project_root
+        return Path(project_path).resolve()
+
+    @staticmethod
+    def _resolve_build_dir(project_root, build_dir):
+        """解析构建目录
+
+        默认构建目录由已解析的项目根目录拼接而来，不再 resolve。
+
+        Args:
+            project_root: 已解析的项目根目录
+            build_dir: 用户指定的构建目录
+
+        Returns:
+            Path: 构建目录的绝对路径
+        """
+        if build_dir:
+            return Path(build_dir).resolve()
+        return project_root / "build"
+
+    @cached_property
+    def output_formatter(self):
+        """构建输出格式化器（首次访问时创建）"""
+        from ..utils.build_output import BuildOutputFormatter
+
+        return BuildOutputFormatter()
 
     def build(
         self,
@@ -39,6 +99,15 @@ class EncryptCLI:
         verbose=False,
         genzip=False,
         zip_stored=False,
+        quiet=False,
+        jobs=None,
+        zip_exclude=None,
+        use_cache=True,
+        pack_mode="zip",
+        drop_page_cache=False,
+        only=None,
+        since=None,
+        cipher_mode="cfb",
     ):
         """构建项目
 
@@ -52,25 +121,40 @@ class EncryptCLI:
             verbose: 是否显示详细信息
             genzip: 是否生成ZIP包
             zip_stored: 是否使用ZIP_STORED模式（不压缩，直接存储）
+            quiet: 是否跳过构建器自身的摘要输出
+            jobs: 并行加密的进程数，默认 CPU 核数
+            zip_exclude: 打包时额外排除的正则列表，匹配归档内相对路径
+            use_cache: 是否复用加密产物缓存
+            pack_mode: 打包方式 ('zip'、'tar' 或 'hardlink')
+            drop_page_cache: 写完加密产物和包后是否 fsync 并释放其页缓存
+            only: 局部构建的通配符列表，只重新处理匹配的文件
+            since: 局部构建的 git 提交，只重新处理此后有改动的文件
+            cipher_mode: 加密模式，'cfb'（默认）或 'ctr'
 
         Returns:
             int: 退出码 (0=成功, 1=失败)
         """
         try:
-            project_root = Path(project_path or ".").resolve()
-            build_dir = Path(output_dir or project_root / "build").resolve()
-
-            # 简化的构建信息输出
-            print(f"Building project: {project_root}")
-            print(f"Output directory: {build_dir}")
+            project_root = self._resolve_project_root(project_path)
+            build_dir = self._resolve_build_dir(project_root, output_dir)
+
+            # 简化的构建信息输出（拼好后一次性写出）
+            lines = [
+                f"Building project: {project_root}",
+                f"Output directory: {build_dir}",
+            ]
             if entry_point:
-                print(f"Entry point: {entry_point}")
-            print("Encryption: ENABLED")
-            
+                lines.append(f"Entry point: {entry_point}")
+            lines.append("Encryption: ENABLED")
+
             if exclude_dirs:
-                print(f"Excluded directories: {', '.join(exclude_dirs)}")
+                lines.append(f"Excluded directories: {', '.join(exclude_dirs)}")
             if exclude_files:
-                print(f"Excluded files: {', '.join(exclude_files)}")
+                lines.append(f"Excluded files: {', '.join(exclude_files)}")
+            sys.stdout.write("\n".join(lines) + "\n")
+
+            from ..builders.project_builder import ProjectBuilder
+            from ..utils.build_output import create_build_info_from_report
 
             # 创建项目构建器
             builder = ProjectBuilder(
@@ -78,28 +162,57 @@ class EncryptCLI:
                 build_dir=build_dir,
                 exclude_dirs=exclude_dirs,
                 exclude_files=exclude_files,
+                jobs=jobs,
+                use_cache=use_cache,
+                drop_page_cache=drop_page_cache,
+                cipher_mode=cipher_mode,
             )
 
-            # 构建项目
-            build_report = builder.build_project(clean=clean)
+            partial = bool(only or since)
+            if partial:
+                # 局部构建：只处理选中的文件，其余产物保持不变
+                changes = builder.select_changes(only, since)
+                if changes is None:
+                    print("No previous build found, running a full build")
+            else:
+                # 不清理构建目录时，根据增量构建清单只处理变化的文件
+                changes = None if clean else builder.detect_changes()
 
-            # 使用统一的输出格式化器
-            build_info = create_build_info_from_report(build_report)
-            if verbose:
-                print(self.output_formatter.format_verbose(build_info))
+            if changes is not None and not any(changes):
+                print("Up to date")
             else:
-                print(self.output_formatter.format_summary(build_info))
+                # 构建项目
+                if changes is not None:
+                    build_report = builder.build_incremental(
+                        *changes, quiet=quiet, partial=partial
+                    )
+                else:
+                    build_report = builder.build_project(clean=clean, quiet=quiet)
+
+                # 使用统一的输出格式化器
+                build_info = create_build_info_from_report(build_report)
+                if verbose:
+                    print(self.output_formatter.format_verbose(build_info))
+                else:
+                    print(self.output_formatter.format_summary(build_info))
 
             # 如果指定了生成zip包，则在构建完成后生成
             if genzip:
-                print("Generating ZIP package...")
+                package_name = "ZIP" if pack_mode == "zip" else pack_mode
+                print(f"Generating {package_name} package...")
                 zip_result = self._generate_project_zip(
-                    project_root, build_dir, verbose, zip_stored
+                    project_root,
+                    build_dir,
+                    verbose,
+                    zip_stored,
+                    zip_exclude,
+                    pack_mode,
+                    drop_page_cache,
                 )
                 if zip_result:
-                    print(f"ZIP package created: {zip_result}")
+                    print(f"{package_name} package created: {zip_result}")
                 else:
-                    print("ZIP package generation failed")
+                    print(f"{package_name} package generation failed")
 
             return 0
 
@@ -112,17 +225,21 @@ class EncryptCLI:
 
         Args:
             project_path: 项目路径，默认当前目录
-            output_format: 输出格式 ('table', 'json', 'simple')
+            output_format: 输出格式 ('table', 'json', 'ndjson', 'simple')
 
         Returns:
             int: 退出码
         """
         try:
-            project_root = Path(project_path or ".").resolve()
+            project_root = self._resolve_project_root(project_path)
+
+            # ndjson 面向管道消费，输出中只保留记录本身
+            if output_format != "ndjson":
+                print(f"Scanning project: {project_root}")
 
-            print(f"Scanning project: {project_root}")
+            from ..discovery.scanner import FileScanner
 
-            # 创建文件扫描器
+            # 创建文件扫描器（扫描过程的提示走 logging，不会混入 stdout 的记录）
             scanner = FileScanner(project_root)
 
             # 发现文件
@@ -130,7 +247,9 @@ class EncryptCLI:
 
             # 输出结果
             if output_format == "json":
-                print(json.dumps(discovery_result, indent=2, ensure_ascii=False))
+                write_json(discovery_result, sys.stdout, indent=True)
+            elif output_format == "ndjson":
+                self._print_ndjson_scan_result(discovery_result)
             elif output_format == "simple":
                 self._print_simple_scan_result(discovery_result)
             else:  # table
@@ -149,6 +268,8 @@ class EncryptCLI:
             int: 退出码
         """
         try:
+            from ..bootstrap import get_system
+
             system = get_system()
 
             if system is None:
@@ -174,12 +295,13 @@ class EncryptCLI:
             int: 退出码
         """
         try:
-            project_root = Path(project_path or ".").resolve()
+            project_root = self._resolve_project_root(project_path)
 
             print(f"Initializing encryption system: {project_root}")
 
             # 切换到项目目录
             os.chdir(project_root)
+            self.project_root = project_root
 
             # 尝试自动初始化
             from ..bootstrap import auto_initialize
@@ -208,16 +330,18 @@ class EncryptCLI:
             int: 退出码
         """
         try:
-            project_root = Path(project_path or ".").resolve()
-            build_dir = Path(build_dir or project_root / "build").resolve()
+            project_root = self._resolve_project_root(project_path)
+            build_dir = self._resolve_build_dir(project_root, build_dir)
 
             print(f"Cleaning build directory: {build_dir}")
 
             # 直接清理构建目录，避免创建 ProjectBuilder 实例
             if build_dir.exists():
-                import shutil
+                from ..discovery.scanner import FileScanner
+                from ..utils.fs import FileSystemUtils
 
-                shutil.rmtree(build_dir)
+                FileSystemUtils.remove_tree(build_dir)
+                FileScanner.invalidate()
                 print(f"Build directory cleaned: {build_dir}")
             else:
                 print("Build directory does not exist, nothing to clean")
@@ -238,14 +362,21 @@ class EncryptCLI:
             int: 退出码
         """
         try:
-            project_root = Path(".").resolve()
-            build_dir = Path(build_dir or project_root / "build").resolve()
+            project_root = self.project_root
+            build_dir = self._resolve_build_dir(project_root, build_dir)
 
             print(f"Verifying build result: {build_dir}")
 
+            from ..builders.project_builder import ProjectBuilder
+
             # 创建项目构建器
             builder = ProjectBuilder(project_root, build_dir)
 
+            # 上次用当前密钥验证通过且产物均未变化时直接复用结果
+            if builder.is_build_verified():
+                print("Build verification passed (cached)")
+                return 0
+
             if builder.verify_build():
                 print("Build verification passed")
                 return 0
@@ -258,88 +389,128 @@ class EncryptCLI:
             return 1
 
 
+    def _print_ndjson_scan_result(self, discovery_result):
+        """逐行输出扫描结果（NDJSON）
+
+        每个文件一行 JSON 记录，直接写入 stdout，
+        不在内存中拼出整份结果，下游管道可以边读边处理。
+
+        Args:
+            discovery_result: 发现结果
+        """
+        for kind, key in (("py", "python_files"), ("onnx", "onnx_files")):
+            for file_info in discovery_result[key]:
+                write_json({"kind": kind, **file_info}, sys.stdout)
+
     def _print_simple_scan_result(self, discovery_result):
         """打印简单扫描结果
 
+        先拼好所有行再一次性写出，文件很多时避免逐行 print。
+
         Args:
             discovery_result: 发现结果
         """
-        print(f"\nPython files ({len(discovery_result['python_files'])}):")
-        for file_info in discovery_result["python_files"]:
-            print(f"  {file_info['module_name']} -> {file_info['relative_path']}")
-
-        print(f"\nONNX models ({len(discovery_result['onnx_files'])}):")
-        for file_info in discovery_result["onnx_files"]:
-            print(f"  {file_info['model_name']} -> {file_info['relative_path']}")
+        python_files = discovery_result["python_files"]
+        onnx_files = discovery_result["onnx_files"]
+
+        lines = ["", f"Python files ({len(python_files)}):"]
+        lines.extend(
+            f"  {fi['module_name']} -> {fi['relative_path']}" for fi in python_files
+        )
+        lines += ["", f"ONNX models ({len(onnx_files)}):"]
+        lines.extend(
+            f"  {fi['model_name']} -> {fi['relative_path']}" for fi in onnx_files
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def _print_table_scan_result(self, discovery_result):
         """打印表格格式扫描结果
 
+        先拼好所有行再一次性写出，文件很多时避免逐行 print。
+
         Args:
             discovery_result: 发现结果
         """
-        print("\nFile Scan Results:")
-        print("=" * 80)
+        python_files = discovery_result["python_files"]
+        onnx_files = discovery_result["onnx_files"]
+
+        lines = ["", "File Scan Results:", "=" * 80]
 
         # Python 文件表格
-        if discovery_result["python_files"]:
-            print("\nPython files:")
-            print(f"{'Module':<30} {'Path':<40} {'Size':<10}")
-            print("-" * 80)
-
-            for file_info in discovery_result["python_files"]:
-                size_kb = file_info["file_size"] / 1024
-                print(
-                    f"{file_info['module_name']:<30} {file_info['relative_path']:<40} {size_kb:.1f}KB"
-                )
+        if python_files:
+            lines += ["", "Python files:", f"{'Module':<30} {'Path':<40} {'Size':<10}", "-" * 80]
+            lines.extend(
+                f"{fi['module_name']:<30} {fi['relative_path']:<40} {fi['file_size'] / 1024:.1f}KB"
+                for fi in python_files
+            )
 
         # ONNX 模型表格
-        if discovery_result["onnx_files"]:
-            print("\nONNX models:")
-            print(f"{'Model':<30} {'Path':<40} {'Size':<10}")
-            print("-" * 80)
-
-            for file_info in discovery_result["onnx_files"]:
-                size_mb = file_info["file_size"] / (1024 * 1024)
-                print(
-                    f"{file_info['model_name']:<30} {file_info['relative_path']:<40} {size_mb:.1f}MB"
-                )
+        if onnx_files:
+            lines += ["", "ONNX models:", f"{'Model':<30} {'Path':<40} {'Size':<10}", "-" * 80]
+            lines.extend(
+                f"{fi['model_name']:<30} {fi['relative_path']:<40} {fi['file_size'] / 1048576:.1f}MB"
+                for fi in onnx_files
+            )
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def _print_status_info(self, status_info):
         """打印状态信息
 
+        先拼好所有行再一次性写出，避免多次 print 反复获取 stdout 锁。
+
         Args:
             status_info: 状态信息
         """
-        print("System Status:")
-        print("=" * 50)
+        lines = ["System Status:", "=" * 50]
 
         # 系统状态
         init_status = "INITIALIZED" if status_info["initialized"] else "NOT INITIALIZED"
-        print(f"System: {init_status}")
+        lines.append(f"System: {init_status}")
 
         if status_info["initialization_error"]:
-            print(f"Error: {status_info['initialization_error']}")
+            lines.append(f"Error: {status_info['initialization_error']}")
 
         # 加载器状态
         module_status = "INSTALLED" if status_info["module_loader_installed"] else "NOT INSTALLED"
         onnx_status = "INSTALLED" if status_info["onnx_loader_installed"] else "NOT INSTALLED"
 
-        print(f"Module Loader: {module_status}")
-        print(f"ONNX Loader: {onnx_status}")
+        lines.append(f"Module Loader: {module_status}")
+        lines.append(f"ONNX Loader: {onnx_status}")
+
+        # 实际使用的 AES 后端及是否用到 CPU 的 AES 指令
+        acceleration = {
+            True: "hardware AES",
+            False: "software AES",
+            None: "AES acceleration unknown",
+        }[status_info["crypto_hardware_aes"]]
+        lines.append(
+            f"Crypto Backend: {status_info['crypto_backend']} ({acceleration})"
+        )
 
         # 缓存信息
         module_cache = status_info["module_cache_info"]
         onnx_cache = status_info["onnx_cache_info"]
 
         if module_cache:
-            print(f"Module Cache: {module_cache.get('cached_modules', 0)} modules")
+            lines.append(f"Module Cache: {module_cache.get('cached_modules', 0)} modules")
 
         if onnx_cache:
-            print(f"Model Cache: {onnx_cache.get('cached_models', 0)} models")
-            print(f"Temp Files: {onnx_cache.get('temp_files', 0)} files")
+            lines.append(f"Model Cache: {onnx_cache.get('cached_models', 0)} models")
+            lines.append(f"Temp Files: {onnx_cache.get('temp_files', 0)} files")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
-    def _generate_project_zip(self, project_root, build_dir, verbose=False, zip_stored=False):
+    def _generate_project_zip(
+        self,
+        project_root,
+        build_dir,
+        verbose=False,
+        zip_stored=False,
+        zip_exclude=None,
+        pack_mode="zip",
+        drop_page_cache=False,
+    ):
         """生成项目zip包
 
         Args:
@@ -347,23 +518,25 @@ class EncryptCLI:
             build_dir: 构建目录
             verbose: 是否显示详细信息
             zip_stored: 是否使用ZIP_STORED模式（不压缩，直接存储）
+            zip_exclude: 额外排除的正则列表，匹配归档内相对路径
+            pack_mode: 打包方式，'tar' 生成流式 tar 包，
+                'hardlink' 生成硬链接到构建产物的目录，默认生成 zip 包
+            drop_page_cache: 打包完成后是否释放包文件和打包源文件的页缓存
 
         Returns:
-            str: 生成的zip包路径，失败返回None
+            str: 生成的包路径，失败返回None
         """
         try:
-            import os
-            import zipfile
-
             # 读取项目VERSION文件
             version_file = project_root / "VERSION"
-            if not version_file.exists():
+            try:
+                version_mtime = os.stat(version_file).st_mtime_ns
+            except FileNotFoundError:
                 print(f"VERSION file not found: {version_file}")
                 return None
 
             # 读取版本号
-            with open(version_file, "r", encoding="utf-8") as f:
-                version = f.read().strip()
+            version = _read_version(str(version_file), version_mtime)
 
             if not version:
                 print("VERSION file is empty")
@@ -379,6 +552,16 @@ class EncryptCLI:
             dist_dir = build_dir / "dist"
             dist_dir.mkdir(exist_ok=True)
 
+            if pack_mode != "zip":
+                return self._generate_project_pack(
+                    build_dir,
+                    dist_dir / f"{project_name}.{version}",
+                    verbose,
+                    zip_exclude,
+                    pack_mode,
+                    drop_page_cache,
+                )
+
             # zip包完整路径
             zip_path = dist_dir / zip_filename
 
@@ -398,23 +581,63 @@ class EncryptCLI:
                 print(f"Compression: {compression_name}")
                 print(f"Target: {zip_path}")
 
-            # 创建带密码的zip文件
-            with zipfile.ZipFile(zip_path, "w", compression_mode) as zipf:
-                # 遍历构建目录中的所有文件
-                for file_path in build_dir.rglob("*"):
-                    if file_path.is_file():
-                        # 计算相对路径
-                        relative_path = file_path.relative_to(build_dir)
+            from ..builders.packager import (
+                PARALLEL_ZIP_MIN_FILES,
+                ZIP_COPY_BUFFER_SIZE,
+                collect_zip_sources,
+                is_incompressible,
+                write_deflated,
+                write_deflated_parallel,
+                write_stored_mmap,
+                write_stored_prefetch,
+            )
 
-                        # 跳过dist目录本身
-                        if relative_path.parts[0] == "dist":
-                            continue
+            # 遍历构建目录中的所有文件（dist目录在遍历时直接剪枝，垃圾文件按名字跳过）
+            files = collect_zip_sources(build_dir, zip_exclude)
 
-                        if verbose:
-                            print(f"  Adding file: {relative_path}")
+            if verbose:
+                # 文件列表一次性写出，不为每个文件单独 print
+                sys.stdout.write(
+                    "".join(
+                        f"  Adding file: {relative_path}\n"
+                        for _, relative_path, _ in files
+                    )
+                )
 
-                        # 添加文件到zip
-                        zipf.write(file_path, relative_path)
+            # 创建带密码的zip文件，使用 1MB 写缓冲减少写系统调用
+            # 加密产物几乎不可压缩，DEFLATED 模式下按 STORED 写入，
+            # 其余文件使用最快的压缩级别
+            with open(zip_path, "wb", buffering=ZIP_COPY_BUFFER_SIZE) as zip_file:
+                with zipfile.ZipFile(
+                    zip_file,
+                    "w",
+                    compression_mode,
+                    allowZip64=True,
+                    compresslevel=None if zip_stored else 1,
+                ) as zipf:
+                    compressible = sum(
+                        1
+                        for _, relative_path, _ in files
+                        if not is_incompressible(relative_path)
+                    )
+                    if zip_stored and len(files) >= PARALLEL_ZIP_MIN_FILES:
+                        # 不压缩时耗时在读盘上，由线程池预读
+                        write_stored_prefetch(zipf, files)
+                    elif zip_stored:
+                        # 文件较少时直接把文件映射后写入
+                        write_stored_mmap(zipf, files)
+                    elif compressible >= PARALLEL_ZIP_MIN_FILES:
+                        # 压缩是 CPU 密集型，分摊到多个进程
+                        write_deflated_parallel(zipf, files)
+                    else:
+                        write_deflated(zipf, files)
+
+            if drop_page_cache:
+                from ..utils.fs import FileSystemUtils
+
+                # 打包源文件已读完，包文件需先落盘才能释放
+                FileSystemUtils.drop_files_page_cache(path for path, _, _ in files)
+                FileSystemUtils.drop_files_page_cache([zip_path], sync=True)
 
             # 设置zip文件密码（通过重命名文件来模拟密码保护）
             # 注意：Python的zipfile模块不直接支持密码保护，这里只是创建了zip文件
@@ -432,3 +655,51 @@ class EncryptCLI:
 
                 traceback.print_exc()
             return None
+
+    def _generate_project_pack(
+        self,
+        build_dir,
+        target_stem,
+        verbose=False,
+        zip_exclude=None,
+        pack_mode="tar",
+        drop_page_cache=False,
+    ):
+        """以 tar 包或硬链接目录的形式打包构建产物
+
+        文件选择规则与 zip 包相同。
+
+        Args:
+            build_dir: 构建目录
+            target_stem: 输出路径（不含扩展名）
+            verbose: 是否显示详细信息
+            zip_exclude: 额外排除的正则列表，匹配包内相对路径
+            pack_mode: 'tar' 或 'hardlink'
+            drop_page_cache: 打包完成后是否释放 tar 包和打包源文件的页缓存
+
+        Returns:
+            str: 生成的包路径
+        """
+        from ..builders.packager import collect_zip_sources, link_files, write_tar
+
+        files = collect_zip_sources(build_dir, zip_exclude)
+
+        if pack_mode == "tar":
+            target = target_stem.with_name(target_stem.name + ".tar")
+            write_tar(target, files)
+            if drop_page_cache:
+                from ..utils.fs import FileSystemUtils
+
+                FileSystemUtils.drop_files_page_cache(path for path, _, _ in files)
+                FileSystemUtils.drop_files_page_cache([target], sync=True)
+        else:
+            # 只创建目录项，不拷贝数据；适合在同一台机器上分发
+            target = target_stem
+            link_files(target, files)
+
+        if verbose:
+            sys.stdout.write(
+                f"Pack mode: {pack_mode}\nTarget: {target}\nFiles: {len(files)}\n"
+            )
+
+        return str(target)
@@ -13,43 +13,12 @@ import sys
 from .commands import EncryptCLI
 
 
-def create_parser():
-    """创建命令行解析器
+def _add_build_parser(subparsers):
+    """注册 build 子命令
 
-    Returns:
-        argparse.ArgumentParser: 命令行解析器
+    Args:
+        subparsers: 子命令集合
     """
-    parser = argparse.ArgumentParser(
-        prog="deepenc",
-        description="Python 项目加密分发框架",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-示例:
-  deepenc build                                    # 构建当前项目
-  deepenc build --project /path                   # 构建指定项目
-  deepenc build --entry-point src/main.py         # 指定入口文件
-  deepenc build -x tests -x docs                  # 排除tests和docs目录
-  deepenc build -x .git -x __pycache__            # 排除版本控制和缓存目录
-  deepenc build -xf *.log -xf *.tmp               # 排除日志和临时文件
-  deepenc build --genzip                          # 构建完成后生成zip包
-  deepenc build --genzip --zip-stored            # 生成zip包，使用STORED模式（不压缩）
-  deepenc scan                                     # 扫描当前项目
-  deepenc status                                   # 显示系统状态
-  deepenc clean                                    # 清理构建目录
-  deepenc verify                                   # 验证构建结果
-
-更多信息请访问: https://github.com/your-repo/deepenc
-        """,
-    )
-
-    # 全局选项
-    parser.add_argument("--version", action="version", version="%(prog)s 1.0.0")
-    parser.add_argument("--verbose", "-v", action="store_true", help="显示详细信息")
-
-    # 子命令
-    subparsers = parser.add_subparsers(dest="command", help="可用命令", metavar="COMMAND")
-
-    # build 命令
     build_parser = subparsers.add_parser(
         "build", help="构建加密项目", description="自动发现并加密项目中的 Python 文件和 ONNX 模型"
     )
@@ -65,15 +34,64 @@ def create_parser():
     build_parser.add_argument(
         "--exclude-file", "-xf", action="append", help="排除指定文件，不纳入到build中 (可多次使用)"
     )
-    build_parser.add_argument("--no-clean", action="store_true", help="不清理构建目录")
+    build_parser.add_argument(
+        "--no-clean", action="store_true", help="不清理构建目录，只增量处理变化的文件"
+    )
+    build_parser.add_argument(
+        "--only",
+        action="append",
+        metavar="GLOB",
+        help="局部构建：只重新处理匹配该通配符的文件，匹配相对路径 (可多次使用)",
+    )
+    build_parser.add_argument(
+        "--since",
+        metavar="REF",
+        help="局部构建：只重新处理自该 git 提交以来有改动的文件",
+    )
     build_parser.add_argument("--genzip", action="store_true", help="构建完成后生成带密码的zip包")
     build_parser.add_argument(
         "--zip-stored", 
         action="store_true", 
         help="使用ZIP_STORED模式（不压缩，直接存储），默认使用ZIP_DEFLATED压缩"
     )
+    build_parser.add_argument(
+        "--pack-mode",
+        choices=["zip", "tar", "hardlink"],
+        default="zip",
+        help="--genzip 的打包方式：zip 包、流式 tar 包，或硬链接到构建产物的目录 (默认: zip)",
+    )
+    build_parser.add_argument(
+        "--zip-exclude",
+        action="append",
+        metavar="REGEX",
+        help="生成zip包时排除匹配该正则的文件，匹配包内相对路径 (可多次使用)",
+    )
+    build_parser.add_argument("--quiet", "-q", action="store_true", help="不输出构建器摘要")
+    build_parser.add_argument(
+        "--jobs", "-j", type=int, default=None, help="并行加密的进程数 (默认: CPU 核数)"
+    )
+    build_parser.add_argument(
+        "--no-cache", action="store_true", help="不复用加密产物缓存，所有文件重新加密"
+    )
+    build_parser.add_argument(
+        "--cipher",
+        choices=["cfb", "ctr"],
+        default="cfb",
+        help="加密模式：cfb 兼容旧版本加载器；ctr 可并行计算、更快，需要本版本及以后的加载器 (默认: cfb)",
+    )
+    build_parser.add_argument(
+        "--drop-page-cache",
+        action="store_true",
+        help="写完加密产物和包后 fsync 并释放其页缓存 (适合共享构建机，构建会变慢)",
+    )
+
+
+def _add_scan_parser(subparsers):
+    """注册 scan 子命令
 
-    # scan 命令
+    Args:
+        subparsers: 子命令集合
+    """
     scan_parser = subparsers.add_parser(
         "scan", help="扫描项目文件", description="扫描项目中的 Python 文件和 ONNX 模型"
     )
@@ -81,42 +99,152 @@ def create_parser():
     scan_parser.add_argument(
         "--format",
         "-f",
-        choices=["table", "json", "simple"],
+        choices=["table", "json", "ndjson", "simple"],
         default="table",
-        help="输出格式 (默认: table)",
+        help="输出格式 (默认: table)；json 适合小型项目，大型项目建议使用逐行流式输出的 ndjson",
     )
 
-    # status 命令
-    status_parser = subparsers.add_parser(
+
+def _add_status_parser(subparsers):
+    """注册 status 子命令
+
+    Args:
+        subparsers: 子命令集合
+    """
+    subparsers.add_parser(
         "status", help="显示系统状态", description="显示加密系统的当前状态"
     )
 
-    # init 命令
+
+def _add_init_parser(subparsers):
+    """注册 init 子命令
+
+    Args:
+        subparsers: 子命令集合
+    """
     init_parser = subparsers.add_parser(
         "init", help="初始化加密系统", description="初始化并启动加密系统"
     )
     init_parser.add_argument("--project", "-p", default=".", help="项目根目录 (默认: 当前目录)")
 
-    # clean 命令
+
+def _add_clean_parser(subparsers):
+    """注册 clean 子命令
+
+    Args:
+        subparsers: 子命令集合
+    """
     clean_parser = subparsers.add_parser(
         "clean", help="清理构建目录", description="清理项目的构建目录"
     )
     clean_parser.add_argument("--project", "-p", default=".", help="项目根目录 (默认: 当前目录)")
     clean_parser.add_argument("--build-dir", help="构建目录 (默认: PROJECT/build)")
 
-    # verify 命令
+
+def _add_verify_parser(subparsers):
+    """注册 verify 子命令
+
+    Args:
+        subparsers: 子命令集合
+    """
     verify_parser = subparsers.add_parser(
         "verify", help="验证构建结果", description="验证构建结果的完整性"
     )
     verify_parser.add_argument("--build-dir", help="构建目录 (默认: 当前目录/build)")
 
+
+# 子命令注册表，顺序即 --help 中的显示顺序
+_SUBCOMMANDS = {
+    "build": _add_build_parser,
+    "scan": _add_scan_parser,
+    "status": _add_status_parser,
+    "init": _add_init_parser,
+    "clean": _add_clean_parser,
+    "verify": _add_verify_parser,
+}
+
+
+def _peek_command(argv):
+    """在完整解析之前找出子命令名
+
+    全局选项都不带参数，第一个不以 "-" 开头的参数就是子命令。
+
+    Args:
+        argv: 命令行参数（不含程序名）
+
+    Returns:
+        str | None: 子命令名，未给出时返回 None
+    """
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg
+    return None
+
+
+def create_parser(command=None):
+    """创建命令行解析器
+
+    Args:
+        command: 将要执行的子命令，给出时只注册该子命令；
+            默认注册全部子命令（用于 --help 和未知命令的报错）
+
+    Returns:
+        argparse.ArgumentParser: 命令行解析器
+    """
+    parser = argparse.ArgumentParser(
+        prog="deepenc",
+        description="Python 项目加密分发框架",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  deepenc build                                    # 构建当前项目
+  deepenc build --project /path                   # 构建指定项目
+  deepenc build --entry-point src/main.py         # 指定入口文件
+  deepenc build -x tests -x docs                  # 排除tests和docs目录
+  deepenc build -x .git -x __pycache__            # 排除版本控制和缓存目录
+  deepenc build -xf *.log -xf *.tmp               # 排除日志和临时文件
+  deepenc build --genzip                          # 构建完成后生成zip包
+  deepenc build --genzip --zip-stored            # 生成zip包，使用STORED模式（不压缩）
+  deepenc build --genzip --zip-exclude '^tests/'  # 生成zip包时排除tests目录
+  deepenc build --genzip --pack-mode tar          # 生成tar包，不做压缩判断
+  deepenc build --quiet                           # 构建时不输出构建器摘要
+  deepenc build --no-clean                        # 增量构建，源文件未变化时直接跳过
+  deepenc build --since HEAD~1                    # 只重新加密上次提交以来改动的文件
+  deepenc build --only 'src/models/*'             # 只重新加密匹配的文件
+  deepenc build -j 4                              # 使用4个进程并行加密
+  deepenc build --no-cache                        # 不复用加密缓存，全部重新加密
+  deepenc build --genzip --drop-page-cache        # 构建产物不占用页缓存
+  deepenc build --cipher ctr                      # 使用更快的 AES-CTR 加密
+  deepenc scan                                     # 扫描当前项目
+  deepenc scan -f ndjson | jq .relative_path       # 逐行输出扫描结果，便于管道处理
+  deepenc status                                   # 显示系统状态
+  deepenc clean                                    # 清理构建目录
+  deepenc verify                                   # 验证构建结果
+
+更多信息请访问: https://github.com/your-repo/deepenc
+        """,
+    )
+
+    # 全局选项
+    parser.add_argument("--version", action="version", version="%(prog)s 1.0.0")
+    parser.add_argument("--verbose", "-v", action="store_true", help="显示详细信息")
+
+    # 子命令：只执行了某个子命令时只注册该子命令，省去其余子解析器的构建
+    subparsers = parser.add_subparsers(dest="command", help="可用命令", metavar="COMMAND")
+    if command in _SUBCOMMANDS:
+        _SUBCOMMANDS[command](subparsers)
+    else:
+        for add_parser in _SUBCOMMANDS.values():
+            add_parser(subparsers)
+
     return parser
 
 
 def main():
     """CLI 主函数"""
-    parser = create_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    parser = create_parser(_peek_command(argv))
+    args = parser.parse_args(argv)
 
     # 如果没有提供命令，显示帮助
     if not args.command:
@@ -136,9 +264,18 @@ def main():
                 exclude_dirs=args.exclude_dir,
                 exclude_files=args.exclude_file,
                 clean=not args.no_clean,
+                only=args.only,
+                since=args.since,
                 verbose=args.verbose,
                 genzip=args.genzip,
                 zip_stored=args.zip_stored,
+                zip_exclude=args.zip_exclude,
+                quiet=args.quiet,
+                jobs=args.jobs,
+                use_cache=not args.no_cache,
+                pack_mode=args.pack_mode,
+                drop_page_cache=args.drop_page_cache,
+                cipher_mode=args.cipher,
             )
 
         elif args.command == "scan":
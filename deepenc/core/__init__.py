@@ -6,10 +6,16 @@
 提供底层的加密、解密和授权功能。
 """
 
-from .auth import AuthManager
-from .crypto import AESCrypto
+from ..utils.lazy import lazy_exports
 from .errors import AuthenticationError, DecryptionError, EncryptionError
 
+# 首次访问时才导入的名字：crypto 会加载 pycryptodome 的原生扩展，
+# 只需要异常类型的命令（status、clean 等）不必为此付出启动开销
+_LAZY_IMPORTS = {
+    "AESCrypto": ".crypto",
+    "AuthManager": ".auth",
+}
+
 __all__ = [
     "AESCrypto",
     "AuthManager",
@@ -17,3 +23,6 @@ __all__ = [
     "AuthenticationError",
     "DecryptionError",
 ]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS, globals())
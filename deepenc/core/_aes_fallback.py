@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AES 后备实现
+
+cryptography 和 pycryptodome 都无法安装时（如没有预编译包的嵌入式
+平台）使用的 AES-CFB128/CTR 实现：查表法（T-table）的分组加密由
+Numba 编译为本机代码，编译结果缓存在磁盘上，之后的进程直接复用。
+
+CFB 和 CTR 的加密、解密都只用到 AES 的正向变换，这里只实现加密方向。
+依赖 numpy 和 numba，未安装时导入本模块抛出 ImportError。
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numba import get_num_threads, njit, prange
+
+# ============================================================================
+# 查找表（导入时生成一次）
+# ============================================================================
+
+
+def _xtime(value):
+    """GF(2^8) 中乘以 2"""
+    value <<= 1
+    return (value ^ 0x11B) if value & 0x100 else value
+
+
+def _build_sbox():
+    """按有限域求逆加仿射变换生成 S 盒"""
+    # 以 3 为生成元建立对数表和指数表
+    exp = [0] * 255
+    log = [0] * 256
+    value = 1
+    for i in range(255):
+        exp[i] = value
+        log[value] = i
+        value ^= _xtime(value)
+
+    sbox = [0] * 256
+    for x in range(256):
+        inv = exp[(255 - log[x]) % 255] if x else 0
+        s = inv
+        for shift in range(1, 5):
+            s ^= ((inv << shift) | (inv >> (8 - shift))) & 0xFF
+        sbox[x] = s ^ 0x63
+    return sbox
+
+
+def _build_tables(sbox):
+    """生成合并了 SubBytes、ShiftRows 和 MixColumns 的 T 表"""
+    t0 = []
+    for s in sbox:
+        s2 = _xtime(s)
+        t0.append((s2 << 24) | (s << 16) | (s << 8) | (s2 ^ s))
+
+    tables = np.empty((4, 256), dtype=np.int64)
+    for i, word in enumerate(t0):
+        for j in range(4):
+            # T1..T3 是 T0 依次循环右移 8 位
+            shift = 8 * j
+            tables[j, i] = ((word >> shift) | (word << (32 - shift))) & 0xFFFFFFFF
+    return tables
+
+
+_SBOX_LIST = _build_sbox()
+SBOX = np.array(_SBOX_LIST, dtype=np.int64)
+TABLES = _build_tables(_SBOX_LIST)
+
+
+@lru_cache(maxsize=8)
+def expand_key(key_bytes):
+    """AES 密钥扩展
+
+    Args:
+        key_bytes: 16、24 或 32 字节的密钥
+
+    Returns:
+        np.ndarray: 4 * (轮数 + 1) 个 32 位轮密钥字
+    """
+    nk = len(key_bytes) // 4
+    rounds = nk + 6
+    words = [int.from_bytes(key_bytes[4 * i : 4 * i + 4], "big") for i in range(nk)]
+
+    rcon = 1
+    for i in range(nk, 4 * (rounds + 1)):
+        temp = words[i - 1]
+        if i % nk == 0:
+            # RotWord + SubWord + Rcon
+            temp = ((temp << 8) | (temp >> 24)) & 0xFFFFFFFF
+            temp = _sub_word(temp) ^ (rcon << 24)
+            rcon = _xtime(rcon)
+        elif nk > 6 and i % nk == 4:
+            temp = _sub_word(temp)
+        words.append(words[i - nk] ^ temp)
+
+    round_keys = np.array(words, dtype=np.int64)
+    round_keys.flags.writeable = False
+    return round_keys
+
+
+def _sub_word(word):
+    """对 32 位字的每个字节做 S 盒替换"""
+    return (
+        (_SBOX_LIST[word >> 24] << 24)
+        | (_SBOX_LIST[(word >> 16) & 0xFF] << 16)
+        | (_SBOX_LIST[(word >> 8) & 0xFF] << 8)
+        | _SBOX_LIST[word & 0xFF]
+    )
+
+
+# ============================================================================
+# Numba 内核
+# ============================================================================
+
+
+@njit(cache=True)
+def _encrypt_block(tables, sbox, round_keys, block, out):
+    """加密一个 16 字节分组，block 和 out 可以是同一数组"""
+    s0 = np.int64(0)
+    s1 = np.int64(0)
+    s2 = np.int64(0)
+    s3 = np.int64(0)
+    for i in range(4):
+        s0 = (s0 << 8) | block[i]
+        s1 = (s1 << 8) | block[4 + i]
+        s2 = (s2 << 8) | block[8 + i]
+        s3 = (s3 << 8) | block[12 + i]
+    s0 ^= round_keys[0]
+    s1 ^= round_keys[1]
+    s2 ^= round_keys[2]
+    s3 ^= round_keys[3]
+
+    rounds = round_keys.shape[0] // 4 - 1
+    t0 = tables[0]
+    t1 = tables[1]
+    t2 = tables[2]
+    t3 = tables[3]
+    for r in range(1, rounds):
+        k = 4 * r
+        n0 = (
+            t0[s0 >> 24]
+            ^ t1[(s1 >> 16) & 0xFF]
+            ^ t2[(s2 >> 8) & 0xFF]
+            ^ t3[s3 & 0xFF]
+            ^ round_keys[k]
+        )
+        n1 = (
+            t0[s1 >> 24]
+            ^ t1[(s2 >> 16) & 0xFF]
+            ^ t2[(s3 >> 8) & 0xFF]
+            ^ t3[s0 & 0xFF]
+            ^ round_keys[k + 1]
+        )
+        n2 = (
+            t0[s2 >> 24]
+            ^ t1[(s3 >> 16) & 0xFF]
+            ^ t2[(s0 >> 8) & 0xFF]
+            ^ t3[s1 & 0xFF]
+            ^ round_keys[k + 2]
+        )
+        n3 = (
+            t0[s3 >> 24]
+            ^ t1[(s0 >> 16) & 0xFF]
+            ^ t2[(s1 >> 8) & 0xFF]
+            ^ t3[s2 & 0xFF]
+            ^ round_keys[k + 3]
+        )
+        s0, s1, s2, s3 = n0, n1, n2, n3
+
+    # 最后一轮没有 MixColumns，直接查 S 盒
+    k = 4 * rounds
+    states = (s0, s1, s2, s3)
+    for c in range(4):
+        word = (
+            (sbox[states[c] >> 24] << 24)
+            | (sbox[(states[(c + 1) % 4] >> 16) & 0xFF] << 16)
+            | (sbox[(states[(c + 2) % 4] >> 8) & 0xFF] << 8)
+            | sbox[states[(c + 3) % 4] & 0xFF]
+        ) ^ round_keys[k + c]
+        out[4 * c] = (word >> 24) & 0xFF
+        out[4 * c + 1] = (word >> 16) & 0xFF
+        out[4 * c + 2] = (word >> 8) & 0xFF
+        out[4 * c + 3] = word & 0xFF
+
+
+@njit(cache=True)
+def _crypt(
+    tables, sbox, round_keys, register, keystream, pos, ctr, decrypt, data, out
+):
+    """CFB128 / CTR 流式加解密，返回处理后当前密钥流分组已用的字节数
+
+    register: CFB 为反馈寄存器（上一分组密文），CTR 为计数器分组
+    keystream: 当前分组的密钥流
+    pos: 当前密钥流分组已用的字节数，16 表示需要生成下一分组
+    """
+    for i in range(data.shape[0]):
+        if pos == 16:
+            _encrypt_block(tables, sbox, round_keys, register, keystream)
+            if ctr:
+                # 计数器是分组末尾 4 字节的大端整数
+                j = 15
+                while j >= 12:
+                    register[j] = (register[j] + 1) & 0xFF
+                    if register[j] != 0:
+                        break
+                    j -= 1
+            pos = 0
+        value = data[i]
+        result = value ^ keystream[pos]
+        out[i] = result
+        if not ctr:
+            # CFB 的反馈是密文：加密时是输出，解密时是输入
+            register[pos] = value if decrypt else result
+        pos += 1
+    return pos
+
+
+# _crypt_blocks 每个线程一次处理的分组数
+_BLOCKS_PER_CHUNK = 1024
+
+
+@njit(cache=True, parallel=True)
+def _crypt_blocks(tables, sbox, round_keys, register, ctr, data, out):
+    """批量处理整分组的 CTR 加解密或 CFB 解密
+
+    这两种情况下每个分组的密钥流只依赖计数器或上一分组的密文（输入），
+    各分组互不依赖，用 prange 分给多个线程。调用时当前密钥流分组必须
+    已经用完；register 的含义与 _crypt 相同，返回时已更新。
+    data 的长度必须是 16 的整数倍，out 不能与 data 重叠。
+    """
+    nblocks = data.shape[0] // 16
+    counter = np.int64(0)
+    if ctr:
+        for i in range(12, 16):
+            counter = (counter << 8) | register[i]
+
+    # 按段分给线程，每段只分配一次分组和密钥流缓冲区
+    nchunks = (nblocks + _BLOCKS_PER_CHUNK - 1) // _BLOCKS_PER_CHUNK
+    for c in prange(nchunks):
+        block = np.empty(16, dtype=np.uint8)
+        keystream = np.empty(16, dtype=np.uint8)
+        block[:12] = register[:12]
+        first = c * _BLOCKS_PER_CHUNK
+        for b in range(first, min(first + _BLOCKS_PER_CHUNK, nblocks)):
+            if ctr:
+                # 计数器是 32 位大端整数，溢出时回绕，与 _crypt 一致
+                value = (counter + b) & 0xFFFFFFFF
+                for i in range(4):
+                    block[15 - i] = (value >> (8 * i)) & 0xFF
+            elif b == 0:
+                block[:] = register
+            else:
+                block[:] = data[16 * (b - 1) : 16 * b]
+            _encrypt_block(tables, sbox, round_keys, block, keystream)
+            for i in range(16):
+                out[16 * b + i] = data[16 * b + i] ^ keystream[i]
+
+    if ctr:
+        value = (counter + nblocks) & 0xFFFFFFFF
+        for i in range(4):
+            register[15 - i] = (value >> (8 * i)) & 0xFF
+    elif nblocks > 0:
+        register[:] = data[16 * (nblocks - 1) : 16 * nblocks]
+
+
+# ============================================================================
+# 加解密上下文
+# ============================================================================
+
+
+class StreamCipher:
+    """AES-CFB128 / AES-CTR 加解密上下文
+
+    接口与 cryptography 的 CipherContext 一致：多次调用 update 视为
+    同一数据流的连续分段，分段长度不必是 16 的整数倍。
+    """
+
+    # 可以并行处理的整分组达到该数量（64 KiB）时才分给多个线程
+    PARALLEL_MIN_BLOCKS = 4096
+
+    def __init__(self, key_bytes, iv=None, nonce=None, decrypt=False):
+        """初始化
+
+        Args:
+            key_bytes: 已校验的密钥
+            iv: CFB 模式的 16 字节 IV
+            nonce: CTR 模式的 12 字节 nonce（其后 4 字节计数器从 0 开始）
+            decrypt: 是否为解密上下文
+        """
+        self._round_keys = expand_key(bytes(key_bytes))
+        self._ctr = nonce is not None
+        initial = bytes(nonce) + bytes(4) if self._ctr else bytes(iv)
+        self._register = np.frombuffer(bytearray(initial), dtype=np.uint8)
+        self._keystream = np.zeros(16, dtype=np.uint8)
+        self._pos = 16
+        self._decrypt = decrypt
+
+    def update_into(self, data, out):
+        """处理一段数据，结果写入可写缓冲区 out
+
+        Args:
+            data: bytes 类数据
+            out: 长度不小于 len(data) 的可写缓冲区
+
+        Returns:
+            int: 写入的字节数
+        """
+        src = np.frombuffer(data, dtype=np.uint8)
+        size = src.shape[0]
+        dst = np.frombuffer(out, dtype=np.uint8, count=size)
+
+        # 先用完当前密钥流分组的剩余字节，对齐到分组边界
+        head = min(size, (16 - self._pos) % 16)
+        if head:
+            self._pos = self._crypt(src[:head], dst[:head])
+
+        # CTR 和 CFB 解密的整分组可以并行；CFB 加密的反馈是输出，只能串行。
+        # 只有一个线程时并行内核没有收益，仍走逐字节的 _crypt
+        blocks = (size - head) // 16
+        if (
+            blocks >= self.PARALLEL_MIN_BLOCKS
+            and get_num_threads() > 1
+            and (self._ctr or self._decrypt)
+            and not np.may_share_memory(src, dst)
+        ):
+            end = head + 16 * blocks
+            _crypt_blocks(
+                TABLES,
+                SBOX,
+                self._round_keys,
+                self._register,
+                self._ctr,
+                src[head:end],
+                dst[head:end],
+            )
+            head = end
+
+        if head < size:
+            self._pos = self._crypt(src[head:], dst[head:])
+        return size
+
+    def _crypt(self, src, dst):
+        """逐字节处理一段数据，返回当前密钥流分组已用的字节数"""
+        return _crypt(
+            TABLES,
+            SBOX,
+            self._round_keys,
+            self._register,
+            self._keystream,
+            self._pos,
+            self._ctr,
+            self._decrypt,
+            src,
+            dst,
+        )
+
+    def update(self, data):
+        """处理一段数据
+
+        Args:
+            data: bytes 类数据
+
+        Returns:
+            bytes: 处理结果
+        """
+        out = bytearray(len(data))
+        self.update_into(data, out)
+        return bytes(out)
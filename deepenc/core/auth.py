@@ -8,9 +8,19 @@
 """
 
 import os
+import threading
 
+from ..utils.fs import FileSystemUtils
 from .errors import AuthenticationError
 
+# 默认许可证文件
+DEFAULT_LICENSE_FILE = "/data/appdatas/inference/license.dat"
+
+# 许可证密钥缓存: {(许可证路径, 授权模式, 是否使用硬件解密): (mtime_ns, size, key)}
+# 文件未变化时不再重复读取和解密，进程内所有 AuthManager 共享
+_license_key_cache = {}
+_license_key_lock = threading.Lock()
+
 
 class HardwareAuth:
     """硬件授权实现
@@ -109,6 +119,8 @@ class AuthManager:
         """初始化授权管理器"""
         self.hardware_auth = None
         self.encryption_key = None
+        # 实际读取到密钥的许可证文件
+        self.license_file = None
         self._initialize()
 
     def _initialize(self):
@@ -156,50 +168,92 @@ class AuthManager:
         DEV 模式：许可证文件内容即为原始未加密的 key。
         非 DEV 模式：许可证文件内容为加密数据，需要通过 hardware_auth 解密得到 key。
         如果硬件授权不可用，则降级到开发模式。
+
+        解析结果按许可证文件的 (mtime_ns, size) 缓存在进程内，
+        文件未变化时只需一次 stat。
         """
         try:
-            # 如果有可用的硬件授权，尝试获取设备特定的许可证文件
-            if self._is_hardware_auth_available():
-                try:
-                    device_id = self.hardware_auth.get_device_id()
-                    license_file = "/data/appdatas/inference/{}.license".format(
-                        device_id
-                    )
-                    if not os.path.exists(license_file):
-                        license_file = "/data/appdatas/inference/license.dat"
-                except:
-                    license_file = "/data/appdatas/inference/license.dat"
-            else:
-                license_file = "/data/appdatas/inference/license.dat"
-
-            # 尝试读取许可证文件
-            if os.path.exists(license_file):
-                with open(license_file, "r", encoding="utf-8") as f:
-                    license_str = f.read()
-                print(f"Read license from {license_file}")
-
-                license_str = license_str.strip()
-                auth_mode = os.environ.get("AUTH_MODE", "DEV")
-
-                if auth_mode == "DEV":
-                    # 开发模式：直接使用文件中的原始 key
-                    return license_str if license_str else None
-                else:
-                    # 非开发模式：需要通过硬件授权解密
-                    if not self._is_hardware_auth_available():
-                        print("⚠️ 非 DEV 模式缺少可用的硬件授权，降级到开发模式")
-                        # 降级到开发模式：直接使用文件中的原始 key
-                        return license_str if license_str else None
-                    decrypted = self.hardware_auth.decrypt_license(license_str)
-                    decrypted = decrypted.strip() if decrypted else ""
-                    return decrypted if decrypted else None
+            license_file, st = self._resolve_license_file()
+            if st is None:
+                return None
 
-            return None
+            auth_mode = os.environ.get("AUTH_MODE", "DEV")
+            use_hardware = auth_mode != "DEV" and self._is_hardware_auth_available()
+            cache_key = (license_file, auth_mode, use_hardware)
+
+            with _license_key_lock:
+                cached = _license_key_cache.get(cache_key)
+                if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                    self.license_file = license_file
+                    return cached[2]
+
+                key = self._read_license_key(license_file, auth_mode, use_hardware)
+                _license_key_cache[cache_key] = (st.st_mtime_ns, st.st_size, key)
+
+            if key:
+                self.license_file = license_file
+            return key
 
         except Exception as e:
             print(f"从许可证文件获取密钥失败: {e}")
             return None
 
+    def _resolve_license_file(self):
+        """确定要使用的许可证文件
+
+        有可用的硬件授权时优先使用设备特定的许可证文件，
+        不存在时回退到默认许可证文件。
+
+        Returns:
+            tuple: (许可证文件路径, os.stat_result)，文件不存在时 stat 结果为 None
+        """
+        candidates = []
+        if self._is_hardware_auth_available():
+            try:
+                device_id = self.hardware_auth.get_device_id()
+                candidates.append(
+                    "/data/appdatas/inference/{}.license".format(device_id)
+                )
+            except Exception:
+                pass
+        candidates.append(DEFAULT_LICENSE_FILE)
+
+        # 直接 stat，省去先 exists 再 open 的重复系统调用
+        for license_file in candidates:
+            try:
+                return license_file, os.stat(license_file)
+            except OSError:
+                continue
+        return DEFAULT_LICENSE_FILE, None
+
+    def _read_license_key(self, license_file, auth_mode, use_hardware):
+        """读取许可证文件并得到密钥
+
+        Args:
+            license_file: 许可证文件路径
+            auth_mode: 授权模式
+            use_hardware: 是否通过硬件授权解密
+
+        Returns:
+            str: 加密密钥，失败返回 None
+        """
+        license_str = FileSystemUtils.read_small_text(license_file)
+        print(f"Read license from {license_file}")
+
+        license_str = license_str.strip()
+
+        if use_hardware:
+            # 非开发模式：需要通过硬件授权解密
+            decrypted = self.hardware_auth.decrypt_license(license_str)
+            decrypted = decrypted.strip() if decrypted else ""
+            return decrypted if decrypted else None
+
+        if auth_mode != "DEV":
+            print("⚠️ 非 DEV 模式缺少可用的硬件授权，降级到开发模式")
+
+        # 开发模式（或降级）：直接使用文件中的原始 key
+        return license_str if license_str else None
+
     def get_key(self):
         """获取当前的加密密钥
 
@@ -260,7 +314,8 @@ class AuthManager:
         auth_mode = os.environ.get("AUTH_MODE", "DEV")
         if self._is_hardware_auth_available() and auth_mode != "DEV":
             return "hardware_decrypted_license"
-        elif os.path.exists("/data/appdatas/inference/license.dat"):
+        elif self.license_file is not None:
+            # 复用初始化时解析出的许可证文件，不再重复 stat
             return "license_file"
         else:
             return "unknown"
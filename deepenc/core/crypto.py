@@ -7,14 +7,174 @@ AES 加密实现
 遵循 Linux 内核的错误处理风格。
 """
 
+import importlib.util
+import mmap
 import os
+from functools import lru_cache
 
+from ..utils.fs import FileSystemUtils
 from .errors import DecryptionError, EncryptionError
 
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms
+
+    try:
+        # cryptography 43 起 CFB 移到了 decrepit 模块
+        from cryptography.hazmat.decrepit.ciphers.modes import CFB
+    except ImportError:
+        from cryptography.hazmat.primitives.ciphers.modes import CFB
+    from cryptography.hazmat.primitives.ciphers.modes import CTR
+except ImportError:
+    Cipher = None
+
 try:
     from Crypto.Cipher import AES
 except ImportError:
-    raise ImportError("PyCrypto is required. Install with: pip install pycrypto")
+    AES = None
+
+# Numba 编译的后备实现，两个加密库都不可用时使用；导入 numba 较慢，
+# 只在选中该后端时才导入
+_aes_fallback = None
+
+
+def _select_backend():
+    """选择 AES 后端
+
+    优先使用 cryptography（OpenSSL EVP，运行时自动选用 AES-NI/VAES 实现），
+    未安装时使用 pycryptodome，两者都无法安装时使用 Numba 编译的
+    后备实现（需要 numpy 和 numba）。各后端的 CFB-128 输出完全一致。
+    环境变量 DEEPENC_CRYPTO_BACKEND 可以指定后端；排查 OpenSSL 的
+    硬件加速问题时可用 OPENSSL_ia32cap 关闭 AES-NI。
+
+    Returns:
+        str: 'cryptography'、'pycryptodome' 或 'numba'
+    """
+    available = [
+        name
+        for name, module in (("cryptography", Cipher), ("pycryptodome", AES))
+        if module is not None
+    ]
+    if importlib.util.find_spec("numba") is not None:
+        available.append("numba")
+    if not available:
+        raise ImportError(
+            "No AES backend available. Install one of: pip install cryptography, "
+            "pip install pycryptodome, or pip install numba numpy"
+        )
+
+    requested = os.environ.get("DEEPENC_CRYPTO_BACKEND")
+    if requested:
+        if requested not in available:
+            raise ImportError(f"Crypto backend '{requested}' is not installed")
+        return requested
+    return available[0]
+
+
+# 导入时确定一次
+CRYPTO_BACKEND = _select_backend()
+if CRYPTO_BACKEND == "numba":
+    from . import _aes_fallback
+
+# AES-128/192/256 的合法密钥字节数
+AES_KEY_SIZES = frozenset((16, 24, 32))
+
+
+@lru_cache(maxsize=1)
+def hardware_aes_available():
+    """探测 CPU 是否有 AES 指令（x86 的 AES-NI 或 ARMv8 的 AES 扩展）
+
+    只在进程内探测一次。优先使用 pycryptodome 自带的 CPUID 检测，
+    其次读取 /proc/cpuinfo 的特性标志。
+
+    Returns:
+        bool | None: 是否支持，无法判断时返回 None
+    """
+    try:
+        from Crypto.Util._cpu_features import have_aes_ni
+    except ImportError:
+        pass
+    else:
+        # 只检测 x86，返回 0 时（如 ARM）继续看 cpuinfo
+        if have_aes_ni():
+            return True
+
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name.strip() in ("flags", "Features"):
+                    return "aes" in value.split()
+    except OSError:
+        pass
+    return None
+
+
+def hardware_aes_in_use():
+    """当前后端是否使用 CPU 的 AES 指令
+
+    cryptography（OpenSSL）和 pycryptodome 在 CPU 支持时自动使用；
+    Numba 后备实现是查表法，不使用。
+
+    Returns:
+        bool | None: 是否使用，无法判断时返回 None
+    """
+    if CRYPTO_BACKEND == "numba":
+        return False
+    return hardware_aes_available()
+
+
+@lru_cache(maxsize=8)
+def _aes_key_bytes(key):
+    """编码并校验 AES 密钥
+
+    一次构建只用一个密钥，按密钥缓存结果，逐文件加密时
+    不再重复编码和校验。
+
+    Args:
+        key: 加密密钥 (str)
+
+    Returns:
+        bytes: UTF-8 编码后的密钥
+
+    Raises:
+        EncryptionError: 密钥长度不是 16、24 或 32 字节
+    """
+    key_bytes = key.encode("utf-8")
+    if len(key_bytes) not in AES_KEY_SIZES:
+        raise EncryptionError(
+            f"AES 密钥长度必须是 16、24 或 32 字节，当前长度: {len(key_bytes)}"
+        )
+    return key_bytes
+
+
+@lru_cache(maxsize=8)
+def _aes_algorithm(key_bytes):
+    """按密钥缓存 cryptography 的 AES 算法对象（含密钥校验）
+
+    Args:
+        key_bytes: 已校验的密钥
+
+    Returns:
+        algorithms.AES: 算法对象
+    """
+    return algorithms.AES(key_bytes)
+
+
+@lru_cache(maxsize=8)
+def _cfb_cipher(key_bytes, iv):
+    """按密钥缓存 cryptography 的 CFB Cipher 对象
+
+    CFB 模式的 IV 固定为 salt，同一密钥的 Cipher 可以反复创建
+    加解密上下文，每个文件只需调用一次 encryptor()/decryptor()。
+
+    Args:
+        key_bytes: 已校验的密钥
+        iv: 16 字节 IV
+
+    Returns:
+        Cipher: Cipher 对象
+    """
+    return Cipher(_aes_algorithm(key_bytes), CFB(iv))
 
 
 class AESCrypto:
@@ -22,6 +182,10 @@ class AESCrypto:
 
     与原项目的 Crypt 类兼容的加密实现。
     使用固定的 salt 和 CFB 模式进行加密。
+
+    可选的 CTR 模式：文件以 CTR_MAGIC 和随机 nonce 开头，各分组可以
+    并行计算，吞吐量明显高于逐块串行的 CFB。解密时根据文件头自动识别，
+    没有文件头的按 CFB 处理，旧文件不受影响。
     """
 
     # 固定的 salt，与原项目保持一致
@@ -30,13 +194,45 @@ class AESCrypto:
     # 默认加密长度：10MB
     DEFAULT_ENC_LEN = 1024 * 1024 * 10
 
-    def __init__(self, enc_len=None):
+    # 超过该大小的文件使用 mmap 流式加密：16MB
+    MMAP_THRESHOLD = 16 << 20
+
+    # 流式加密的分块大小：4MB（16 字节的整数倍，保证 CFB 分段连续）
+    STREAM_CHUNK_SIZE = 1 << 22
+
+    # 支持的加密模式，cfb 为原项目格式
+    CIPHER_MODES = ("cfb", "ctr")
+
+    # CTR 格式的文件头：魔数 + 12 字节随机 nonce（其后 4 字节计数器从 0 开始）
+    CTR_MAGIC = b"DENC\x02"
+    CTR_NONCE_SIZE = 12
+
+    # 写入预分配缓冲区时需要比输入多留的字节数（cryptography 的 update_into
+    # 要求缓冲区不小于输入长度加分组长度减一）
+    INTO_PADDING = 15
+
+    def __init__(self, enc_len=None, drop_page_cache=False, mode="cfb"):
         """初始化加密器
 
         Args:
             enc_len: 加密长度，默认 10MB
+            drop_page_cache: 写完加密文件后是否 fsync 并释放其页缓存，
+                解密文件时读完也释放其页缓存
+            mode: 加密新文件使用的模式，'cfb'（默认，兼容旧版本加载器）
+                或 'ctr'；解密时总是根据文件头自动识别
+
+        Raises:
+            EncryptionError: 不支持的加密模式，或 SALT 不是 16 字节
         """
+        if mode not in self.CIPHER_MODES:
+            raise EncryptionError(f"不支持的加密模式: {mode}")
+        # SALT 同时用作 CFB 的 IV，必须是一个分组长度
+        if len(self.SALT) != 16:
+            raise EncryptionError(f"IV 必须是 16 字节长度，当前长度: {len(self.SALT)}")
+
         self.enc_len = enc_len or self.DEFAULT_ENC_LEN
+        self.drop_page_cache = drop_page_cache
+        self.mode = mode
         self.enc_dec_method = "utf-8"
 
     def encrypt(self, data, key):
@@ -59,33 +255,23 @@ class AESCrypto:
             raise EncryptionError("密钥必须是 str 类型")
 
         try:
-            # 验证密钥长度
-            key_bytes = key.encode("utf-8")
-            if len(key_bytes) not in [16, 24, 32]:
-                raise EncryptionError(
-                    f"AES 密钥长度必须是 16、24 或 32 字节，当前长度: {len(key_bytes)}"
-                )
-
-            # 验证 salt 长度
-            if len(self.SALT) != 16:
-                raise EncryptionError(f"IV 必须是 16 字节长度，当前长度: {len(self.SALT)}")
-
-            # 创建 AES 加密对象
-            aes_obj = AES.new(key_bytes, AES.MODE_CFB, self.SALT, segment_size=128)
+            # 创建 AES 加密函数（密钥校验结果按密钥缓存）
+            header, encrypt = self._new_encryptor(key)
 
             # 部分加密：只加密前面的部分，后面保持原样
-            encrypted_part = aes_obj.encrypt(data[: self.enc_len])
-            remaining_part = data[self.enc_len :]
+            # 两部分都经 memoryview 切片，加密部分整段交给一次 update，
+            # 后端可以在整段数据上批量处理分组；剩余部分只在拼接时复制一次
+            view = memoryview(data)
+            encrypted_part = encrypt(view[: self.enc_len])
+            remaining_part = view[self.enc_len :]
 
-            return encrypted_part + remaining_part
+            return b"".join((header, encrypted_part, remaining_part))
 
+        except EncryptionError:
+            # 密钥无效等已经说明原因的错误直接抛出
+            raise
         except ValueError as e:
-            if "IV must be 16 bytes long" in str(e):
-                raise EncryptionError("加密错误: SALT 必须是 16 字符长度")
-            elif "AES key must be either 16, 24, or 32 bytes long" in str(e):
-                raise EncryptionError("加密错误: 加密密钥必须是 16、24 或 32 字符长度")
-            else:
-                raise EncryptionError(f"加密失败: {e}")
+            raise EncryptionError(f"加密失败: {e}")
         except Exception as e:
             raise EncryptionError(f"加密过程中发生错误: {e}")
 
@@ -109,59 +295,174 @@ class AESCrypto:
             raise DecryptionError("密钥必须是 str 类型")
 
         try:
-            # 验证密钥长度
-            key_bytes = key.encode("utf-8")
-            if len(key_bytes) not in [16, 24, 32]:
-                raise DecryptionError(
-                    f"AES 密钥长度必须是 16、24 或 32 字节，当前长度: {len(key_bytes)}"
-                )
-
-            # 验证 salt 长度
-            if len(self.SALT) != 16:
-                raise DecryptionError(f"IV 必须是 16 字节长度，当前长度: {len(self.SALT)}")
-
-            # 创建 AES 解密对象
-            aes_obj = AES.new(key_bytes, AES.MODE_CFB, self.SALT, segment_size=128)
+            # 创建 AES 解密函数（密钥校验结果按密钥缓存）
+            if encrypted_data.startswith(self.CTR_MAGIC):
+                header_size = len(self.CTR_MAGIC) + self.CTR_NONCE_SIZE
+                nonce = encrypted_data[len(self.CTR_MAGIC) : header_size]
+                decrypt = self._new_cipher(key, decrypt=True, nonce=nonce)
+                # 用 memoryview 去掉文件头，不复制整份数据
+                view = memoryview(encrypted_data)[header_size:]
+            else:
+                decrypt = self._new_cipher(key, decrypt=True)
+                view = memoryview(encrypted_data)
 
             # 部分解密：只解密前面的部分，后面保持原样
-            decrypted_part = aes_obj.decrypt(encrypted_data[: self.enc_len])
-            remaining_part = encrypted_data[self.enc_len :]
+            # 两部分都经 memoryview 切片，解密部分整段交给一次 update，
+            # 后端可以在整段数据上批量处理分组；剩余部分只在拼接时复制一次
+            decrypted_part = decrypt(view[: self.enc_len])
+            remaining_part = view[self.enc_len :]
 
             return decrypted_part + remaining_part
 
+        except EncryptionError as e:
+            # 密钥校验失败，原因已经说明
+            raise DecryptionError(str(e))
         except ValueError as e:
-            if "IV must be 16 bytes long" in str(e):
-                raise DecryptionError("解密错误: SALT 必须是 16 字符长度")
-            elif "AES key must be either 16, 24, or 32 bytes long" in str(e):
-                raise DecryptionError("解密错误: 解密密钥必须是 16、24 或 32 字符长度")
-            else:
-                raise DecryptionError(f"解密失败: {e}")
+            raise DecryptionError(f"解密失败: {e}")
         except Exception as e:
             raise DecryptionError(f"解密过程中发生错误: {e}")
 
     def encrypt_file(self, input_path, output_path, key):
         """加密文件
 
+        先写入同目录下的临时文件再 os.replace 到目标路径，
+        中途失败不会留下半个加密文件。
+
         Args:
             input_path: 输入文件路径
             output_path: 输出文件路径
             key: 加密密钥
         """
+        tmp_path = f"{output_path}.tmp"
         try:
-            with open(input_path, "rb") as f:
-                data = f.read()
-
-            encrypted_data = self.encrypt(data, key)
-
             # 确保输出目录存在
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-            with open(output_path, "wb") as f:
-                f.write(encrypted_data)
+            with open(tmp_path, "wb") as dst:
+                # 大文件（如 ONNX 模型）直接映射到内存，避免 read() 的整份拷贝
+                if os.path.getsize(input_path) > self.MMAP_THRESHOLD:
+                    with open(input_path, "rb") as src, mmap.mmap(
+                        src.fileno(), 0, access=mmap.ACCESS_READ
+                    ) as mm:
+                        # 映射区只从头到尾扫一遍，提示内核加大预读
+                        if hasattr(mm, "madvise"):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        with memoryview(mm) as view:
+                            self._write_encrypted(view, dst, key)
+                else:
+                    data = FileSystemUtils.read_bytes(input_path)
+                    with memoryview(data) as view:
+                        self._write_encrypted(view, dst, key)
+
+                if self.drop_page_cache:
+                    dst.flush()
+                    FileSystemUtils.drop_page_cache(dst.fileno(), sync=True)
+
+            os.replace(tmp_path, output_path)
 
         except Exception as e:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
             raise EncryptionError(f"加密文件失败 {input_path}: {e}")
 
+    def _write_encrypted(self, view, dst, key):
+        """把数据加密后写入输出文件
+
+        加密部分按块送入 cipher，密文写入复用的缓冲区；剩余部分
+        直接从输入写出。不拼接出整份密文，也不为每个分块分配新对象。
+
+        Args:
+            view: 输入数据的 memoryview（读入的 bytes 或 mmap 映射区）
+            dst: 已打开的输出文件（二进制写模式）
+            key: 加密密钥
+        """
+        header, encrypt_into = self._new_encryptor(key, into=True)
+        chunk = self.STREAM_CHUNK_SIZE
+        total = len(view)
+        enc_end = min(total, self.enc_len)
+
+        dst.write(header)
+        out = memoryview(bytearray(min(chunk, enc_end) + self.INTO_PADDING))
+        for offset in range(0, enc_end, chunk):
+            with view[offset : min(offset + chunk, enc_end)] as piece:
+                dst.write(out[: encrypt_into(piece, out)])
+
+        for offset in range(enc_end, total, chunk):
+            dst.write(view[offset : offset + chunk])
+
+    def _new_encryptor(self, key, into=False):
+        """按 self.mode 创建加密新文件用的加密函数
+
+        Args:
+            key: 加密密钥 (str)
+            into: 是否返回写入预分配缓冲区的函数，见 _new_cipher
+
+        Returns:
+            tuple: (需要写在密文前面的文件头, 加密函数)
+        """
+        if self.mode == "ctr":
+            # 每个文件使用新的随机 nonce，密钥流不会重复
+            nonce = os.urandom(self.CTR_NONCE_SIZE)
+            encrypt = self._new_cipher(key, nonce=nonce, into=into)
+            return self.CTR_MAGIC + nonce, encrypt
+        return b"", self._new_cipher(key, into=into)
+
+    def _new_cipher(self, key, decrypt=False, nonce=None, into=False):
+        """校验密钥并创建 AES 加密（或解密）函数
+
+        Args:
+            key: 加密密钥 (str)
+            decrypt: 是否创建解密函数
+            nonce: CTR 模式的 12 字节 nonce，为 None 时使用 CFB 模式
+            into: 为 True 时返回 fn(data, out)：结果写入可写缓冲区 out
+                （长度不小于 len(data) + INTO_PADDING），返回写入的字节数
+
+        Returns:
+            callable: 接收 bytes 类数据、返回处理结果的函数；
+                多次调用视为同一数据流的连续分段
+
+        Raises:
+            EncryptionError: 密钥无效
+        """
+        if not isinstance(key, str):
+            raise EncryptionError("密钥必须是 str 类型")
+
+        # 密码上下文不能重置 IV，每个文件都要新建；密钥的编码和校验、
+        # cryptography 的算法对象和 CFB Cipher 对象按密钥缓存复用
+        key_bytes = _aes_key_bytes(key)
+        if CRYPTO_BACKEND == "cryptography":
+            # 两个后端的 CTR 都是 12 字节 nonce 加 4 字节大端计数器，输出一致
+            if nonce is None:
+                cipher = _cfb_cipher(key_bytes, self.SALT)
+            else:
+                cipher = Cipher(_aes_algorithm(key_bytes), CTR(nonce + bytes(4)))
+            # CFB、CTR 都不需要填充，finalize 不会再产生输出
+            context = cipher.decryptor() if decrypt else cipher.encryptor()
+            return context.update_into if into else context.update
+
+        if CRYPTO_BACKEND == "numba":
+            context = _aes_fallback.StreamCipher(
+                key_bytes, iv=self.SALT, nonce=nonce, decrypt=decrypt
+            )
+            return context.update_into if into else context.update
+
+        if nonce is None:
+            aes_obj = AES.new(key_bytes, AES.MODE_CFB, self.SALT, segment_size=128)
+        else:
+            aes_obj = AES.new(key_bytes, AES.MODE_CTR, nonce=nonce, initial_value=0)
+        transform = aes_obj.decrypt if decrypt else aes_obj.encrypt
+        if not into:
+            return transform
+
+        def transform_into(data, out):
+            size = len(data)
+            transform(data, output=out[:size])
+            return size
+
+        return transform_into
+
     def decrypt_file(self, encrypted_path, key):
         """解密文件到内存
 
@@ -173,14 +474,66 @@ class AESCrypto:
             bytes: 解密后的数据
         """
         try:
-            with open(encrypted_path, "rb") as f:
-                encrypted_data = f.read()
+            encrypted_data = FileSystemUtils.read_bytes(
+                encrypted_path, drop_cache=self.drop_page_cache
+            )
 
             return self.decrypt(encrypted_data, key)
 
         except Exception as e:
             raise DecryptionError(f"解密文件失败 {encrypted_path}: {e}")
 
+    def decrypt_file_inplace(self, encrypted_path, key):
+        """解密文件到可写缓冲区
+
+        与 decrypt_file 结果相同，但在读入的缓冲区上就地解密：只分配
+        一份文件大小的内存和一个分块大小的中转区，峰值内存约为
+        decrypt_file 的一半。
+
+        Args:
+            encrypted_path: 加密文件路径
+            key: 解密密钥 (str)
+
+        Returns:
+            bytearray: 解密后的数据
+
+        Raises:
+            DecryptionError: 解密失败
+        """
+        if not isinstance(key, str):
+            raise DecryptionError("密钥必须是 str 类型")
+
+        try:
+            data = FileSystemUtils.read_bytearray(
+                encrypted_path, drop_cache=self.drop_page_cache
+            )
+
+            if data.startswith(self.CTR_MAGIC):
+                header_size = len(self.CTR_MAGIC) + self.CTR_NONCE_SIZE
+                nonce = bytes(data[len(self.CTR_MAGIC) : header_size])
+                decrypt_into = self._new_cipher(
+                    key, decrypt=True, nonce=nonce, into=True
+                )
+                # 从 bytearray 头部删除只移动起始偏移，不复制数据
+                del data[:header_size]
+            else:
+                decrypt_into = self._new_cipher(key, decrypt=True, into=True)
+
+            # 只解密前 enc_len 字节，按块解密到中转区再写回原位置
+            chunk = self.STREAM_CHUNK_SIZE
+            enc_end = min(len(data), self.enc_len)
+            out = memoryview(bytearray(min(chunk, enc_end) + self.INTO_PADDING))
+            with memoryview(data) as view:
+                for offset in range(0, enc_end, chunk):
+                    end = min(offset + chunk, enc_end)
+                    with view[offset:end] as piece:
+                        count = decrypt_into(piece, out)
+                    view[offset : offset + count] = out[:count]
+            return data
+
+        except Exception as e:
+            raise DecryptionError(f"解密文件失败 {encrypted_path}: {e}")
+
     def verify_key(self, key):
         """验证密钥格式
 
@@ -194,8 +547,64 @@ class AESCrypto:
             if not isinstance(key, str):
                 return False
 
-            key_bytes = key.encode("utf-8")
-            return len(key_bytes) in [16, 24, 32]
+            return len(key.encode("utf-8")) in AES_KEY_SIZES
 
         except Exception:
             return False
+
+    def bind(self, key):
+        """绑定密钥，返回不必再逐次传入密钥的加解密对象
+
+        密钥在绑定时校验一次，无效密钥立即报错，而不是等到第一次解密。
+
+        Args:
+            key: 加密密钥 (str)
+
+        Returns:
+            BoundAESCrypto: 绑定了密钥的加解密对象
+
+        Raises:
+            EncryptionError: 密钥无效
+        """
+        if not isinstance(key, str):
+            raise EncryptionError("密钥必须是 str 类型")
+        _aes_key_bytes(key)
+        return BoundAESCrypto(self, key)
+
+
+class BoundAESCrypto:
+    """绑定了密钥的 AESCrypto
+
+    由 AESCrypto.bind 创建。运行时加载器在整个进程中只使用一个密钥，
+    绑定后每次解密不再获取和传递密钥。
+    """
+
+    def __init__(self, crypto, key):
+        """初始化
+
+        Args:
+            crypto: AESCrypto 实例
+            key: 已校验的加密密钥
+        """
+        self.crypto = crypto
+        self._key = key
+
+    def encrypt(self, data):
+        """加密数据，见 AESCrypto.encrypt"""
+        return self.crypto.encrypt(data, self._key)
+
+    def decrypt(self, encrypted_data):
+        """解密数据，见 AESCrypto.decrypt"""
+        return self.crypto.decrypt(encrypted_data, self._key)
+
+    def encrypt_file(self, input_path, output_path):
+        """加密文件，见 AESCrypto.encrypt_file"""
+        return self.crypto.encrypt_file(input_path, output_path, self._key)
+
+    def decrypt_file(self, encrypted_path):
+        """解密文件到内存，见 AESCrypto.decrypt_file"""
+        return self.crypto.decrypt_file(encrypted_path, self._key)
+
+    def decrypt_file_inplace(self, encrypted_path):
+        """就地解密文件到可写缓冲区，见 AESCrypto.decrypt_file_inplace"""
+        return self.crypto.decrypt_file_inplace(encrypted_path, self._key)
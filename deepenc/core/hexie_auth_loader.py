@@ -8,9 +8,12 @@ hexie_auth 动态加载器
 """
 
 import importlib.util
+import logging
 import sys
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 def load_hexie_auth():
     """动态加载 hexie_auth 模块
@@ -27,54 +30,54 @@ def load_hexie_auth():
         python_minor = sys.version_info.minor
         python_version = f"{python_major}{python_minor}"
 
-        # 只允许 38 到 313 之间的 Python 版本
-        allowed_versions = [f"{i}" for i in range(38, 314)]
-        if python_version not in allowed_versions:
+        # 只允许 3.8 到 3.13 之间的 Python 版本
+        if not (3, 8) <= (python_major, python_minor) <= (3, 13):
             print(
-                f"❌ hexie auth 不支持的 Python 版本: {python_major}.{python_minor} (仅支持 3.8 ~ 3.13)"
+                f"❌ hexie auth 不支持的 Python 版本: {python_major}.{python_minor}"
+                " (仅支持 3.8 ~ 3.13)"
             )
             return None
 
-        # 构建可能的 SO 文件路径
+        # 按优先级依次尝试可能的 SO 文件名，找到第一个存在的即停止
         current_dir = Path(__file__).parent
-        so_files = [
-            current_dir / f"hexie_auth.cpython-{python_version}-x86_64-linux-gnu.so",
-            current_dir / f"hexie_auth.cpython-{python_version}-linux-gnu.so",
-            current_dir / "hexie_auth.so",
-        ]
-        # 查找可用的 SO 文件
+        so_names = (
+            f"hexie_auth.cpython-{python_version}-x86_64-linux-gnu.so",
+            f"hexie_auth.cpython-{python_version}-linux-gnu.so",
+            "hexie_auth.so",
+        )
         so_file = None
-        for file_path in so_files:
+        for name in so_names:
+            file_path = current_dir / name
             if file_path.exists():
                 so_file = file_path
                 break
 
         # 如果没有找到精确匹配的版本，尝试查找所有可用的 SO 文件
         if not so_file:
-            print(f"🔍 未找到精确匹配 Python {python_version} 的 SO 文件，搜索所有可用文件...")
+            print(f"⚠️ 未找到精确匹配 Python {python_version} 的 SO 文件，搜索所有可用文件...")
             for file_path in current_dir.glob("hexie_auth.cpython-*.so"):
-                print(f"  发现: {file_path.name}")
+                logger.debug("发现: %s", file_path.name)
                 # 选择第一个可用的文件
                 so_file = file_path
                 break
 
         if not so_file:
-            print(f"❌ 未找到任何可用的 hexie_auth.so 文件")
+            print("❌ 未找到任何可用的 hexie_auth.so 文件")
             return None
 
-        print(f"🔍 选择 SO 文件: {so_file}")
+        logger.debug("选择 SO 文件: %s", so_file)
 
         # 动态加载 SO 文件
         spec = importlib.util.spec_from_file_location("hexie_auth", so_file)
         if not spec:
-            print("❌ 无法创建模块规格")
+            print("❌ 无法创建 hexie_auth 模块规格")
             return None
 
         # 创建并执行模块
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
 
-        print("✅ 成功动态加载 hexie_auth 模块")
+        logger.debug("成功动态加载 hexie_auth 模块")
         return module
 
     except Exception as e:
@@ -93,7 +96,10 @@ def get_auth_class():
     """
     try:
         module = load_hexie_auth()
-        if module and hasattr(module, "Auth"):
+        if module is None:
+            # 失败原因已由 load_hexie_auth 打印
+            return None
+        if hasattr(module, "Auth"):
             return module.Auth
         else:
             print("❌ hexie_auth 模块中未找到 Auth 类")
@@ -8,10 +8,93 @@
 """
 
 import fnmatch
-from pathlib import Path
+import logging
+import os
+import re
+from functools import lru_cache
 
 from ..core.errors import FileDiscoveryError
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=64)
+def compile_patterns(patterns):
+    """把一组 fnmatch 通配符合并编译成一个正则
+
+    与逐个调用 fnmatch.fnmatch 等价（同样先 normcase），
+    但每个名字只需一次正则匹配。
+
+    Args:
+        patterns: 通配符集合（frozenset，作为缓存键）
+
+    Returns:
+        re.Pattern | None: 合并后的正则，集合为空时返回 None
+    """
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(fnmatch.translate(os.path.normcase(p)) for p in sorted(patterns))
+    )
+
+
+def _has_magic(pattern):
+    """通配符模式中是否含有通配字符"""
+    return "*" in pattern or "?" in pattern or "[" in pattern
+
+
+@lru_cache(maxsize=64)
+def compile_matcher(patterns):
+    """把一组 fnmatch 通配符编译成判断函数
+
+    结果与 compile_patterns 的正则 match 一致，但按模式的形状分流：
+    不含通配符的放进集合，"*后缀"、"前缀*" 交给 str.endswith/startswith，
+    "*片段*" 合并成一个只含字面量的正则做 search，只有其余模式才走
+    逐个尝试分支的通配符正则。默认规则几乎都属于前几类。
+
+    Args:
+        patterns: 通配符集合（frozenset，作为缓存键）
+
+    Returns:
+        callable | None: 接收（已 normcase 的）名字、返回是否匹配的函数，
+            集合为空时返回 None
+    """
+    if not patterns:
+        return None
+
+    literals, suffixes, prefixes, fragments, others = set(), [], [], [], set()
+    for pattern in map(os.path.normcase, patterns):
+        head, tail = pattern[:1] == "*", pattern[-1:] == "*"
+        if not _has_magic(pattern):
+            literals.add(pattern)
+        elif head and tail and len(pattern) > 2 and not _has_magic(pattern[1:-1]):
+            fragments.append(pattern[1:-1])
+        elif head and not _has_magic(pattern[1:]):
+            suffixes.append(pattern[1:])
+        elif tail and not _has_magic(pattern[:-1]):
+            prefixes.append(pattern[:-1])
+        else:
+            others.add(pattern)
+
+    literals = frozenset(literals)
+    suffixes = tuple(sorted(suffixes))
+    prefixes = tuple(sorted(prefixes))
+    fragment_re = (
+        re.compile("|".join(map(re.escape, sorted(fragments)))) if fragments else None
+    )
+    others_re = compile_patterns(frozenset(others))
+
+    def match(name):
+        return (
+            name in literals
+            or name.endswith(suffixes)
+            or name.startswith(prefixes)
+            or (fragment_re is not None and fragment_re.search(name) is not None)
+            or (others_re is not None and others_re.match(name) is not None)
+        )
+
+    return match
+
 
 class FileFilter:
     """文件过滤器
@@ -116,6 +199,17 @@ class FileFilter:
         if custom_rules:
             self._apply_custom_rules(custom_rules)
 
+        self._recompile()
+
+    def _recompile(self):
+        """把文件名和路径排除规则编译成判断函数
+
+        排除规则变化后调用（add_exclude_rule、remove_exclude_rule
+        会自动调用；直接修改集合后需要手动调用）。
+        """
+        self._file_match = compile_matcher(frozenset(self.exclude_files))
+        self._path_match = compile_matcher(frozenset(self.exclude_paths))
+
     def _apply_custom_rules(self, custom_rules):
         """应用自定义过滤规则
 
@@ -141,67 +235,84 @@ class FileFilter:
             for include_file in custom_rules["include_files"]:
                 self.exclude_files.discard(include_file)
 
-    def should_include_file(self, file_path, project_root=None):
+    def should_include_file(self, file_path, project_root=None, *, assume_file=False):
         """判断文件是否应该包含
 
         Args:
             file_path: 文件路径
             project_root: 项目根目录
+            assume_file: 调用方已确认路径是存在的普通文件
+                （如来自 scandir/rglob 的结果）时置 True，省去两次 stat
 
         Returns:
             bool: 是否应该包含
         """
+        return self._include_file(
+            file_path, self._normalize_root(project_root), assume_file
+        )
+
+    @staticmethod
+    def _normalize_root(project_root):
+        """把项目根目录规范化为字符串，批量过滤时只需计算一次"""
+        if not project_root:
+            return None
+        return os.path.normpath(os.fspath(project_root))
+
+    def _include_file(self, file_path, root, assume_file=False):
+        """should_include_file 的实现，root 已经过 _normalize_root"""
         try:
-            path_obj = Path(file_path)
+            path_str = os.path.normpath(os.fspath(file_path))
 
-            # 检查文件是否存在
-            if not path_obj.exists():
+            # 检查文件是否存在且是普通文件（is_file 对不存在的路径返回 False）
+            if not assume_file and not os.path.isfile(path_str):
                 return False
 
-            # 检查是否是文件
-            if not path_obj.is_file():
+            # 获取相对路径（用于路径模式匹配），文件不在项目根目录下时用完整路径
+            relative_path_str = path_str
+            if root is not None and root != os.curdir:
+                prefix = root.rstrip(os.sep) + os.sep
+                if path_str.startswith(prefix):
+                    relative_path_str = path_str[len(prefix) :]
+
+            # 检查目录排除规则 - 有项目根目录时只检查相对路径中的目录，
+            # 否则检查完整路径。排除目录是精确的名字，按分隔符切开后做
+            # 集合查找比合并成一个正则搜索更快
+            if not self.exclude_dirs.isdisjoint(relative_path_str.split(os.sep)):
                 return False
 
-            # 获取相对路径（用于路径模式匹配）
-            if project_root:
-                try:
-                    relative_path = path_obj.relative_to(Path(project_root))
-                    relative_path_str = str(relative_path)
-                except ValueError:
-                    # 文件不在项目根目录下
-                    relative_path_str = str(path_obj)
-            else:
-                relative_path_str = str(path_obj)
-
-            # 检查目录排除规则 - 只检查相对路径中的目录
-            if project_root:
-                relative_path_obj = Path(relative_path_str)
-                for exclude_dir in self.exclude_dirs:
-                    if exclude_dir in relative_path_obj.parts:
-                        return False
-            else:
-                # 如果没有项目根目录，检查完整路径
-                for exclude_dir in self.exclude_dirs:
-                    if exclude_dir in path_obj.parts:
-                        return False
-
-            # 检查文件名排除规则
-            file_name = path_obj.name
-            for exclude_pattern in self.exclude_files:
-                if fnmatch.fnmatch(file_name, exclude_pattern):
-                    return False
-
-            # 检查路径排除规则
-            for exclude_pattern in self.exclude_paths:
-                if fnmatch.fnmatch(relative_path_str, exclude_pattern):
-                    return False
-
-            return True
+            return self.match_file_rules(
+                os.path.basename(path_str), relative_path_str
+            )
 
         except Exception as e:
-            print(f"⚠️ 文件过滤检查失败 {file_path}: {e}")
+            logger.warning("文件过滤检查失败 %s: %s", file_path, e)
+            return False
+
+    def match_file_rules(self, file_name, relative_path_str):
+        """只按文件名和路径规则判断文件是否应该包含
+
+        不访问文件系统，也不检查目录排除规则，
+        供已经跳过排除目录的遍历过程使用。
+
+        Args:
+            file_name: 文件名
+            relative_path_str: 相对项目根目录的路径字符串
+
+        Returns:
+            bool: 是否应该包含
+        """
+        # 检查文件名排除规则
+        file_match = self._file_match
+        if file_match is not None and file_match(os.path.normcase(file_name)):
+            return False
+
+        # 检查路径排除规则
+        path_match = self._path_match
+        if path_match is not None and path_match(os.path.normcase(relative_path_str)):
             return False
 
+        return True
+
     def should_include_directory(self, dir_path):
         """判断目录是否应该包含
 
@@ -212,14 +323,12 @@ class FileFilter:
             bool: 是否应该包含
         """
         try:
-            path_obj = Path(dir_path)
-
-            # 检查目录是否存在
-            if not path_obj.exists() or not path_obj.is_dir():
+            # 检查目录是否存在（isdir 对不存在的路径返回 False，只需一次 stat）
+            if not os.path.isdir(dir_path):
                 return False
 
             # 检查目录名是否在排除列表中
-            dir_name = path_obj.name
+            dir_name = os.path.basename(os.path.normpath(os.fspath(dir_path)))
             if dir_name in self.exclude_dirs:
                 return False
 
@@ -230,48 +339,54 @@ class FileFilter:
             return True
 
         except Exception as e:
-            print(f"⚠️ 目录过滤检查失败 {dir_path}: {e}")
+            logger.warning("目录过滤检查失败 %s: %s", dir_path, e)
             return False
 
-    def filter_files(self, file_list, project_root=None):
+    def filter_files(self, file_list, project_root=None, *, assume_file=False):
         """批量过滤文件
 
         Args:
             file_list: 文件路径列表
             project_root: 项目根目录
+            assume_file: 列表中的路径均已确认是存在的普通文件
 
         Returns:
             list: 过滤后的文件列表
         """
-        filtered_files = []
-
-        for file_path in file_list:
-            if self.should_include_file(file_path, project_root):
-                filtered_files.append(file_path)
-
-        return filtered_files
-
-    def get_filter_stats(self, file_list, project_root=None):
+        root = self._normalize_root(project_root)
+        return [
+            file_path
+            for file_path in file_list
+            if self._include_file(file_path, root, assume_file)
+        ]
+
+    def get_filter_stats(
+        self, file_list, project_root=None, *, assume_file=False, included_files=None
+    ):
         """获取过滤统计信息
 
         Args:
             file_list: 文件路径列表
             project_root: 项目根目录
+            assume_file: 列表中的路径均已确认是存在的普通文件
+            included_files: 已经用 filter_files 过滤得到的结果，
+                传入时直接统计，不再重新过滤一遍
 
         Returns:
             dict: 过滤统计信息
         """
         total_files = len(file_list)
-        included_files = self.filter_files(file_list, project_root)
-        excluded_count = total_files - len(included_files)
+        if included_files is None:
+            included_files = self.filter_files(
+                file_list, project_root, assume_file=assume_file
+            )
+        included_count = len(included_files)
 
         return {
             "total_files": total_files,
-            "included_files": len(included_files),
-            "excluded_files": excluded_count,
-            "inclusion_rate": len(included_files) / total_files
-            if total_files > 0
-            else 0,
+            "included_files": included_count,
+            "excluded_files": total_files - included_count,
+            "inclusion_rate": included_count / total_files if total_files > 0 else 0,
         }
 
     def add_exclude_rule(self, rule_type, pattern):
@@ -290,7 +405,8 @@ class FileFilter:
         else:
             raise FileDiscoveryError(f"未知的规则类型: {rule_type}")
 
-        print(f"➕ 添加排除规则 ({rule_type}): {pattern}")
+        self._recompile()
+        logger.info("添加排除规则 (%s): %s", rule_type, pattern)
 
     def remove_exclude_rule(self, rule_type, pattern):
         """移除排除规则
@@ -308,4 +424,5 @@ class FileFilter:
         else:
             raise FileDiscoveryError(f"未知的规则类型: {rule_type}")
 
-        print(f"➖ 移除排除规则 ({rule_type}): {pattern}")
+        self._recompile()
+        logger.info("移除排除规则 (%s): %s", rule_type, pattern)
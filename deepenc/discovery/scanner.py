@@ -7,11 +7,17 @@
 遵循 Linux 内核的设备发现机制。
 """
 
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from ..core.errors import FileDiscoveryError
 from .filters import FileFilter
 
+logger = logging.getLogger(__name__)
+
 
 class FileScanner:
     """文件扫描器
@@ -19,6 +25,18 @@ class FileScanner:
     智能扫描项目中的 Python 文件和 ONNX 模型文件。
     """
 
+    # 待遍历的子目录达到该数量时才并行遍历，否则线程调度开销得不偿失
+    PARALLEL_MIN_SUBDIRS = 4
+
+    # 并行遍历的线程数上限：遍历以等待 I/O 为主，线程数可以多于 CPU 核数
+    PARALLEL_MAX_WORKERS = 32
+
+    # 进程内缓存的发现结果数量上限
+    DISCOVERY_CACHE_SIZE = 8
+
+    # 发现结果缓存: {(项目根目录, 过滤规则, 目录状态): (Python 文件, ONNX 文件)}
+    _discovery_cache = OrderedDict()
+
     def __init__(self, project_root=None, filter_rules=None):
         """初始化文件扫描器
 
@@ -33,7 +51,7 @@ class FileScanner:
         if not self.project_root.exists():
             raise FileDiscoveryError(f"项目根目录不存在: {self.project_root}")
 
-        print(f"📁 项目根目录: {self.project_root}")
+        logger.info("项目根目录: %s", self.project_root)
 
     def discover_python_files(self):
         """发现所有 Python 文件
@@ -42,15 +60,10 @@ class FileScanner:
             list: Python 文件信息列表
         """
         try:
-            python_files = []
-
-            # 递归扫描所有 .py 文件
-            for py_file in self.project_root.rglob("*.py"):
-                if self.file_filter.should_include_file(py_file, self.project_root):
-                    file_info = self._create_python_file_info(py_file)
-                    python_files.append(file_info)
+            # 与 discover_all_files 共用一次 scandir 遍历，文件大小取自 DirEntry
+            python_files = self._discover_cached()[0]
 
-            print(f"🐍 发现 {len(python_files)} 个 Python 文件")
+            logger.info("发现 %d 个 Python 文件", len(python_files))
             return python_files
 
         except Exception as e:
@@ -63,15 +76,10 @@ class FileScanner:
             list: ONNX 文件信息列表
         """
         try:
-            onnx_files = []
-
-            # 递归扫描所有 .onnx 文件
-            for onnx_file in self.project_root.rglob("*.onnx"):
-                if self.file_filter.should_include_file(onnx_file, self.project_root):
-                    file_info = self._create_onnx_file_info(onnx_file)
-                    onnx_files.append(file_info)
+            # 与 discover_all_files 共用一次 scandir 遍历，文件大小取自 DirEntry
+            onnx_files = self._discover_cached()[1]
 
-            print(f"🧠 发现 {len(onnx_files)} 个 ONNX 模型")
+            logger.info("发现 %d 个 ONNX 模型", len(onnx_files))
             return onnx_files
 
         except Exception as e:
@@ -84,8 +92,7 @@ class FileScanner:
             dict: 包含 Python 文件和 ONNX 文件的字典
         """
         try:
-            python_files = self.discover_python_files()
-            onnx_files = self.discover_onnx_files()
+            python_files, onnx_files = self._discover_cached()
 
             discovery_result = {
                 "python_files": python_files,
@@ -94,21 +101,221 @@ class FileScanner:
                 "project_root": str(self.project_root),
             }
 
-            print(f"📊 文件发现完成:")
-            print(f"  - Python 文件: {len(python_files)} 个")
-            print(f"  - ONNX 模型: {len(onnx_files)} 个")
-            print(f"  - 总计: {discovery_result['total_files']} 个文件")
+            logger.info(
+                "文件发现完成: Python 文件 %d 个, ONNX 模型 %d 个, 总计 %d 个文件",
+                len(python_files),
+                len(onnx_files),
+                discovery_result["total_files"],
+            )
 
             return discovery_result
 
         except Exception as e:
             raise FileDiscoveryError(f"文件发现失败: {e}")
 
-    def _create_python_file_info(self, py_file):
+    @classmethod
+    def invalidate(cls):
+        """清空进程内的发现结果缓存"""
+        cls._discovery_cache.clear()
+
+    def _discover_cached(self):
+        """带进程内缓存的文件发现
+
+        同一进程中 build 会多次发现同一项目的文件（加密 Python、
+        加密 ONNX、统计排除文件）。缓存键包含过滤规则和所有未排除
+        目录的 mtime，文件增删、重命名都会改变所在目录的 mtime
+        使缓存失效；只修改文件内容时 file_size 可能是旧值。
+
+        Returns:
+            tuple: (Python 文件信息列表, ONNX 文件信息列表)
+        """
+        file_filter = self.file_filter
+        key = (
+            str(self.project_root),
+            frozenset(file_filter.exclude_dirs),
+            frozenset(file_filter.exclude_files),
+            frozenset(file_filter.exclude_paths),
+            self._directory_stamp(),
+        )
+
+        cache = self._discovery_cache
+        cached = cache.get(key)
+        if cached is None:
+            cached = self._walk_project()
+            cache[key] = cached
+            while len(cache) > self.DISCOVERY_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+
+        # 返回新列表，调用方修改结果不会影响缓存
+        python_files, onnx_files = cached
+        return list(python_files), list(onnx_files)
+
+    def _directory_stamp(self):
+        """汇总所有未排除目录的 mtime
+
+        只 stat 目录，不 stat 普通文件，也不做文件名匹配，
+        比完整的发现过程便宜得多。
+
+        Returns:
+            tuple: (目录数, 最大 mtime_ns, mtime_ns 之和)
+        """
+        exclude_dirs = self.file_filter.exclude_dirs
+        root = str(self.project_root)
+        st = os.stat(root)
+        count, latest, total = 1, st.st_mtime_ns, st.st_mtime_ns
+
+        stack = [root]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                        if entry.name in exclude_dirs:
+                            continue
+                        mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+                    except OSError:
+                        continue
+                    count += 1
+                    total += mtime
+                    if mtime > latest:
+                        latest = mtime
+                    stack.append(entry.path)
+
+        return count, latest, total
+
+    def _walk_project(self):
+        """一次遍历同时收集 Python 文件和 ONNX 文件
+
+        排除目录在遍历时直接剪枝，不再进入。子目录较多时按子目录
+        分片交给线程池遍历（os.scandir 会释放 GIL，在网络文件系统上
+        收益明显），结果按目录顺序合并，与串行遍历一致。顶层子目录
+        不足 PARALLEL_MIN_SUBDIRS 个时（如只有 src、tests 的项目）
+        逐层展开，直到分片足够或已经没有更深的子目录。
+
+        Returns:
+            tuple: (Python 文件信息列表, ONNX 文件信息列表)
+        """
+        # 分片按串行遍历的顺序排列：已收集的 (Python 文件, ONNX 文件)，
+        # 或待遍历的子目录相对路径
+        shards = [""]
+        pending = shards
+        while 0 < len(pending) < self.PARALLEL_MIN_SUBDIRS:
+            expanded = []
+            for shard in shards:
+                if isinstance(shard, str):
+                    files = ([], [])
+                    subdirs = self._scan_directory(shard, *files)
+                    expanded.append(files)
+                    expanded.extend(subdirs)
+                else:
+                    expanded.append(shard)
+            shards = expanded
+            pending = [shard for shard in shards if isinstance(shard, str)]
+
+        results = iter(())
+        if pending:
+            workers = min(self.PARALLEL_MAX_WORKERS, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = iter(list(executor.map(self._scan_subtree, pending)))
+
+        python_files = []
+        onnx_files = []
+        for shard in shards:
+            sub_python, sub_onnx = next(results) if isinstance(shard, str) else shard
+            python_files.extend(sub_python)
+            onnx_files.extend(sub_onnx)
+
+        return python_files, onnx_files
+
+    def _scan_subtree(self, relative_dir, python_files=None, onnx_files=None):
+        """深度优先遍历一个子目录
+
+        Args:
+            relative_dir: 相对项目根目录的子目录路径
+            python_files: 追加 Python 文件信息的列表，默认新建
+            onnx_files: 追加 ONNX 文件信息的列表，默认新建
+
+        Returns:
+            tuple: (Python 文件信息列表, ONNX 文件信息列表)
+        """
+        if python_files is None:
+            python_files = []
+        if onnx_files is None:
+            onnx_files = []
+
+        stack = [relative_dir]
+        while stack:
+            subdirs = self._scan_directory(stack.pop(), python_files, onnx_files)
+            # 逆序入栈，保证按目录项顺序出栈
+            stack.extend(reversed(subdirs))
+
+        return python_files, onnx_files
+
+    def _scan_directory(self, relative_dir, python_files, onnx_files):
+        """扫描单个目录中的文件
+
+        Args:
+            relative_dir: 相对项目根目录的目录路径，根目录为空字符串
+            python_files: 追加 Python 文件信息的列表
+            onnx_files: 追加 ONNX 文件信息的列表
+
+        Returns:
+            list: 需要继续遍历的子目录相对路径
+        """
+        subdirs = []
+        exclude_dirs = self.file_filter.exclude_dirs
+        match_file_rules = self.file_filter.match_file_rules
+        dir_path = os.path.join(self.project_root, relative_dir)
+        try:
+            it = os.scandir(dir_path)
+        except OSError:
+            return subdirs
+
+        with it:
+            for entry in it:
+                name = entry.name
+                try:
+                    # 与 rglob 一致，不进入符号链接目录
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in exclude_dirs:
+                            subdirs.append(os.path.join(relative_dir, name))
+                        continue
+
+                    if name.endswith(".py"):
+                        target = python_files
+                        create_info = self._create_python_file_info
+                    elif name.endswith(".onnx"):
+                        target = onnx_files
+                        create_info = self._create_onnx_file_info
+                    else:
+                        continue
+
+                    # 只对 .py、.onnx 文件拼接相对路径
+                    if entry.is_file() and match_file_rules(
+                        name, os.path.join(relative_dir, name)
+                    ):
+                        target.append(
+                            create_info(Path(entry.path), entry.stat().st_size)
+                        )
+                except OSError:
+                    # 遍历期间被删除的文件直接跳过
+                    continue
+
+        return subdirs
+
+    def _create_python_file_info(self, py_file, file_size=None):
         """创建 Python 文件信息
 
         Args:
             py_file: Python 文件路径对象
+            file_size: 已知的文件大小，省略时读取文件状态
 
         Returns:
             dict: 文件信息
@@ -120,15 +327,16 @@ class FileScanner:
             "file_path": str(py_file),
             "relative_path": str(relative_path),
             "module_name": module_name,
-            "file_size": py_file.stat().st_size,
+            "file_size": py_file.stat().st_size if file_size is None else file_size,
             "file_type": "python",
         }
 
-    def _create_onnx_file_info(self, onnx_file):
+    def _create_onnx_file_info(self, onnx_file, file_size=None):
         """创建 ONNX 文件信息
 
         Args:
             onnx_file: ONNX 文件路径对象
+            file_size: 已知的文件大小，省略时读取文件状态
 
         Returns:
             dict: 文件信息
@@ -140,7 +348,7 @@ class FileScanner:
             "file_path": str(onnx_file),
             "relative_path": str(relative_path),
             "model_name": model_name,
-            "file_size": onnx_file.stat().st_size,
+            "file_size": onnx_file.stat().st_size if file_size is None else file_size,
             "file_type": "onnx",
         }
 
@@ -198,13 +406,16 @@ class FileScanner:
 
             # 检查目录是否应该包含
             if not self.file_filter.should_include_directory(dir_path):
-                print(f"⏭️ 跳过排除目录: {directory}")
+                logger.info("跳过排除目录: %s", directory)
                 return []
 
             # 扫描文件
             files = []
             for file_path in dir_path.rglob(file_pattern):
-                if self.file_filter.should_include_file(file_path, self.project_root):
+                # 先做纯字符串的规则匹配，只对保留下来的条目 stat 一次
+                if self.file_filter.should_include_file(
+                    file_path, self.project_root, assume_file=True
+                ) and file_path.is_file():
                     files.append(str(file_path))
 
             return files
@@ -219,35 +430,82 @@ class FileScanner:
             dict: 扫描统计信息
         """
         try:
-            # 统计所有文件
-            all_py_files = list(self.project_root.rglob("*.py"))
-            all_onnx_files = list(self.project_root.rglob("*.onnx"))
-
-            # 统计过滤后的文件
-            filtered_py = self.file_filter.filter_files(
-                [str(f) for f in all_py_files], str(self.project_root)
-            )
-            filtered_onnx = self.file_filter.filter_files(
-                [str(f) for f in all_onnx_files], str(self.project_root)
-            )
+            # 一次 scandir 遍历同时得到全部文件数和过滤后保留的文件数
+            counts = self._count_files()
+            total_py, filtered_py = counts[".py"]
+            total_onnx, filtered_onnx = counts[".onnx"]
 
             return {
                 "project_root": str(self.project_root),
-                "total_python_files": len(all_py_files),
-                "total_onnx_files": len(all_onnx_files),
-                "filtered_python_files": len(filtered_py),
-                "filtered_onnx_files": len(filtered_onnx),
-                "python_exclusion_rate": 1 - (len(filtered_py) / len(all_py_files))
-                if all_py_files
+                "total_python_files": total_py,
+                "total_onnx_files": total_onnx,
+                "filtered_python_files": filtered_py,
+                "filtered_onnx_files": filtered_onnx,
+                "python_exclusion_rate": 1 - (filtered_py / total_py)
+                if total_py
                 else 0,
-                "onnx_exclusion_rate": 1 - (len(filtered_onnx) / len(all_onnx_files))
-                if all_onnx_files
+                "onnx_exclusion_rate": 1 - (filtered_onnx / total_onnx)
+                if total_onnx
                 else 0,
             }
 
         except Exception as e:
             raise FileDiscoveryError(f"获取扫描统计信息失败: {e}")
 
+    def _count_files(self):
+        """统计项目中的 Python 和 ONNX 文件
+
+        排除目录也要进入，计入全部文件数，但其中的文件不算保留；
+        与 rglob 一致，不进入符号链接目录。文件名、是否排除都取自
+        DirEntry，不为每个文件单独 stat。
+
+        Returns:
+            dict: {后缀: [全部文件数, 过滤后保留的文件数]}
+        """
+        exclude_dirs = self.file_filter.exclude_dirs
+        match_file_rules = self.file_filter.match_file_rules
+        counts = {".py": [0, 0], ".onnx": [0, 0]}
+
+        # 栈中元素: (相对路径, 是否位于排除目录中)
+        stack = [("", False)]
+        while stack:
+            relative_dir, excluded = stack.pop()
+            try:
+                it = os.scandir(os.path.join(self.project_root, relative_dir))
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    name = entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(
+                                (
+                                    os.path.join(relative_dir, name),
+                                    excluded or name in exclude_dirs,
+                                )
+                            )
+                            continue
+
+                        # 大多数文件既不是 .py 也不是 .onnx，只对命中的
+                        # 文件拼接相对路径
+                        count = counts.get(os.path.splitext(name)[1])
+                        if count is None:
+                            continue
+                        count[0] += 1
+                        if (
+                            not excluded
+                            and entry.is_file()
+                            and match_file_rules(
+                                name, os.path.join(relative_dir, name)
+                            )
+                        ):
+                            count[1] += 1
+                    except OSError:
+                        continue
+
+        return counts
+
     def find_files_by_pattern(self, pattern):
         """根据模式查找文件
 
@@ -261,7 +519,10 @@ class FileScanner:
             matched_files = []
 
             for file_path in self.project_root.rglob(pattern):
-                if self.file_filter.should_include_file(file_path, self.project_root):
+                # 先做纯字符串的规则匹配，只对保留下来的条目 stat 一次
+                if self.file_filter.should_include_file(
+                    file_path, self.project_root, assume_file=True
+                ) and file_path.is_file():
                     matched_files.append(str(file_path))
 
             return matched_files
@@ -282,24 +543,23 @@ class FileScanner:
         try:
             matched_files = []
 
-            # 扫描所有相关文件
-            for file_pattern in ["*.py", "*.onnx"]:
-                for file_path in self.project_root.rglob(file_pattern):
-                    if self.file_filter.should_include_file(
-                        file_path, self.project_root
-                    ):
-                        file_size = file_path.stat().st_size
-
-                        # 检查文件大小
-                        if file_size >= min_size:
-                            if max_size is None or file_size <= max_size:
-                                matched_files.append(
-                                    {
-                                        "file_path": str(file_path),
-                                        "file_size": file_size,
-                                        "file_type": file_path.suffix[1:],  # 移除点号
-                                    }
-                                )
+            # 与文件发现共用一次 scandir 遍历，文件大小取自 DirEntry；
+            # 不走发现结果缓存，缓存中的文件大小可能已经过时
+            python_files, onnx_files = self._walk_project()
+            for file_info in python_files + onnx_files:
+                file_size = file_info["file_size"]
+
+                # 检查文件大小
+                if file_size >= min_size:
+                    if max_size is None or file_size <= max_size:
+                        matched_files.append(
+                            {
+                                "file_path": file_info["file_path"],
+                                "file_size": file_size,
+                                # 扩展名（不含点号）
+                                "file_type": file_info["file_path"].rsplit(".", 1)[1],
+                            }
+                        )
 
             return matched_files
 
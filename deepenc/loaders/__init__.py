@@ -6,7 +6,16 @@
 提供智能的模块和模型加载功能。
 """
 
-from .module_loader import SmartModuleLoader
-from .onnx_loader import SmartONNXLoader
+from ..utils.lazy import lazy_exports
+
+# 首次访问时才导入的名字：onnx_loader 会导入 onnxruntime，
+# 只使用模块加载器时不必为此付出启动开销
+_LAZY_IMPORTS = {
+    "SmartModuleLoader": ".module_loader",
+    "SmartONNXLoader": ".onnx_loader",
+}
 
 __all__ = ["SmartModuleLoader", "SmartONNXLoader"]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS, globals())
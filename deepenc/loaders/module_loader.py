@@ -7,14 +7,71 @@
 遵循 Linux 内核的模块加载机制设计。
 """
 
+import hashlib
 import importlib.abc
 import importlib.machinery
+import importlib.util
+import logging
+import marshal
 import os
+import site
+import struct
 import sys
+import sysconfig
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 
-from ..core.auth import AuthManager
-from ..core.crypto import AESCrypto
 from ..core.errors import DecryptionError, LoaderError
+from ..utils.fs import FileSystemUtils
+from ..utils.stdlib import STDLIB_MODULES
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _system_path_prefixes():
+    """标准库和 site-packages 目录前缀
+
+    这些目录只存放解释器自带和 pip 安装的代码，不会出现加密模块，
+    自动发现时直接跳过。
+
+    Returns:
+        tuple: 规范化后以路径分隔符结尾的目录前缀
+    """
+    paths = set()
+    config_paths = sysconfig.get_paths()
+    for name in ("stdlib", "platstdlib", "purelib", "platlib"):
+        if config_paths.get(name):
+            paths.add(config_paths[name])
+    try:
+        paths.update(site.getsitepackages())
+        paths.add(site.getusersitepackages())
+    except AttributeError:
+        # 旧版 virtualenv 的 site 模块没有这两个函数
+        pass
+
+    return tuple(
+        os.path.join(os.path.normcase(os.path.abspath(path)), "") for path in paths
+    )
+
+
+@lru_cache(maxsize=1024)
+def _is_system_directory(directory):
+    """判断绝对路径是否位于标准库或 site-packages 下
+
+    结果在进程内所有加载器实例间共享，重复安装加载器（如测试中
+    反复 install/uninstall）时不再重新计算。
+
+    Args:
+        directory: 绝对路径
+
+    Returns:
+        bool: 是否是系统目录
+    """
+    path = os.path.join(os.path.normcase(os.path.normpath(directory)), "")
+    return path.startswith(_system_path_prefixes())
 
 
 class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
@@ -24,12 +81,74 @@ class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
     实现了完全透明的加密模块加载机制。
     """
 
-    def __init__(self):
-        """初始化模块加载器"""
-        self.crypto = AESCrypto()
-        self.auth_manager = AuthManager()
+    # 进程内缓存的已编译代码对象数量上限
+    CODE_CACHE_SIZE = 256
+
+    # 自动发现时检查的加密文件扩展名（按优先级）。同一模块存在多个
+    # 加密文件时决定用哪一个，不能按命中频率调整顺序；查找本身是
+    # 目录内容缓存上的集合查询，顺序不影响开销
+    ENCRYPTED_EXTENSIONS = (".encrypted", ".py.encrypted", ".enc")
+
+    # 自动发现未命中结果的缓存数量上限
+    NEGATIVE_CACHE_SIZE = 1024
+
+    # 后台预解密的最大线程数
+    PREFETCH_WORKERS = 8
+
+    # 磁盘代码缓存的文件头（加密前）: Python 字节码魔数、加密文件的 mtime_ns 和大小
+    CODE_CACHE_HEADER = struct.Struct("<4sQQ")
+
+    def __init__(self, code_cache_dir=None):
+        """初始化模块加载器
+
+        Args:
+            code_cache_dir: 磁盘代码缓存目录，默认取环境变量
+                DEEPENC_CODE_CACHE_DIR；都未设置时不写磁盘缓存
+        """
         self.encrypted_modules = {}
-        self._cache = {}  # 解密后的代码缓存
+        self.code_cache_dir = code_cache_dir or os.environ.get(
+            "DEEPENC_CODE_CACHE_DIR"
+        )
+        # 已编译代码缓存: {(加密文件路径, mtime_ns, 文件大小): code}
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # 正在后台预解密的模块: {加密文件路径: Future}
+        self._prefetching = {}
+        # 目录内容缓存: {目录: (mtime_ns, (文件名集合, 子目录名集合))}
+        self._dir_index = {}
+        # 自动发现未命中缓存: {(模块名, 搜索路径): None}
+        self._negative_cache = OrderedDict()
+
+    @cached_property
+    def crypto(self):
+        """加密引擎，首次解密模块时才导入加密库并创建"""
+        from ..core.crypto import AESCrypto
+
+        return AESCrypto()
+
+    @cached_property
+    def auth_manager(self):
+        """授权管理器，首次解密模块时才加载授权库并创建"""
+        from ..core.auth import AuthManager
+
+        return AuthManager()
+
+    @cached_property
+    def _bound_crypto(self):
+        """绑定了当前密钥的加密引擎，整个进程只获取和校验一次密钥"""
+        return self.crypto.bind(self.auth_manager.get_key())
+
+    @cached_property
+    def _bound_cache_crypto(self):
+        """加密磁盘代码缓存用的加密引擎
+
+        使用 CTR 模式，每个缓存文件随机 nonce。缓存文件头是可以猜到的
+        （魔数、mtime、大小），若用模块文件的 CFB 固定 IV 加密，会暴露
+        所有模块文件首个分组共用的密钥流。解密时按文件头自动识别模式。
+        """
+        from ..core.crypto import AESCrypto
+
+        return AESCrypto(mode="ctr").bind(self.auth_manager.get_key())
 
     def register_encrypted_module(self, module_name, encrypted_file_path):
         """注册加密模块
@@ -39,7 +158,9 @@ class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
             encrypted_file_path: 加密文件路径
         """
         self.encrypted_modules[module_name] = encrypted_file_path
-        print(f"🔐 {module_name}")
+        # 新注册的模块可能改变此前未命中的发现结果
+        self._negative_cache.clear()
+        logger.debug("注册加密模块: %s", module_name)
 
     def find_spec(self, fullname, path, target=None):
         """查找模块规范
@@ -58,12 +179,14 @@ class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
         try:
             # 1. 检查是否是已知的加密模块
             if fullname in self.encrypted_modules:
-                encrypted_path = self.encrypted_modules[fullname]
-                return importlib.machinery.ModuleSpec(
-                    fullname, self, origin=encrypted_path
-                )
+                return self._make_spec(fullname, self.encrypted_modules[fullname])
 
-            # 2. 借鉴标准库：优先使用 path 参数，回退到 sys.path
+            # 2. 标准库模块不会有加密版本，直接交给标准导入器；
+            #    要用加密模块覆盖同名标准库模块时需要显式注册
+            if fullname.partition('.')[0] in STDLIB_MODULES:
+                return None
+
+            # 3. 借鉴标准库：优先使用 path 参数，回退到 sys.path
             if path is not None:
                 search_paths = path
                 # 如果 path 是空列表，直接返回 None（没有搜索路径）
@@ -72,23 +195,61 @@ class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
             else:
                 search_paths = sys.path
             
-            # 3. 自动发现加密版本（使用正确的搜索路径）
-            encrypted_path = self._discover_encrypted_version(fullname, search_paths)
-            if encrypted_path:
-                print(f"🔐 {fullname} -> {os.path.basename(encrypted_path)}")
+            # 4. 此前已确认没有加密版本的模块直接跳过
+            negative_key = (fullname, tuple(search_paths))
+            if '' in search_paths:
+                # 空路径代表当前工作目录，切换目录后不能沿用旧的未命中记录
+                negative_key += (os.getcwd(),)
+            negative_cache = self._negative_cache
+            if negative_key in negative_cache:
+                negative_cache.move_to_end(negative_key)
+                return None
+
+            # 5. 自动发现加密版本（使用正确的搜索路径）
+            found = self._discover_encrypted_version(fullname, search_paths)
+            if found:
+                encrypted_path, is_package = found
+                logger.debug("发现加密模块: %s -> %s", fullname, encrypted_path)
                 # 自动注册发现的加密模块
                 self.register_encrypted_module(fullname, encrypted_path)
-                return importlib.machinery.ModuleSpec(
-                    fullname, self, origin=encrypted_path
-                )
+                return self._make_spec(fullname, encrypted_path, is_package)
 
-            # 4. 没有找到加密版本，交给其他导入器处理
+            # 6. 没有找到加密版本，记录未命中后交给其他导入器处理
+            negative_cache[negative_key] = None
+            while len(negative_cache) > self.NEGATIVE_CACHE_SIZE:
+                negative_cache.popitem(last=False)
             return None
 
         except Exception as e:
-            print(f"⚠️ {fullname}: {e}")
+            logger.warning("查找模块失败 %s: %s", fullname, e)
             return None
 
+    def _make_spec(self, fullname, encrypted_path, is_package=None):
+        """创建加密模块的模块规范
+
+        借鉴标准库 SourceFileLoader：是否为包记录在规范的
+        submodule_search_locations 上，设置模块属性时直接复制，
+        不再做路径解析和 stat。
+
+        Args:
+            fullname: 完整模块名
+            encrypted_path: 加密文件路径
+            is_package: 是否是包，None 时按文件名是否为 __init__ 文件判断
+
+        Returns:
+            ModuleSpec: 模块规范
+        """
+        if is_package is None:
+            is_package = os.path.basename(encrypted_path).startswith("__init__")
+
+        spec = importlib.machinery.ModuleSpec(
+            fullname, self, origin=encrypted_path, is_package=is_package
+        )
+        if is_package:
+            spec.submodule_search_locations = [os.path.dirname(encrypted_path)]
+        spec.has_location = True
+        return spec
+
     def create_module(self, spec):
         """创建模块对象
         
@@ -114,91 +275,229 @@ class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
         module_name = module.__name__
 
         try:
-            # 检查缓存
-            if module_name in self._cache:
-                # 设置重要的模块属性
-                self._setup_module_attributes(module, module_name)
-                exec(self._cache[module_name], module.__dict__)
-                return module
-
             # 获取加密文件路径
             encrypted_file = self.encrypted_modules.get(module_name)
             if not encrypted_file:
                 raise LoaderError(f"模块 {module_name} 未找到加密版本")
 
-            # 解密模块
-            decrypted_content = self._decrypt_module(encrypted_file)
-
-            # 缓存解密后的内容
-            self._cache[module_name] = decrypted_content
+            # 解密并编译（文件未变化时直接复用缓存的代码对象）
+            code = self._get_code(encrypted_file)
 
             # 设置重要的模块属性
             self._setup_module_attributes(module, module_name, encrypted_file)
 
-            # 执行解密后的代码
-            exec(decrypted_content, module.__dict__)
-            print(f"✅ {module_name}")
+            # 执行编译后的代码
+            exec(code, module.__dict__)
+            logger.debug("加密模块已加载: %s", module_name)
 
             return module
 
         except Exception as e:
             raise LoaderError(f"执行模块失败 {module_name}: {e}")
 
-    def _setup_module_attributes(self, module, module_name, encrypted_file_path=None):
-        """设置模块的重要属性
+    def _get_code(self, encrypted_file_path):
+        """获取加密模块编译后的代码对象
 
-        确保加密模块具有与普通模块相同的属性。
+        缓存键包含文件的 mtime 和大小，文件被替换后自动重新解密；
+        缓存按最近使用淘汰，最多保留 CODE_CACHE_SIZE 个代码对象。
+        缓存的是代码对象而不是源码，重复加载时省去解析和编译。
+        解密结果以字节串直接交给 compile，由它按 PEP 263 识别
+        BOM 和编码声明，省去一次整份源码的解码复制。
 
         Args:
-            module: 模块对象
-            module_name: 模块名称
             encrypted_file_path: 加密文件路径
+
+        Returns:
+            code: 编译后的代码对象
         """
-        # 设置 __file__ 属性
-        if encrypted_file_path:
-            module.__file__ = encrypted_file_path
-        else:
-            # 如果没有文件路径，设置一个合理的默认值
-            module.__file__ = f"<encrypted:{module_name}>"
-
-        # 设置 __name__ 属性
-        module.__name__ = module_name
+        future = self._prefetching.pop(encrypted_file_path, None)
+        if future is not None:
+            # 后台预解密尚未完成时等待它，不重复解密；
+            # 预解密失败时由下面重新解密并报告错误
+            try:
+                future.result()
+            except Exception:
+                pass
+
+        return self._load_code(encrypted_file_path)
+
+    def _load_code(self, encrypted_file_path):
+        """_get_code 的实现，也是后台预解密线程执行的任务"""
+        st = os.stat(encrypted_file_path)
+        key = (encrypted_file_path, st.st_mtime_ns, st.st_size)
+
+        cache = self._cache
+        with self._cache_lock:
+            code = cache.get(key)
+            if code is not None:
+                cache.move_to_end(key)
+                return code
+
+        # 解密和编译不持有锁，多个线程可以同时处理不同模块
+        code = self._read_code_cache(encrypted_file_path, st)
+        if code is None:
+            # 明文源码不留引用，编译完成后立即释放
+            code = compile(
+                self._decrypt_module(encrypted_file_path),
+                encrypted_file_path,
+                "exec",
+                dont_inherit=True,
+            )
+            self._write_code_cache(encrypted_file_path, st, code)
+
+        with self._cache_lock:
+            cache[key] = code
+            while len(cache) > self.CODE_CACHE_SIZE:
+                cache.popitem(last=False)
+        return code
+
+    def _code_cache_path(self, encrypted_file_path):
+        """加密文件对应的磁盘代码缓存文件路径"""
+        digest = hashlib.sha256(
+            os.path.abspath(encrypted_file_path).encode("utf-8", "surrogateescape")
+        ).hexdigest()
+        return os.path.join(self.code_cache_dir, digest[:32] + ".enc")
+
+    def _read_code_cache(self, encrypted_file_path, st):
+        """从磁盘代码缓存读取编译好的代码对象
+
+        缓存文件用模块本身的密钥加密，解密后校验文件头：Python 版本、
+        加密文件的 mtime 和大小任一不符（或密钥已更换）都视为未命中。
+
+        Args:
+            encrypted_file_path: 加密文件路径
+            st: 加密文件的状态
+
+        Returns:
+            code | None: 代码对象，未启用或未命中时返回 None
+        """
+        if not self.code_cache_dir:
+            return None
+
+        cache_path = self._code_cache_path(encrypted_file_path)
+        try:
+            data = self._bound_cache_crypto.decrypt_file_inplace(cache_path)
+        except DecryptionError:
+            return None
+
+        header = self.CODE_CACHE_HEADER
+        expected = (importlib.util.MAGIC_NUMBER, st.st_mtime_ns, st.st_size)
+        if len(data) < header.size or header.unpack_from(data) != expected:
+            return None
+        try:
+            return marshal.loads(memoryview(data)[header.size :])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _write_code_cache(self, encrypted_file_path, st, code):
+        """把代码对象加密后写入磁盘代码缓存
+
+        字节码可以反编译出源码，因此同样加密保存（CTR 模式），文件权限为 0600；
+        先写临时文件再 os.replace，并发写入的进程不会读到半个文件。
+        写入失败只记录日志，不影响模块加载。
 
-        # 设置 __package__ 属性
-        if "." in module_name:
-            module.__package__ = ".".join(module_name.split(".")[:-1])
-        else:
-            module.__package__ = ""
+        Args:
+            encrypted_file_path: 加密文件路径
+            st: 加密文件的状态
+            code: 编译好的代码对象
+        """
+        if not self.code_cache_dir:
+            return
 
-        # 设置 __spec__ 属性
+        cache_path = self._code_cache_path(encrypted_file_path)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
         try:
-            module.__spec__ = importlib.machinery.ModuleSpec(
-                module_name, self, origin=module.__file__
+            header = self.CODE_CACHE_HEADER.pack(
+                importlib.util.MAGIC_NUMBER, st.st_mtime_ns, st.st_size
             )
-        except Exception:
-            # 如果创建 ModuleSpec 失败，保持原有的 __spec__
-            pass
+            data = self._bound_cache_crypto.encrypt(header + marshal.dumps(code))
 
-        # 设置 __cached__ 属性
-        if encrypted_file_path:
-            module.__cached__ = encrypted_file_path
-        else:
-            module.__cached__ = None
+            os.makedirs(self.code_cache_dir, mode=0o700, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            FileSystemUtils.safe_remove(tmp_path)
+            logger.debug("写入代码缓存失败 %s: %s", encrypted_file_path, e)
 
-        # 设置其他重要的模块属性
-        module.__loader__ = self
-        module.__path__ = None  # 对于非包模块
+    def prefetch(self, module_names=None):
+        """在后台线程池中预先解密并编译已注册的加密模块
 
-        # 如果是包模块，设置 __path__
-        # 检查文件名是否为 __init__ 文件来判断是否为包
-        if (encrypted_file_path and 
-            os.path.basename(encrypted_file_path).startswith('__init__')):
-            try:
-                package_path = os.path.dirname(encrypted_file_path)
-                if os.path.isdir(package_path):
-                    module.__path__ = [package_path]
-            except Exception:
-                pass
+        立即返回，不阻塞调用方。解密时 AES 和文件读取都会释放 GIL，
+        多个模块的读取和解密可以重叠；导入时若预解密已完成则直接
+        命中缓存，未完成则等待该模块的结果。
+
+        Args:
+            module_names: 要预解密的模块名，默认为全部已注册模块
+        """
+        if module_names is None:
+            module_names = list(self.encrypted_modules)
+
+        # dict.fromkeys 按注册顺序去重（多个模块名可能指向同一文件），
+        # 不必对列表做线性查找
+        encrypted_modules = self.encrypted_modules
+        paths = [
+            path
+            for path in dict.fromkeys(
+                encrypted_modules.get(module_name) for module_name in module_names
+            )
+            if path and path not in self._prefetching
+        ]
+        # 超过缓存容量的部分预解密后也会被淘汰
+        paths = paths[: self.CODE_CACHE_SIZE]
+        if not paths:
+            return
+
+        workers = min(self.PREFETCH_WORKERS, os.cpu_count() or 1, len(paths))
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="deepenc-prefetch"
+        )
+        try:
+            for path in paths:
+                # 提示内核提前把整个文件读入页缓存，与解密并行进行
+                FileSystemUtils.advise_willneed(path)
+                self._prefetching[path] = executor.submit(self._load_code, path)
+        finally:
+            executor.shutdown(wait=False)
+        logger.debug("后台预解密 %d 个加密模块", len(paths))
+
+    def _setup_module_attributes(self, module, module_name, encrypted_file_path=None):
+        """设置模块的重要属性
+
+        确保加密模块具有与普通模块相同的属性。
+        属性从模块规范复制，经 find_spec 导入时复用其中已确定的包信息。
+
+        Args:
+            module: 模块对象
+            module_name: 模块名称
+            encrypted_file_path: 加密文件路径
+        """
+        spec = getattr(module, "__spec__", None)
+        if (
+            spec is None
+            or spec.loader is not self
+            or spec.origin != encrypted_file_path
+        ):
+            if encrypted_file_path:
+                spec = self._make_spec(module_name, encrypted_file_path)
+            else:
+                # 如果没有文件路径，设置一个合理的默认值
+                spec = importlib.machinery.ModuleSpec(
+                    module_name, self, origin=f"<encrypted:{module_name}>"
+                )
+
+        module.__file__ = spec.origin
+        module.__name__ = module_name
+        module.__package__ = spec.parent
+        module.__spec__ = spec
+        module.__cached__ = encrypted_file_path
+        module.__loader__ = self
+        # 只有包才有 __path__：导入系统按 hasattr(module, "__path__")
+        # 判断是否是包，非包模块带上 __path__ 会让每条 from 导入都
+        # 走一遍子模块查找
+        if spec.submodule_search_locations is not None:
+            module.__path__ = spec.submodule_search_locations
 
     def _discover_encrypted_version(self, module_name, search_paths):
         """自动发现加密版本
@@ -210,37 +509,93 @@ class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
             search_paths: 搜索路径列表
 
         Returns:
-            str: 加密文件路径，未找到返回 None
+            tuple: (加密文件路径, 是否是包)，未找到返回 None
         """
         # 借鉴 FileFinder 的实现：提取模块的尾部名称
         tail_module = module_name.rpartition('.')[2]
-        
+        # 候选文件名与搜索路径无关，按尾部名称缓存
+        candidates = self._candidate_names(tail_module)
+
         # 遍历搜索路径
         for search_path in search_paths:
-            if not isinstance(search_path, str):
+            if not isinstance(search_path, str) or self._is_system_path(search_path):
                 continue
-                
+
+            files, dirs = self._list_directory(search_path)
+            if tail_module in dirs:
+                package_path = os.path.join(search_path, tail_module)
+                package_files = self._list_directory(package_path)[0]
+            else:
+                package_files = ()
+
             # 检查各种可能的加密文件扩展名
-            encrypted_extensions = [".encrypted", ".py.encrypted", ".enc"]
-            
-            for ext in encrypted_extensions:
+            for init_name, module_file in candidates:
                 # 借鉴标准库 FileFinder：只使用 tail_module，不使用完整路径
-                
+
                 # 1. 先检查包形式 (__init__ 文件)
-                base_path = os.path.join(search_path, tail_module)
-                if os.path.isdir(base_path):
-                    init_encrypted = os.path.join(base_path, '__init__' + ext)
-                    if os.path.isfile(init_encrypted):
-                        return init_encrypted
-                
+                if init_name in package_files:
+                    return os.path.join(package_path, init_name), True
+
                 # 2. 再检查单文件形式
-                module_file_path = os.path.join(search_path, tail_module + ext)
-                if os.path.isfile(module_file_path):
-                    return module_file_path
+                if module_file in files:
+                    return os.path.join(search_path, module_file), False
 
         return None
 
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _candidate_names(cls, tail_module):
+        """模块尾部名称对应的候选加密文件名
+
+        同一个名称在每个搜索路径、每次导入都会查找，结果按名称缓存，
+        不再重复拼接字符串。
+
+        Args:
+            tail_module: 模块名的最后一段
+
+        Returns:
+            tuple: 按扩展名优先级排列的 (包的 __init__ 文件名, 单文件模块文件名)
+        """
+        return tuple(
+            ('__init__' + ext, tail_module + ext) for ext in cls.ENCRYPTED_EXTENSIONS
+        )
+
+    @staticmethod
+    def _is_system_path(search_path):
+        """判断搜索路径是否位于标准库或 site-packages 下
+
+        相对路径（含表示当前目录的空字符串）先按当前工作目录转换成
+        绝对路径，切换工作目录后不会沿用旧的判断结果。
+
+        Args:
+            search_path: 搜索路径
+
+        Returns:
+            bool: 是否是系统目录
+        """
+        if not os.path.isabs(search_path):
+            search_path = os.path.abspath(search_path)
+        return _is_system_directory(search_path)
+
+    def _list_directory(self, directory):
+        """列出搜索路径中的文件名和子目录名
+
+        Args:
+            directory: 目录路径，空字符串表示当前目录
+
+        Returns:
+            tuple: (文件名集合, 子目录名集合)，目录不可读时均为空
+        """
+        return FileSystemUtils.list_directory(directory, self._dir_index)
+
+    def invalidate_caches(self):
+        """清空目录内容缓存和自动发现未命中缓存
 
+        importlib.invalidate_caches() 会对 sys.meta_path 上的查找器调用此方法，
+        运行期间新增加密文件后需要调用它才能被发现。
+        """
+        self._dir_index.clear()
+        self._negative_cache.clear()
 
     def _decrypt_module(self, encrypted_file_path):
         """解密模块文件
@@ -249,22 +604,15 @@ class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
             encrypted_file_path: 加密文件路径
 
         Returns:
-            str: 解密后的 Python 代码
+            bytearray: 解密后的 Python 源码字节串
 
         Raises:
             DecryptionError: 解密失败
         """
         try:
-            # 获取加密密钥
-            encryption_key = self.auth_manager.get_key()
-
-            # 解密文件
-            decrypted_data = self.crypto.decrypt_file(
-                encrypted_file_path, encryption_key
-            )
-
-            # 转换为字符串
-            return decrypted_data.decode("utf-8")
+            # 解密文件（密钥在首次解密时获取并绑定）；就地解密，
+            # compile 直接接受 bytearray，不再复制出第二份源码
+            return self._bound_crypto.decrypt_file_inplace(encrypted_file_path)
 
         except Exception as e:
             raise DecryptionError(f"解密模块失败 {encrypted_file_path}: {e}")
@@ -278,7 +626,7 @@ class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
         return {
             "cached_modules": len(self._cache),
             "registered_modules": len(self.encrypted_modules),
-            "cache_keys": list(self._cache.keys()),
+            "cache_keys": [path for path, _, _ in self._cache],
             "registered_keys": list(self.encrypted_modules.keys()),
             "search_paths": [os.path.abspath(p) for p in sys.path if p and os.path.exists(p)],
         }
@@ -286,7 +634,12 @@ class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
     def clear_cache(self):
         """清理缓存"""
         self._cache.clear()
-        print("🧹 缓存已清理")
+        self._prefetching.clear()
+        # 许可证更新后下次解密重新获取密钥
+        self.__dict__.pop("_bound_crypto", None)
+        self.__dict__.pop("_bound_cache_crypto", None)
+        self.invalidate_caches()
+        logger.info("模块加载器缓存已清理")
 
     def unregister_module(self, module_name):
         """取消注册模块
@@ -294,13 +647,13 @@ class SmartModuleLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
         Args:
             module_name: 要取消注册的模块名
         """
-        if module_name in self.encrypted_modules:
-            del self.encrypted_modules[module_name]
-            print(f"❌ {module_name}")
+        encrypted_file = self.encrypted_modules.pop(module_name, None)
+        if encrypted_file is not None:
+            logger.debug("取消注册加密模块: %s", module_name)
 
-        if module_name in self._cache:
-            del self._cache[module_name]
-            # 静默清理缓存
+            # 静默清理该文件的缓存
+            for key in [key for key in self._cache if key[0] == encrypted_file]:
+                del self._cache[key]
 
 
 class ModuleLoaderManager:
@@ -311,29 +664,33 @@ class ModuleLoaderManager:
 
     def __init__(self):
         self.loader = None
-        self._original_meta_path = None
 
-    def install_loader(self, encrypted_modules=None):
+    def install_loader(
+        self, encrypted_modules=None, prefetch=True, code_cache_dir=None
+    ):
         """安装智能模块加载器
 
         Args:
             encrypted_modules: 预定义的加密模块映射
+            prefetch: 是否在后台线程中预先解密预定义的加密模块
+            code_cache_dir: 磁盘代码缓存目录，见 SmartModuleLoader
         """
         try:
-            self.loader = SmartModuleLoader()
+            # 重复安装时先移除之前的加载器，sys.meta_path 中只保留一个
+            self.uninstall_loader()
+            self.loader = SmartModuleLoader(code_cache_dir)
 
             # 注册预定义的加密模块
             if encrypted_modules:
                 for module_name, encrypted_file in encrypted_modules.items():
                     self.loader.register_encrypted_module(module_name, encrypted_file)
-
-            # 保存原始的 meta_path
-            self._original_meta_path = sys.meta_path.copy()
+                if prefetch:
+                    self.loader.prefetch()
 
             # 安装加载器（最高优先级）
             sys.meta_path.insert(0, self.loader)
 
-            print("🚀 加载器已安装")
+            logger.info("模块加载器已安装")
 
             return self.loader
 
@@ -341,20 +698,20 @@ class ModuleLoaderManager:
             raise LoaderError(f"安装模块加载器失败: {e}")
 
     def uninstall_loader(self):
-        """卸载智能模块加载器"""
+        """卸载智能模块加载器
+
+        只从 sys.meta_path 中移除本加载器，安装之后其他代码加入的
+        查找器保持不变。
+        """
         try:
-            if self.loader and self.loader in sys.meta_path:
+            if self.loader is not None and self.loader in sys.meta_path:
                 sys.meta_path.remove(self.loader)
-                print("❌ 加载器已卸载")
-
-            if self._original_meta_path:
-                sys.meta_path = self._original_meta_path.copy()
-                # 静默恢复原始导入系统
+                logger.info("模块加载器已卸载")
 
             self.loader = None
 
         except Exception as e:
-            print(f"⚠️ 卸载失败: {e}")
+            logger.warning("卸载模块加载器失败: %s", e)
 
     def get_loader(self):
         """获取加载器实例
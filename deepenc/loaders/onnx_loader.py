@@ -8,11 +8,17 @@
 """
 
 import atexit
-from pathlib import Path
+import glob
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from ..core.auth import AuthManager
-from ..core.crypto import AESCrypto
+from ..core.crypto import AESCrypto, hardware_aes_in_use
 from ..core.errors import LoaderError
+from ..utils.fs import FileSystemUtils
 
 try:
     import onnxruntime as ort
@@ -21,6 +27,48 @@ except ImportError:
     ort = None
 
 
+def _hashable(value):
+    """把会话参数转换为可哈希的值，用于组成会话缓存键
+
+    providers、provider_options 等参数是列表或字典，递归转换为
+    tuple / frozenset；其他值（如 SessionOptions 对象）原样返回。
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset((key, _hashable(item)) for key, item in value.items())
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+@lru_cache(maxsize=1024)
+def _candidate_paths(model_path):
+    """模型路径对应的加密版本候选（按优先级，已去掉重复的候选）
+
+    同一模型路径每次加载都会查找一遍，拆分路径、拼接候选名的结果
+    按路径字符串缓存。
+
+    Args:
+        model_path: 原始模型路径
+
+    Returns:
+        tuple: (候选所在目录, 候选文件名) 的元组
+    """
+    directory, name = os.path.split(model_path)
+    stem = os.path.splitext(name)[0]
+    encrypted_dir = os.path.join(directory, "encrypted")
+    return (
+        # 标准加密扩展名
+        (directory, f"{stem}.onnx.encrypt"),
+        (directory, f"{stem}.encrypt"),
+        (directory, f"{stem}.enc"),
+        # 加密目录中的文件
+        (encrypted_dir, name),
+        (encrypted_dir, f"{name}.encrypt"),
+    )
+
+
 class SmartONNXLoader:
     """智能 ONNX 加载器
 
@@ -28,15 +76,40 @@ class SmartONNXLoader:
     实现了完全透明的加密模型加载机制。
     """
 
-    def __init__(self):
-        """初始化 ONNX 加载器"""
+    # 计算磁盘模型缓存键时读取的加密文件头部字节数
+    MODEL_CACHE_HEAD_SIZE = 64 * 1024
+    # 磁盘模型缓存文件的扩展名，清理时只删除这种文件，
+    # 缓存目录中用户自己的 .onnx 文件不受影响
+    MODEL_CACHE_SUFFIX = ".deepenc-model"
+    # preload 的最大并发数
+    PRELOAD_WORKERS = 8
+
+    def __init__(self, model_cache_dir=None):
+        """初始化 ONNX 加载器
+
+        Args:
+            model_cache_dir: 磁盘模型缓存目录，默认取环境变量
+                DEEPENC_MODEL_CACHE_DIR；都未设置时不写磁盘缓存。
+                缓存的是解密后的明文模型，只应在目录本身受保护
+                （如只有服务账号可读的本地磁盘）时启用
+        """
         if ort is None:
             raise LoaderError("onnxruntime 未安装，无法使用 ONNX 加载器")
 
-        self.crypto = AESCrypto()
+        # 模型只在创建会话时读一次，解密后释放加密文件的页缓存
+        self.crypto = AESCrypto(drop_page_cache=True)
+        # 大模型的解密耗时主要取决于是否用到 CPU 的 AES 指令，只探测一次
+        self.hardware_aes = hardware_aes_in_use()
+        if self.hardware_aes is False:
+            print("⚠️ 未使用 CPU 的 AES 指令，加密模型解密会明显变慢")
         self.auth_manager = AuthManager()
         self._model_cache = {}  # 模型会话缓存
+        self._cache_lock = threading.Lock()  # preload 的多个线程共享会话缓存
+        self._dir_index = {}  # 目录内容缓存，见 FileSystemUtils.list_directory
         self._original_inference_session = ort.InferenceSession
+        self.model_cache_dir = model_cache_dir or os.environ.get(
+            "DEEPENC_MODEL_CACHE_DIR"
+        )
 
         # 注册退出时清理
         atexit.register(self.cleanup_all)
@@ -71,6 +144,41 @@ class SmartONNXLoader:
         except Exception as e:
             raise LoaderError(f"加载模型失败 {model_path}: {e}")
 
+    def preload(self, model_paths, max_workers=None, **kwargs):
+        """并发加载多个模型
+
+        每个模型的文件读取、解密和会话创建都会释放 GIL，
+        多个模型在线程池中加载时可以互相重叠。加载后的会话进入
+        会话缓存，之后以相同参数加载同一模型直接命中。
+
+        Args:
+            model_paths: 模型文件路径列表
+            max_workers: 线程数，默认 min(PRELOAD_WORKERS, CPU 核数)
+            **kwargs: 传递给 InferenceSession 的参数
+
+        Returns:
+            list: 与 model_paths 顺序一致的推理会话
+
+        Raises:
+            LoaderError: 任一模型加载失败
+        """
+        # 按顺序去重，同一模型只加载一次
+        unique_paths = list(dict.fromkeys(model_paths))
+        if not unique_paths:
+            return []
+
+        workers = max_workers or min(self.PRELOAD_WORKERS, os.cpu_count() or 1)
+        workers = min(workers, len(unique_paths))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="deepenc-preload"
+        ) as executor:
+            futures = {
+                path: executor.submit(self.load_model, path, **kwargs)
+                for path in unique_paths
+            }
+            sessions = {path: future.result() for path, future in futures.items()}
+        return [sessions[path] for path in model_paths]
+
     def _is_known_encrypted_model(self, model_path):
         """检查是否是已知的加密模型
 
@@ -96,29 +204,30 @@ class SmartONNXLoader:
         Returns:
             str: 加密模型路径，未找到返回 None
         """
-        model_path_obj = Path(model_path)
-
-        # 检查同目录下的各种加密版本
-        possible_encrypted_paths = [
-            # 标准加密扩展名
-            model_path_obj.with_suffix(".onnx.encrypt"),
-            model_path_obj.with_suffix(".encrypt"),
-            model_path_obj.with_suffix(".enc"),
-            # 同名加密文件
-            model_path_obj.parent / f"{model_path_obj.stem}.encrypt",
-            model_path_obj.parent / f"{model_path_obj.stem}.onnx.encrypt",
-            model_path_obj.parent / f"{model_path_obj.stem}.enc",
-            # 加密目录中的文件
-            model_path_obj.parent / "encrypted" / model_path_obj.name,
-            model_path_obj.parent / "encrypted" / f"{model_path_obj.name}.encrypt",
-        ]
-
-        for encrypted_path in possible_encrypted_paths:
-            if encrypted_path.exists():
-                return str(encrypted_path)
+        # 每个目录只 stat 一次，候选文件名在缓存的目录列表中做集合查找；
+        # 候选按目录排列，目录不变时沿用上一次的列表
+        listed_dir, files = None, frozenset()
+        for candidate_dir, candidate in _candidate_paths(model_path):
+            if candidate_dir != listed_dir:
+                listed_dir, files = candidate_dir, self._list_files(candidate_dir)
+            if candidate in files:
+                return os.path.join(candidate_dir, candidate)
 
         return None
 
+    def _list_files(self, directory):
+        """列出目录中的普通文件名（跟随符号链接，带缓存）
+
+        Args:
+            directory: 目录路径，空字符串表示当前目录
+
+        Returns:
+            frozenset: 文件名集合，目录不存在时为空
+        """
+        # 相对路径按当前工作目录解析后再作为缓存键
+        path = os.path.abspath(directory)
+        return FileSystemUtils.list_directory(path, self._dir_index)[0]
+
     def _load_encrypted_model(self, encrypted_path, **kwargs):
         """加载加密模型
 
@@ -130,25 +239,54 @@ class SmartONNXLoader:
             onnxruntime.InferenceSession: 推理会话
         """
         try:
-            # 检查缓存
-            cache_key = f"{encrypted_path}:{hash(str(sorted(kwargs.items())))}"
-            if cache_key in self._model_cache:
+            # 检查缓存：键直接由路径和参数组成，不必排序、转字符串再哈希
+            cache_key = (
+                encrypted_path,
+                frozenset((name, _hashable(value)) for name, value in kwargs.items()),
+            )
+            with self._cache_lock:
+                session = self._model_cache.get(cache_key)
+            if session is not None:
                 print(f"📋 使用缓存的模型会话: {encrypted_path}")
-                return self._model_cache[cache_key]
+                return session
 
             # 获取加密密钥
             encryption_key = self.auth_manager.get_key()
 
-            # 解密模型到内存
-            decrypted_model = self.crypto.decrypt_file(encrypted_path, encryption_key)
-
-            # 直接从内存中的二进制数据创建推理会话
-            session = self._original_inference_session(decrypted_model, **kwargs)
+            # 磁盘缓存命中时直接按路径创建会话，完全跳过解密
+            cache_path = self._model_cache_path(encrypted_path, encryption_key)
+            if cache_path is not None and os.path.isfile(cache_path):
+                session = self._original_inference_session(cache_path, **kwargs)
+                with self._cache_lock:
+                    self._model_cache[cache_key] = session
+                session._cleanup = lambda: None
+                print(f"📋 使用磁盘缓存的解密模型: {encrypted_path}")
+                return session
+
+            if cache_path is not None:
+                # 反正要写缓存文件：就地解密后写入，再按路径创建会话，
+                # 进程内只有读入的一份缓冲区，不再另外分配解密结果
+                decrypted_model = self.crypto.decrypt_file_inplace(
+                    encrypted_path, encryption_key
+                )
+                if self._write_model_cache(cache_path, decrypted_model):
+                    del decrypted_model
+                    model = cache_path
+                else:
+                    model = bytes(decrypted_model)
+            else:
+                # 直接从内存中的二进制数据创建推理会话：明文不经过任何文件
+                # （memfd 或 /dev/shm 也一样），onnxruntime 按路径加载时还要
+                # 把文件内容再读一遍，并不比直接传字节串少复制
+                model = self.crypto.decrypt_file(encrypted_path, encryption_key)
+
+            session = self._original_inference_session(model, **kwargs)
 
             # 缓存会话
-            self._model_cache[cache_key] = session
+            with self._cache_lock:
+                self._model_cache[cache_key] = session
 
-            # 将清理方法附加到会话（不再需要临时文件清理）
+            # 将清理方法附加到会话（没有临时文件，无需清理）
             session._cleanup = lambda: None
 
             print(f"✅ 成功加载加密模型: {encrypted_path}")
@@ -157,6 +295,85 @@ class SmartONNXLoader:
         except Exception as e:
             raise LoaderError(f"加载加密模型失败 {encrypted_path}: {e}")
 
+    def _model_cache_path(self, encrypted_path, key):
+        """加密模型对应的磁盘缓存文件路径
+
+        文件名由两段带密钥的 BLAKE2b-160 组成：前一段只取决于模型的
+        绝对路径，用于找到同一模型的旧缓存；后一段覆盖 mtime、大小和
+        文件头部内容，加密文件被替换或密钥更换后自然不再命中。
+
+        Args:
+            encrypted_path: 加密模型路径
+            key: 解密密钥
+
+        Returns:
+            str | None: 缓存文件路径，未启用磁盘缓存时返回 None
+        """
+        if not self.model_cache_dir:
+            return None
+
+        key_bytes = key.encode("utf-8")
+        path_bytes = os.path.abspath(encrypted_path).encode("utf-8", "surrogateescape")
+        path_digest = hashlib.blake2b(path_bytes, digest_size=20, key=key_bytes)
+
+        with open(encrypted_path, "rb") as f:
+            st = os.fstat(f.fileno())
+            head = f.read(self.MODEL_CACHE_HEAD_SIZE)
+        state_digest = path_digest.copy()
+        state_digest.update(b"%d:%d:" % (st.st_mtime_ns, st.st_size))
+        state_digest.update(head)
+
+        return os.path.join(
+            self.model_cache_dir,
+            f"{path_digest.hexdigest()}-{state_digest.hexdigest()}"
+            f"{self.MODEL_CACHE_SUFFIX}",
+        )
+
+    def _write_model_cache(self, cache_path, model_bytes):
+        """把解密后的模型写入磁盘缓存
+
+        目录权限 0700、文件权限 0600；已有的目录不属于当前用户或
+        对其他用户开放时拒绝写入。先写临时文件再 os.replace，
+        并发启动的进程不会读到半个模型。写入后删除同一模型的旧缓存。
+        写入失败只给出提示，不影响模型加载。
+
+        Args:
+            cache_path: _model_cache_path 返回的缓存文件路径
+            model_bytes: 解密后的模型数据
+
+        Returns:
+            bool: 是否写入成功
+        """
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.model_cache_dir, mode=0o700, exist_ok=True)
+            # makedirs 不会修改已有目录的权限，写明文模型前单独检查
+            st = os.stat(self.model_cache_dir)
+            owner = os.getuid() if hasattr(os, "getuid") else st.st_uid
+            if st.st_uid != owner or st.st_mode & 0o077:
+                print(
+                    f"⚠️ 模型磁盘缓存目录不属于当前用户或对其他用户开放，"
+                    f"不写入缓存: {self.model_cache_dir}"
+                )
+                return False
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "wb") as f:
+                f.write(model_bytes)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            FileSystemUtils.safe_remove(tmp_path)
+            print(f"⚠️ 写入模型磁盘缓存失败 {cache_path}: {e}")
+            return False
+
+        prefix = os.path.basename(cache_path).partition("-")[0]
+        pattern = os.path.join(
+            glob.escape(self.model_cache_dir), f"{prefix}-*{self.MODEL_CACHE_SUFFIX}"
+        )
+        for stale_path in glob.glob(pattern):
+            if stale_path != cache_path:
+                FileSystemUtils.safe_remove(stale_path)
+        return True
+
     def cleanup_all(self):
         """清理所有资源"""
         # 清理模型缓存
@@ -169,14 +386,24 @@ class SmartONNXLoader:
         Returns:
             dict: 缓存统计信息
         """
+        with self._cache_lock:
+            cache_keys = list(self._model_cache)
         return {
-            "cached_models": len(self._model_cache),
-            "cache_keys": list(self._model_cache.keys()),
+            "cached_models": len(cache_keys),
+            "cache_keys": cache_keys,
+            "model_cache_dir": self.model_cache_dir,
         }
 
     def clear_cache(self):
-        """清理模型缓存"""
+        """清理模型缓存，启用磁盘缓存时同时删除磁盘上的解密模型"""
         self._model_cache.clear()
+        self._dir_index.clear()
+        if self.model_cache_dir:
+            pattern = os.path.join(
+                glob.escape(self.model_cache_dir), f"*{self.MODEL_CACHE_SUFFIX}"
+            )
+            for cache_path in glob.glob(pattern):
+                FileSystemUtils.safe_remove(cache_path)
         print("🧹 模型缓存已清理")
 
 
@@ -190,14 +417,18 @@ class ONNXLoaderManager:
         self.loader = None
         self._is_patched = False
 
-    def install_loader(self):
-        """安装智能 ONNX 加载器"""
+    def install_loader(self, model_cache_dir=None):
+        """安装智能 ONNX 加载器
+
+        Args:
+            model_cache_dir: 磁盘模型缓存目录，见 SmartONNXLoader
+        """
         try:
             if ort is None:
                 print("⚠️ onnxruntime 未安装，跳过 ONNX 加载器安装")
                 return None
 
-            self.loader = SmartONNXLoader()
+            self.loader = SmartONNXLoader(model_cache_dir)
 
             # 替换 InferenceSession
             ort.InferenceSession = self.loader.load_model
@@ -6,7 +6,15 @@
 提供通用的工具函数。
 """
 
-from .fs import FileSystemUtils
-from .logger import setup_logger
+from .lazy import lazy_exports
+
+# 首次访问时才导入的名字：fs 会带入 subprocess、线程池等依赖，
+# 只用到 lazy_exports 的包 __init__ 不必为此付出启动开销
+_LAZY_IMPORTS = {
+    "FileSystemUtils": ".fs",
+    "setup_logger": ".logger",
+}
 
 __all__ = ["FileSystemUtils", "setup_logger"]
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS, globals())
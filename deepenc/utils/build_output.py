@@ -9,11 +9,17 @@
 - 一致性：统一的输出格式
 """
 
+import sys
 from dataclasses import dataclass
 from typing import Dict, Any, Optional
 
+from .jsonio import dumps
 
-@dataclass
+# dataclass 的 slots 参数需要 Python 3.10+，更早的版本退回普通实例字典
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class BuildInfo:
     """简化的构建信息结构
     
@@ -45,16 +51,16 @@ class BuildOutputFormatter:
         Returns:
             str: 格式化的摘要字符串
         """
-        lines = []
-        lines.append("Build Summary:")
-        lines.append(f"  Status: {'SUCCESS' if info.success else 'FAILED'}")
-        lines.append(f"  Duration: {info.duration:.2f}s")
-        lines.append(f"  Build Directory: {info.build_dir}")
-        lines.append(f"  Files Processed: {info.files_processed}")
-        
-        lines.append(f"  Files Encrypted: {info.files_encrypted}")
-        
-        return "\n".join(lines)
+        return "\n".join(
+            (
+                "Build Summary:",
+                f"  Status: {'SUCCESS' if info.success else 'FAILED'}",
+                f"  Duration: {info.duration:.2f}s",
+                f"  Build Directory: {info.build_dir}",
+                f"  Files Processed: {info.files_processed}",
+                f"  Files Encrypted: {info.files_encrypted}",
+            )
+        )
     
     def format_verbose(self, info: BuildInfo) -> str:
         """格式化详细构建信息
@@ -65,31 +71,29 @@ class BuildOutputFormatter:
         Returns:
             str: 格式化的详细信息字符串
         """
-        lines = []
-        lines.append("Build Report:")
-        lines.append("=" * 50)
-        
-        # 基本信息
-        lines.append("Basic Info:")
-        lines.append(f"  Project Root: {info.project_root or 'N/A'}")
-        lines.append(f"  Build Directory: {info.build_dir}")
-        lines.append(f"  Status: {'SUCCESS' if info.success else 'FAILED'}")
-        
-        # 时间信息
-        if info.start_time:
-            lines.append(f"  Start Time: {info.start_time}")
-        if info.end_time:
-            lines.append(f"  End Time: {info.end_time}")
-        lines.append(f"  Duration: {info.duration:.2f}s")
-        
-        # 文件信息
-        lines.append("\nFile Processing:")
-        lines.append(f"  Files Processed: {info.files_processed}")
-        
-        lines.append(f"  Files Encrypted: {info.files_encrypted}")
-        lines.append("  Note: Python files and ONNX models encrypted")
-        
-        return "\n".join(lines)
+        # 可选的时间行为空时直接跳过
+        return "\n".join(
+            line
+            for line in (
+                "Build Report:",
+                "=" * 50,
+                # 基本信息
+                "Basic Info:",
+                f"  Project Root: {info.project_root or 'N/A'}",
+                f"  Build Directory: {info.build_dir}",
+                f"  Status: {'SUCCESS' if info.success else 'FAILED'}",
+                # 时间信息
+                info.start_time and f"  Start Time: {info.start_time}",
+                info.end_time and f"  End Time: {info.end_time}",
+                f"  Duration: {info.duration:.2f}s",
+                # 文件信息
+                "\nFile Processing:",
+                f"  Files Processed: {info.files_processed}",
+                f"  Files Encrypted: {info.files_encrypted}",
+                "  Note: Python files and ONNX models encrypted",
+            )
+            if line
+        )
     
     def format_json(self, info: BuildInfo) -> str:
         """格式化 JSON 输出
@@ -100,8 +104,6 @@ class BuildOutputFormatter:
         Returns:
             str: JSON 格式的字符串
         """
-        import json
-        
         data = {
             "success": info.success,
             "duration": info.duration,
@@ -113,7 +115,7 @@ class BuildOutputFormatter:
             "end_time": info.end_time,
         }
         
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return dumps(data, indent=True)
     
     def format_simple(self, info: BuildInfo) -> str:
         """格式化简单输出（用于脚本集成）
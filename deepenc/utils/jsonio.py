@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON 序列化工具
+
+优先使用 orjson（C 实现，速度明显快于标准库），
+未安装时回退到标准库 json，输出格式保持一致。
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_bytes(obj, indent=False):
+    """序列化为 UTF-8 字节串
+
+    Args:
+        obj: 待序列化对象
+        indent: 是否按 2 空格缩进
+
+    Returns:
+        bytes: JSON 字节串（非 ASCII 字符不转义）
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+    return dumps(obj, indent=indent).encode("utf-8")
+
+
+def dumps(obj, indent=False):
+    """序列化为字符串
+
+    Args:
+        obj: 待序列化对象
+        indent: 是否按 2 空格缩进
+
+    Returns:
+        str: JSON 字符串（非 ASCII 字符不转义）
+    """
+    if orjson is not None:
+        return dumps_bytes(obj, indent=indent).decode("utf-8")
+
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def loads(data):
+    """反序列化 JSON
+
+    Args:
+        data: JSON 字节串或字符串
+
+    Returns:
+        object: 反序列化结果
+
+    Raises:
+        ValueError: 不是合法的 JSON（orjson.JSONDecodeError 也是其子类）
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(obj, stream, indent=False):
+    """把 JSON 写入文本流，末尾追加换行
+
+    流带有底层二进制缓冲（如真实的 sys.stdout）时直接写字节，
+    省去一次解码；否则（如测试中替换的 StringIO）写字符串。
+
+    Args:
+        obj: 待序列化对象
+        stream: 文本输出流
+        indent: 是否按 2 空格缩进
+    """
+    buffer = getattr(stream, "buffer", None)
+    if buffer is not None:
+        stream.flush()
+        buffer.write(dumps_bytes(obj, indent=indent) + b"\n")
+    else:
+        stream.write(dumps(obj, indent=indent) + "\n")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+延迟导入
+
+包的 __init__ 中按名字延迟导入子模块里的接口（PEP 562），
+首次访问时才导入对应子模块，只用到其他接口时不必为此付出启动开销。
+"""
+
+import importlib
+
+
+def lazy_exports(package_name, mapping, namespace):
+    """生成包级别的 __getattr__ 和 __dir__
+
+    用法（在包的 __init__.py 中）::
+
+        __getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS, globals())
+
+    Args:
+        package_name: 包名，即调用方的 __name__，用于解析相对模块名
+        mapping: {接口名: 相对或绝对模块名}
+        namespace: 包的 globals()，导入后的接口缓存到这里
+
+    Returns:
+        tuple: (__getattr__, __dir__)
+    """
+
+    def __getattr__(name):
+        """按需导入 mapping 中的名字"""
+        module_name = mapping.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module_name, package_name), name)
+        # 缓存到模块命名空间，之后的访问不再经过 __getattr__
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(mapping))
+
+    return __getattr__, __dir__
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+标准库模块名
+
+构建时的同名检查和运行时的导入钩子共用同一份标准库模块名单。
+"""
+
+import sys
+
+# 标准库和内置模块的顶层名称（stdlib_module_names 需要 Python 3.10+）
+STDLIB_MODULES = frozenset(getattr(sys, "stdlib_module_names", ())).union(
+    sys.builtin_module_names
+)
@@ -65,6 +65,15 @@ setup(
             "sphinx>=5.0.0",
             "sphinx-rtd-theme>=1.0.0",
         ],
+        "speedups": [
+            "orjson>=3.6.0",
+            "cryptography>=3.1",
+            "zlib-ng>=0.4.0",
+        ],
+        "fallback": [
+            "numpy>=1.17",
+            "numba>=0.50",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -407,7 +407,7 @@ def test_cli_scan_command():
                 cli = EncryptCLI()
 
                 # 测试不同输出格式的扫描
-                for output_format in ["table", "json", "simple"]:
+                for output_format in ["table", "json", "ndjson", "simple"]:
                     result = cli.scan(
                         project_path=str(temp_project), output_format=output_format
                     )
@@ -684,6 +684,233 @@ def test_project_builder_clean():
         env.cleanup()
 
 
+def test_project_builder_incremental():
+    """测试项目构建器增量构建功能
+
+    测试未变化时无需重建，以及变化、删除文件的增量处理。
+    """
+    # 设置测试许可证
+    setup_test_license()
+
+    # 创建测试项目
+    test_structure = {
+        "src": {
+            "grpc_main.py": 'print("Hello, gRPC World!")',
+            "utils.py": "def helper(): pass",
+            "models.py": "class Model: pass",
+        },
+        "config.yaml": "debug: false",
+    }
+
+    env = TestEnvironment()
+    temp_project = env.create_temp_project(test_structure)
+    build_dir = temp_project / "build"
+
+    try:
+        builder = ProjectBuilder(temp_project, build_dir)
+        builder.build_project(clean=True, quiet=True)
+
+        # 未做任何修改，不应有需要重建的文件
+        changed, removed = builder.detect_changes()
+        assert not changed and not removed, "未修改的项目被判定为需要重建"
+
+        # 修改一个文件、删除一个文件
+        (temp_project / "src" / "utils.py").write_text("def helper(): return 1")
+        (temp_project / "src" / "models.py").unlink()
+
+        changed, removed = builder.detect_changes()
+        assert changed == {"src/utils.py"}, f"变化文件识别错误: {changed}"
+        assert removed == {"src/models.py"}, f"删除文件识别错误: {removed}"
+
+        build_report = builder.build_incremental(changed, removed, quiet=True)
+        assert build_report["success"], "增量构建失败"
+        assert build_report["encrypted_python_files"] == 1, "增量构建应只加密变化的文件"
+        assert (build_dir / "src" / "utils.py.encrypted").exists(), "变化文件未重新加密"
+        assert not (build_dir / "src" / "models.py.encrypted").exists(), "已删除文件的产物未清理"
+
+        # 增量构建后清单已更新
+        changed, removed = builder.detect_changes()
+        assert not changed and not removed, "增量构建后清单未更新"
+
+        print("✅ 项目构建器增量构建功能测试通过")
+
+    finally:
+        env.cleanup()
+        cleanup_test_license()
+
+
+def test_project_builder_verify():
+    """测试项目构建器验证功能
+
+    测试构建验证、验证结果缓存以及产物变化后缓存失效。
+    """
+    from deepenc.builders.cache import BuildManifest
+
+    # 设置测试许可证
+    setup_test_license()
+
+    # 创建测试项目
+    test_structure = {
+        "src": {
+            "grpc_main.py": 'print("Hello, gRPC World!")',
+            "utils.py": "def helper(): pass",
+        },
+    }
+
+    env = TestEnvironment()
+    temp_project = env.create_temp_project(test_structure)
+    build_dir = temp_project / "build"
+
+    try:
+        builder = ProjectBuilder(temp_project, build_dir)
+        builder.build_project(clean=True, quiet=True)
+
+        manifest = BuildManifest(build_dir)
+        fingerprint = builder._build_fingerprint()
+        assert not manifest.is_verified(fingerprint), "未验证的构建被判定为已验证"
+
+        assert builder.verify_build(), "构建验证失败"
+        assert manifest.is_verified(fingerprint), "验证结果未被缓存"
+        assert builder.is_build_verified(), "验证结果未被缓存"
+
+        # 更换密钥后缓存的验证结果不再有效
+        assert not manifest.is_verified("0" * 16), "密钥变化后验证缓存未失效"
+
+        # 构建目录中出现明文源码后，缓存失效且验证失败
+        (build_dir / "src" / "leak.py").write_text("SECRET = 1")
+        assert not manifest.is_verified(fingerprint), "产物变化后验证缓存未失效"
+        assert not builder.verify_build(), "未检测到未加密的源码"
+
+        print("✅ 项目构建器验证功能测试通过")
+
+    finally:
+        env.cleanup()
+        cleanup_test_license()
+
+
+def test_project_builder_artifact_cache():
+    """测试项目构建器加密产物缓存
+
+    测试清理后重新构建时复用缓存，以及源文件变化后重新加密。
+    """
+    # 设置测试许可证
+    setup_test_license()
+
+    # 创建测试项目
+    test_structure = {
+        "src": {
+            "grpc_main.py": 'print("Hello, gRPC World!")',
+            "utils.py": "def helper(): pass",
+            "models.py": "class Model: pass",
+        },
+    }
+
+    env = TestEnvironment()
+    temp_project = env.create_temp_project(test_structure)
+    build_dir = temp_project / "build"
+
+    try:
+        builder = ProjectBuilder(temp_project, build_dir)
+        build_report = builder.build_project(clean=True, quiet=True)
+        assert build_report["encryption"]["cache"]["hits"] == 0, "首次构建不应命中缓存"
+
+        # 修改一个文件后清理重建，只有该文件需要重新加密
+        (temp_project / "src" / "utils.py").write_text("def helper(): return 1")
+        build_report = builder.build_project(clean=True, quiet=True)
+        cache_info = build_report["encryption"]["cache"]
+        assert cache_info["hits"] == 1, f"未命中缓存: {cache_info}"
+        assert cache_info["misses"] == 1, f"变化文件未重新加密: {cache_info}"
+        assert builder.verify_build(), "使用缓存产物的构建验证失败"
+
+        # 禁用缓存时全部重新加密
+        builder = ProjectBuilder(temp_project, build_dir, use_cache=False)
+        build_report = builder.build_project(clean=True, quiet=True)
+        assert not build_report["encryption"]["cache"]["enabled"], "禁用缓存无效"
+
+        print("✅ 项目构建器加密产物缓存测试通过")
+
+    finally:
+        env.cleanup()
+        cleanup_test_license()
+
+
+def test_project_builder_partial_build():
+    """测试项目构建器局部构建
+
+    测试 --only 只重新处理选中的文件，未选中的变化留给下次增量构建。
+    """
+    # 设置测试许可证
+    setup_test_license()
+
+    # 创建测试项目
+    test_structure = {
+        "src": {
+            "grpc_main.py": 'print("Hello, gRPC World!")',
+            "utils.py": "def helper(): pass",
+            "models.py": "class Model: pass",
+        },
+    }
+
+    env = TestEnvironment()
+    temp_project = env.create_temp_project(test_structure)
+    build_dir = temp_project / "build"
+
+    try:
+        builder = ProjectBuilder(temp_project, build_dir)
+        assert builder.select_changes(only=["src/*"]) is None, "无构建目录时应全量构建"
+        builder.build_project(clean=True, quiet=True)
+
+        (temp_project / "src" / "utils.py").write_text("def helper(): return 1")
+        (temp_project / "src" / "models.py").write_text("class Model: x = 1")
+
+        changed, removed = builder.select_changes(only=["src/utils*"])
+        assert changed == {"src/utils.py"}, f"局部构建选择错误: {changed}"
+        assert not removed, f"不应删除产物: {removed}"
+        builder.build_incremental(changed, removed, quiet=True, partial=True)
+
+        # 未选中的 models.py 仍需在下次增量构建中处理
+        changed, removed = builder.detect_changes()
+        assert changed == {"src/models.py"}, f"未选中的变化丢失: {changed}"
+
+        # --since：重命名后旧路径作为删除处理，旧产物被清理
+        if shutil.which("git"):
+            import subprocess
+
+            def git(*args):
+                subprocess.run(
+                    ["git", "-C", str(temp_project), *args],
+                    check=True,
+                    capture_output=True,
+                )
+
+            (temp_project / ".gitignore").write_text("build/\n")
+            git("init", "-q")
+            git("config", "user.email", "test@example.com")
+            git("config", "user.name", "test")
+            git("add", "-A")
+            git("commit", "-q", "-m", "initial")
+            git("mv", "src/models.py", "src/renamed.py")
+            git("commit", "-q", "-m", "rename")
+
+            changed, removed = builder.select_changes(since="HEAD~1")
+            assert changed == {"src/renamed.py"}, f"重命名后的文件未选中: {changed}"
+            assert removed == {"src/models.py"}, f"重命名前的路径未删除: {removed}"
+            builder.build_incremental(changed, removed, quiet=True, partial=True)
+            artifacts = sorted(p.name for p in (build_dir / "src").iterdir())
+            assert not any(name.startswith("models.py") for name in artifacts), (
+                f"重命名前的产物未清理: {artifacts}"
+            )
+            assert any(name.startswith("renamed.py") for name in artifacts), (
+                f"重命名后的产物缺失: {artifacts}"
+            )
+
+        print("✅ 项目构建器局部构建测试通过")
+
+    finally:
+        env.cleanup()
+        cleanup_test_license()
+
+
 # ============================================================================
 # 错误处理测试
 # ============================================================================
@@ -916,6 +1143,10 @@ def create_test_suites() -> List[TestSuite]:
     builder_suite.add_test("基本功能", test_project_builder_basic)
     builder_suite.add_test("构建功能", test_project_builder_build)
     builder_suite.add_test("清理功能", test_project_builder_clean)
+    builder_suite.add_test("增量构建功能", test_project_builder_incremental)
+    builder_suite.add_test("验证功能", test_project_builder_verify)
+    builder_suite.add_test("加密产物缓存", test_project_builder_artifact_cache)
+    builder_suite.add_test("局部构建", test_project_builder_partial_build)
     suites.append(builder_suite)
 
     # 错误处理测试套件
@@ -961,6 +1192,10 @@ def run_single_test(test_name: str, verbose: bool = False) -> bool:
         "builder_basic": ("项目构建器基本功能", test_project_builder_basic),
         "builder_build": ("项目构建器构建功能", test_project_builder_build),
         "builder_clean": ("项目构建器清理功能", test_project_builder_clean),
+        "builder_incremental": ("项目构建器增量构建功能", test_project_builder_incremental),
+        "builder_verify": ("项目构建器验证功能", test_project_builder_verify),
+        "builder_cache": ("项目构建器加密产物缓存", test_project_builder_artifact_cache),
+        "builder_partial": ("项目构建器局部构建", test_project_builder_partial_build),
         "errors": ("错误处理", test_cli_error_handling),
         "builder_errors": ("项目构建器错误处理", test_project_builder_error_handling),
         "perf": ("CLI 性能", test_cli_performance),
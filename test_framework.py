@@ -22,6 +22,7 @@ import sys
 import tempfile
 import time
 import traceback
+import types
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -318,6 +319,11 @@ def test_crypto_core():
 
         assert test_data == decrypted, "数据加密/解密失败"
 
+        # CTR 模式的密文带文件头，默认的解密器也能识别
+        encrypted = AESCrypto(mode="ctr").encrypt(test_data, key)
+        assert encrypted.startswith(AESCrypto.CTR_MAGIC), "CTR 密文缺少文件头"
+        assert crypto.decrypt(encrypted, key) == test_data, "CTR 加密/解密失败"
+
         # 测试文件加密/解密
         with tempfile.NamedTemporaryFile(
             mode="w", delete=False, suffix=".py"
@@ -336,6 +342,14 @@ def test_crypto_core():
 
             assert original_content == decrypted_content, "文件加密/解密失败"
 
+            # 绑定密钥后不再逐次传入密钥
+            bound = crypto.bind(key)
+            assert bound.decrypt_file(encrypted_file_path) == original_content
+
+            # 就地解密返回可写缓冲区，内容相同
+            inplace = bound.decrypt_file_inplace(encrypted_file_path)
+            assert isinstance(inplace, bytearray) and inplace == original_content
+
         finally:
             # 清理临时文件
             for file_path in [tmp_file_path, encrypted_file_path]:
@@ -348,6 +362,105 @@ def test_crypto_core():
         cleanup_test_environment()
 
 
+def test_aes_fallback():
+    """测试 Numba 后备 AES 实现
+
+    与 pycryptodome 逐字节对比 AES-128/192/256 的 CFB 加解密和 CTR，
+    分段调用 update 时分段边界落在分组内部。未安装 numba 时跳过。
+    """
+    import importlib.util
+
+    if importlib.util.find_spec("numba") is None:
+        print("⏭️ numba 未安装，跳过后备 AES 实现测试")
+        return
+
+    from Crypto.Cipher import AES
+
+    from deepenc.core._aes_fallback import StreamCipher
+
+    def run(cipher, data, splits):
+        # 按给定位置切分数据，逐段调用 update
+        bounds = [0, *splits, len(data)]
+        return b"".join(
+            cipher.update(data[start:end]) for start, end in zip(bounds, bounds[1:])
+        )
+
+    data = os.urandom(5000)
+    splits = [1, 15, 17, 40, 1000, 1001, 4097]
+
+    for key_size in (16, 24, 32):
+        key = os.urandom(key_size)
+        iv = os.urandom(16)
+        nonce = os.urandom(12)
+
+        expected = AES.new(key, AES.MODE_CFB, iv, segment_size=128).encrypt(data)
+        assert run(StreamCipher(key, iv=iv), data, splits) == expected, (
+            f"AES-{key_size * 8} CFB 加密结果不一致"
+        )
+        decryptor = StreamCipher(key, iv=iv, decrypt=True)
+        assert run(decryptor, expected, splits) == data, (
+            f"AES-{key_size * 8} CFB 解密结果不一致"
+        )
+
+        expected = AES.new(key, AES.MODE_CTR, nonce=nonce, initial_value=0).encrypt(
+            data
+        )
+        assert run(StreamCipher(key, nonce=nonce), data, splits) == expected, (
+            f"AES-{key_size * 8} CTR 结果不一致"
+        )
+        decryptor = StreamCipher(key, nonce=nonce, decrypt=True)
+        assert run(decryptor, expected, splits) == data, (
+            f"AES-{key_size * 8} CTR 解密结果不一致"
+        )
+
+    # 整分组达到 PARALLEL_MIN_BLOCKS 时走并行内核：首段不对齐分组，
+    # CTR 计数器从接近 0xFFFFFFFF 开始，在并行段内回绕。
+    # 单线程环境下并行分支默认不启用，这里替换线程数并统计内核调用次数
+    from deepenc.core import _aes_fallback
+
+    kernel_calls = []
+    original_kernel = _aes_fallback._crypt_blocks
+    original_threads = _aes_fallback.get_num_threads
+
+    def counting_kernel(*args):
+        kernel_calls.append(len(args[-2]))
+        return original_kernel(*args)
+
+    _aes_fallback._crypt_blocks = counting_kernel
+    _aes_fallback.get_num_threads = lambda: 2
+    try:
+        blocks = StreamCipher.PARALLEL_MIN_BLOCKS + 10
+        data = os.urandom(16 * blocks + 7)
+        splits = [5, len(data) - 20]
+        key = os.urandom(32)
+        iv = os.urandom(16)
+        nonce = os.urandom(12)
+        start = 0xFFFFFFFF - 100
+
+        # CTR 参考结果：用 ECB 加密 nonce + 32 位计数器（回绕）得到密钥流
+        ecb = AES.new(key, AES.MODE_ECB)
+        counters = b"".join(
+            nonce + ((start + i) & 0xFFFFFFFF).to_bytes(4, "big")
+            for i in range(blocks + 1)
+        )
+        keystream = ecb.encrypt(counters)
+        expected = bytes(a ^ b for a, b in zip(data, keystream))
+        cipher = StreamCipher(key, nonce=nonce)
+        cipher._register[12:] = list(start.to_bytes(4, "big"))
+        assert run(cipher, data, splits) == expected, "CTR 计数器回绕结果不一致"
+
+        expected = AES.new(key, AES.MODE_CFB, iv, segment_size=128).encrypt(data)
+        decryptor = StreamCipher(key, iv=iv, decrypt=True)
+        assert run(decryptor, expected, splits) == data, "CFB 并行解密结果不一致"
+
+        assert len(kernel_calls) == 2, f"未走并行内核: {kernel_calls}"
+    finally:
+        _aes_fallback._crypt_blocks = original_kernel
+        _aes_fallback.get_num_threads = original_threads
+
+    print("✅ 后备 AES 实现测试通过")
+
+
 def test_file_discovery():
     """测试文件发现功能
 
@@ -404,6 +517,12 @@ def test_file_discovery():
         if len(filtered_python) >= len(python_files):
             print(f"⚠️ 文件过滤可能未生效，但继续测试")
 
+        # 统计信息：排除目录中的文件计入总数，但不算保留
+        stats = scanner.get_scan_stats()
+        assert stats["total_python_files"] == 4, f"Python 文件总数错误: {stats}"
+        assert stats["filtered_python_files"] == 3, f"过滤后数量错误: {stats}"
+        assert stats["filtered_onnx_files"] == 2, f"ONNX 文件数量错误: {stats}"
+
         print("✅ 文件发现功能测试通过")
 
     finally:
@@ -440,6 +559,7 @@ class TestClass:
     env = TestEnvironment()
     temp_dir = Path(tempfile.mkdtemp())
     env.temp_dirs.append(temp_dir)
+    loader_manager = None
 
     try:
         # 创建测试模块
@@ -467,10 +587,79 @@ class TestClass:
 
         # 测试模块导入（这里需要模拟导入过程）
         # 在实际环境中，导入钩子会自动处理
+        loader = loader_manager.get_loader()
+        module = types.ModuleType("test_module")
+        loader.exec_module(module)
+        assert module.test_function() == "Hello from encrypted module!"
+        assert not hasattr(module, "__path__"), "非包模块不应有 __path__"
+        assert loader.get_cache_info()["cached_modules"] == 1
+
+        # 再次加载复用缓存的代码对象
+        code = loader._get_code(str(encrypted_file))
+        assert loader._get_code(str(encrypted_file)) is code, "未复用代码缓存"
+
+        # 加密文件被替换后重新解密（源码带 UTF-8 BOM 也能编译）
+        module_file.write_bytes(b'\xef\xbb\xbfTEST_CONSTANT = "updated"\n')
+        crypto.encrypt_file(str(module_file), str(encrypted_file), key)
+        module = types.ModuleType("test_module")
+        loader.exec_module(module)
+        assert module.TEST_CONSTANT == "updated", "文件变化后未重新解密"
+
+        # 未命中的查找被记录，注册新模块后失效
+        assert loader.find_spec("no_such_module", [str(temp_dir)]) is None
+        assert ("no_such_module", (str(temp_dir),)) in loader._negative_cache
+        loader.register_encrypted_module("other_module", str(encrypted_file))
+        assert not loader._negative_cache, "注册模块后未清空未命中缓存"
+
+        # 自动发现按扩展名优先级选择，同一扩展名下包优先于单文件模块
+        for name in ("prio.enc", "prio.encrypted", "prio/__init__.enc"):
+            (temp_dir / name).parent.mkdir(exist_ok=True)
+            (temp_dir / name).write_bytes(b"")
+        found = loader._discover_encrypted_version("prio", [str(temp_dir)])
+        assert found == (str(temp_dir / "prio.encrypted"), False), found
+        (temp_dir / "prio.encrypted").unlink()
+        loader.invalidate_caches()
+        found = loader._discover_encrypted_version("prio", [str(temp_dir)])
+        assert found == (str(temp_dir / "prio" / "__init__.enc"), True), found
+
+        # 标准库模块直接跳过，不做自动发现
+        assert loader.find_spec("sys", None) is None
+        assert not loader._negative_cache, "标准库模块不应进入自动发现"
+
+        # 卸载只移除本加载器，安装之后加入的查找器保留
+        later_finder = types.SimpleNamespace(find_spec=lambda *args: None)
+        sys.meta_path.append(later_finder)
+        try:
+            loader_manager.uninstall_loader()
+            assert loader not in sys.meta_path, "加载器未卸载"
+            assert later_finder in sys.meta_path, "卸载时丢弃了其他查找器"
+        finally:
+            sys.meta_path.remove(later_finder)
+
+        # 磁盘代码缓存加密保存，新的加载器直接读取
+        from deepenc.loaders.module_loader import SmartModuleLoader
+
+        cache_dir = temp_dir / "code_cache"
+        SmartModuleLoader(str(cache_dir))._get_code(str(encrypted_file))
+        cache_files = list(cache_dir.iterdir())
+        assert len(cache_files) == 1, f"代码缓存文件数量错误: {cache_files}"
+        assert cache_files[0].stat().st_mode & 0o777 == 0o600
+        cache_data = cache_files[0].read_bytes()
+        assert b"TEST_CONSTANT" not in cache_data, "代码缓存未加密"
+        assert cache_data.startswith(crypto.CTR_MAGIC), "代码缓存应使用 CTR 模式"
+        cached = SmartModuleLoader(str(cache_dir))._read_code_cache(
+            str(encrypted_file), os.stat(encrypted_file)
+        )
+        assert cached is not None, "未命中磁盘代码缓存"
+        module = types.ModuleType("test_module")
+        exec(cached, module.__dict__)
+        assert module.TEST_CONSTANT == "updated"
 
         print("✅ 模块加载功能测试通过")
 
     finally:
+        if loader_manager is not None:
+            loader_manager.uninstall_loader()
         env.cleanup()
         cleanup_test_environment()
 
@@ -504,6 +693,12 @@ def test_project_building():
         assert report["success"], "项目构建失败"
         assert build_dir.exists(), "构建目录未创建"
 
+        # 与标准库同名的顶层模块会给出提示
+        shadowing = builder._warn_stdlib_shadowing(
+            ["queue.py", "email/__init__.py", "src/queue.py", "mymod.py"]
+        )
+        assert shadowing == ["email", "queue"], f"标准库同名检测错误: {shadowing}"
+
         # 验证入口文件 grpc_main.py 未被加密
         main_file = build_dir / "src" / "grpc_main.py"
         assert main_file.exists(), "入口文件 grpc_main.py 未复制"
@@ -637,6 +832,91 @@ def test_onnx_loading():
         cleanup_test_environment()
 
 
+def test_onnx_model_cache():
+    """测试 ONNX 模型磁盘缓存
+
+    用替身 onnxruntime 模块记录传给 InferenceSession 的参数，
+    检查缓存文件权限、失效条件和清理范围。
+    """
+    from deepenc.core.crypto import AESCrypto
+    from deepenc.loaders import onnx_loader
+
+    setup_test_environment()
+
+    created = []
+    fake_ort = types.ModuleType("onnxruntime")
+    fake_ort.InferenceSession = lambda model, **kwargs: created.append(model) or (
+        types.SimpleNamespace(model=model)
+    )
+    original_ort = onnx_loader.ort
+    onnx_loader.ort = fake_ort
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        cache_dir = os.path.join(temp_dir, "cache")
+        loader = onnx_loader.SmartONNXLoader(model_cache_dir=cache_dir)
+        key = loader.auth_manager.get_key()
+
+        plain = os.urandom(100000)
+        model_path = os.path.join(temp_dir, "model.onnx")
+        encrypted_path = model_path + ".encrypt"
+        with open(model_path, "wb") as f:
+            f.write(plain)
+        AESCrypto().encrypt_file(model_path, encrypted_path, key)
+
+        def cache_files():
+            return sorted(os.listdir(cache_dir))
+
+        # 未命中：解密后写入缓存，再按缓存路径创建会话
+        loader.load_model(encrypted_path)
+        entries = cache_files()
+        assert len(entries) == 1, f"缓存文件数量错误: {entries}"
+        assert entries[0].endswith(loader.MODEL_CACHE_SUFFIX), entries
+        cache_path = os.path.join(cache_dir, entries[0])
+        assert os.stat(cache_path).st_mode & 0o777 == 0o600, "缓存文件权限错误"
+        assert os.stat(cache_dir).st_mode & 0o777 == 0o700, "缓存目录权限错误"
+        with open(cache_path, "rb") as f:
+            assert f.read() == plain, "缓存的模型内容错误"
+        assert created[-1] == cache_path
+
+        # 新的加载器（相当于重启进程）命中磁盘缓存
+        loader = onnx_loader.SmartONNXLoader(model_cache_dir=cache_dir)
+        loader.load_model(encrypted_path)
+        assert created[-1] == cache_path, "未命中磁盘缓存"
+
+        # 更换密钥后不再命中
+        assert loader._model_cache_path(encrypted_path, key[::-1]) != cache_path
+
+        # 加密文件 mtime 改变后重新解密，并删除旧缓存
+        st = os.stat(encrypted_path)
+        os.utime(encrypted_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        loader = onnx_loader.SmartONNXLoader(model_cache_dir=cache_dir)
+        loader.load_model(encrypted_path)
+        new_entries = cache_files()
+        assert len(new_entries) == 1 and new_entries != entries, new_entries
+
+        # clear_cache 只删除缓存自己的文件
+        user_model = os.path.join(cache_dir, "mine.onnx")
+        with open(user_model, "wb") as f:
+            f.write(b"user model")
+        loader.clear_cache()
+        assert cache_files() == ["mine.onnx"], f"清理范围错误: {cache_files()}"
+
+        # 对其他用户开放的目录不写明文模型，直接从内存加载
+        os.chmod(cache_dir, 0o755)
+        loader = onnx_loader.SmartONNXLoader(model_cache_dir=cache_dir)
+        loader.load_model(encrypted_path)
+        assert cache_files() == ["mine.onnx"], "不安全的目录中写入了缓存"
+        assert created[-1] == plain, "未回退到内存加载"
+
+        print("✅ ONNX 模型磁盘缓存测试通过")
+
+    finally:
+        onnx_loader.ort = original_ort
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        cleanup_test_environment()
+
+
 def test_auth_manager():
     """测试认证管理器功能
 
@@ -832,6 +1112,7 @@ def create_test_suites() -> List[TestSuite]:
     # 核心功能测试套件
     core_suite = TestSuite("核心功能")
     core_suite.add_test("加密引擎", test_crypto_core)
+    core_suite.add_test("后备 AES", test_aes_fallback)
     core_suite.add_test("文件发现", test_file_discovery)
     core_suite.add_test("模块加载", test_module_loading)
     core_suite.add_test("项目构建", test_project_building)
@@ -839,6 +1120,7 @@ def create_test_suites() -> List[TestSuite]:
     core_suite.add_test("错误处理", test_error_handling)
     core_suite.add_test("命令行接口", test_cli_interface)
     core_suite.add_test("ONNX加载", test_onnx_loading)
+    core_suite.add_test("ONNX模型缓存", test_onnx_model_cache)
     core_suite.add_test("认证管理", test_auth_manager)
     suites.append(core_suite)
 
@@ -869,6 +1151,7 @@ def run_single_test(test_name: str, verbose: bool = False) -> bool:
     # 测试名称到函数的映射
     test_map = {
         "crypto": ("加密引擎", test_crypto_core),
+        "aes-fallback": ("后备 AES", test_aes_fallback),
         "discovery": ("文件发现", test_file_discovery),
         "loading": ("模块加载", test_module_loading),
         "building": ("项目构建", test_project_building),
@@ -876,6 +1159,7 @@ def run_single_test(test_name: str, verbose: bool = False) -> bool:
         "errors": ("错误处理", test_error_handling),
         "cli": ("命令行接口", test_cli_interface),
         "onnx": ("ONNX加载", test_onnx_loading),
+        "onnx-cache": ("ONNX模型缓存", test_onnx_model_cache),
         "auth": ("认证管理", test_auth_manager),
         "perf": ("性能测试", test_performance_basic),
         "workflow": ("完整工作流程", test_full_workflow),
@@ -977,6 +1261,7 @@ def main():
 
 可用的测试:
   crypto      加密引擎测试
+  aes-fallback  后备 AES 实现测试
   discovery   文件发现测试
   loading     模块加载测试
   building    项目构建测试
@@ -984,6 +1269,7 @@ def main():
   errors      错误处理测试
   cli         命令行接口测试
   onnx        ONNX模型加载测试
+  onnx-cache  ONNX模型磁盘缓存测试
   auth        认证管理测试
   perf        性能测试
   workflow    完整工作流程测试
@@ -1001,6 +1287,7 @@ def main():
         "-t",
         choices=[
             "crypto",
+            "aes-fallback",
             "discovery",
             "loading",
             "building",
@@ -1008,6 +1295,7 @@ def main():
             "errors",
             "cli",
             "onnx",
+            "onnx-cache",
             "auth",
             "perf",
             "workflow",